@@ -0,0 +1,1037 @@
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EXTRACTS_PATH = "data/benchmark_extracts.json"
+STARTUP_BUDGET_MS = 250  # time from interpreter start to the drawn main menu
+HEAVY_MODULES = ("pygame", "PIL", "openai", "nltk", "requests")  # must not be imported before the menu is shown
+
+
+def load_extracts(path=EXTRACTS_PATH):
+    """
+    Loads the fixture corpus of Wikipedia plaintext extracts.
+
+    Args:
+        path (str): Path to the fixture JSON file.
+
+    Returns:
+        list: List of (title, extract) tuples.
+    """
+    with open(path, 'r') as file:
+        data = json.load(file)
+    return [(item["title"], item["extract"]) for item in data["extracts"]]
+
+
+def measure(func, items, min_time=1.0):
+    """
+    Repeatedly applies func to every item until at least min_time seconds have passed.
+
+    Args:
+        func (callable): Function called once per item.
+        items (list): Inputs for func.
+        min_time (float): Minimum measuring time in seconds.
+
+    Returns:
+        float: Items processed per second.
+    """
+    processed = 0
+    start = time.perf_counter()
+    while True:
+        for item in items:
+            func(item)
+        processed += len(items)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return processed / elapsed
+
+
+def print_result(label, rate, unit, baseline=None):
+    """Prints one benchmark line, with the speed-up relative to baseline if given."""
+    speedup = f"  (x{rate / baseline:.1f})" if baseline else ""
+    print(f"  {label:<40}{rate:>12,.1f} {unit}{speedup}")
+
+
+def bench_pipeline(args):
+    """Pages/second through divide_sentences -> clean_sentences -> filter, with and without the tokenizer cache."""
+    import wiki_api
+
+    texts = [extract for _, extract in load_extracts()]
+
+    def reload_per_page(text):
+        sentences = wiki_api.load_tokenizer().tokenize(text)
+        sentences = wiki_api.clean_sentences(sentences)
+        return wiki_api.filter_linguistically_normal_nltk(sentences)
+
+    def shared_tokenizer(text):
+        return wiki_api.extract_sentences(text)
+
+    print("Sentence pipeline:")
+    before = measure(reload_per_page, texts, args.min_time)
+    print_result("tokenizer loaded per page", before, "pages/s")
+    after = measure(shared_tokenizer, texts, args.min_time)
+    print_result("shared tokenizer", after, "pages/s", before)
+
+
+def _legacy_clean_sentences(sentences):
+    """Sentence cleaner as it was before the compiled single-pass version, for comparison."""
+    cleaned = []
+    for s in sentences:
+        s = re.sub(r'\=\=.*?\=\=', '', s)
+        s = re.sub(r'\[\[|\]\]', '', s)
+        s = re.sub(r'\{\{.*?\}\}', '', s)
+        s = re.sub(r'<ref.*?>.*?</ref>', '', s)
+        s = s.replace('\n', ' ')
+        cleaned.append(s.strip())
+    return cleaned
+
+
+def _legacy_filter(sentences):
+    """Sentence filter as it was before the compiled single-pass version, for comparison."""
+    return [
+        s.strip() for s in sentences
+        if len(s) > 100
+           and len(s.split()) >= 4
+           and not re.match(r'^[^a-zA-Z]+$', s)
+           and not any(char in s for char in "{}[]|=*<>")
+           and s.count('.') <= 3
+    ]
+
+
+def bench_cleaning(args):
+    """Sentences/second through clean + filter, legacy passes versus the single-pass engine."""
+    import wiki_api
+
+    articles = [wiki_api.divide_sentences(extract) for _, extract in load_extracts()]
+    sentences = [sentence for article in articles for sentence in article]
+
+    expected = _legacy_filter(_legacy_clean_sentences(sentences))
+    if wiki_api.clean_and_filter_sentences(sentences) != expected:
+        raise SystemExit("Single-pass cleaner output differs from the legacy pipeline")
+
+    def legacy(article):
+        return _legacy_filter(_legacy_clean_sentences(article))
+
+    print(f"Sentence cleaning and filtering ({len(sentences)} sentences, output identical):")
+    before = measure(legacy, articles, args.min_time) * len(sentences) / len(articles)
+    print_result("separate re.sub passes", before, "sentences/s")
+    after = measure(wiki_api.clean_and_filter_sentences, articles, args.min_time) * len(sentences) / len(articles)
+    print_result("compiled single pass", after, "sentences/s", before)
+
+    texts = [extract for _, extract in load_extracts()]
+    batch = measure(wiki_api.extract_sentences_batch, [texts], args.min_time) * len(texts)
+    print_result("extract_sentences_batch (incl. tokenizing)", batch, "pages/s")
+
+
+def _legacy_numbers(text):
+    """Number transform as it was before the single-scan engine, for comparison."""
+    return " ".join(
+        str(int(w) + int(int(w) * 0.25) if int(w) % 2 == 0 else int(w) - int(int(w) * 0.25))
+        if w.isdigit() else w for w in text.split()
+    )
+
+
+def _legacy_attributes(text):
+    """Attribute transform as it was before the single-scan engine, for comparison."""
+    from lie_gen import attribute_opposites
+
+    new_words = []
+    for word in text.split():
+        clean_word = word.lower().strip(",.!?")
+        if clean_word in attribute_opposites:
+            replacement = attribute_opposites[clean_word]
+            new_words.append(replacement.capitalize() if word[0].isupper() else replacement)
+        else:
+            new_words.append(word)
+    return " ".join(new_words)
+
+
+def _legacy_negation(text):
+    """Negation transform as it was before the single-scan engine, for comparison."""
+    negations = {"is": "is not", "are": "are not", "was": "was not", "were": "were not", "will": "will not"}
+    return " ".join(negations.get(word.lower(), word) for word in text.split())
+
+
+def _legacy_transforms(true_fact):
+    """All three legacy transforms, each with its own split/join pass."""
+    return [_legacy_numbers(true_fact), _legacy_attributes(true_fact), _legacy_negation(true_fact)]
+
+
+def _legacy_generate_lie(true_fact):
+    """Lie generator as it was before the single-scan engine, for comparison."""
+    modified = _legacy_numbers(true_fact)
+    if modified != true_fact:
+        return modified
+    modified = _legacy_attributes(true_fact)
+    if modified != true_fact:
+        return modified
+    return _legacy_negation(true_fact)
+
+
+def load_sentence_corpus(size=None):
+    """
+    Collects the distinct sentences of the fixture extracts, cleaned as the game cleans them.
+
+    Sentences are never repeated; benchmarks that need more volume than the
+    fixture holds tile the corpus explicitly with tile().
+
+    Args:
+        size (int, optional): Maximum number of sentences; None returns all of them.
+
+    Returns:
+        list: Distinct sentence strings, in fixture order.
+    """
+    import wiki_api
+
+    sentences = wiki_api.clean_sentences(sentence
+                                         for _, extract in load_extracts()
+                                         for sentence in re.split(r"(?<=[.!?])\s+", extract))
+    distinct = list(dict.fromkeys(sentence for sentence in sentences if len(sentence.split()) >= 4))
+    return distinct[:size]
+
+
+def tile(items, size):
+    """Repeats items up to exactly size entries, for benchmarks that measure volume rather than variety."""
+    return (items * (size // len(items) + 1))[:size]
+
+
+def bench_lie_gen(args):
+    """Sentences/second through lie_gen: legacy per-word transforms versus the single-scan engine."""
+    import lie_gen
+
+    sentences = load_sentence_corpus()
+    changed = sum(lie_gen.generate_lie(sentence) != sentence for sentence in sentences)
+
+    print(f"Rule-based lie generation ({len(sentences)} distinct fixture sentences, {changed} rewritten):")
+    before = measure(_legacy_generate_lie, sentences, args.min_time)
+    print_result("legacy generate_lie", before, "sentences/s")
+    after = measure(lie_gen.generate_lie, sentences, args.min_time)
+    print_result("single-scan generate_lie", after, "sentences/s", before)
+    before = measure(_legacy_transforms, sentences, args.min_time)
+    print_result("legacy, all three transforms", before, "sentences/s")
+    after = measure(lie_gen.generate_lie_candidates, sentences, args.min_time)
+    print_result("single-scan generate_lie_candidates", after, "sentences/s", before)
+
+
+def bench_lie_quality(args):
+    """Share of lie-eligible round sentences that lie_strategy cannot handle locally and escalates to the LLM."""
+    import collections
+
+    import lie_gen
+    import lie_strategy
+    import wiki_api
+
+    outcomes = collections.Counter()
+    total = 0
+    for _, extract in load_extracts():
+        sentences = wiki_api.extract_sentences(extract)
+        for index in wiki_api.lie_candidate_indices(sentences):  # the sentences a round can turn into its lie
+            context = sentences[:index] + sentences[index + 1:]
+            reasons = [lie_strategy.rejection_reason(sentences[index], lie, context)
+                       for _, lie in lie_gen.generate_lie_candidates(sentences[index])]
+            total += 1
+            if None in reasons:
+                outcomes["accepted locally"] += 1
+            elif not reasons:
+                outcomes["escalated: no rewritable word"] += 1
+            else:
+                outcomes[f"escalated: {reasons[0]}"] += 1
+
+    print(f"Local lie quality check ({total} lie-eligible sentences of the fixture pages):")
+    for outcome, count in outcomes.most_common():
+        print(f"  {outcome:<40}{count:>12,} ({100 * count / total:.1f}%)")
+    escalated = total - outcomes["accepted locally"]
+    print(f"  {'escalated to the LLM':<40}{escalated:>12,} ({100 * escalated / total:.1f}%)")
+
+
+def bench_lie_batch(args):
+    """Sentences/second through lie_gen.generate_lies, in-process and sharded across processes."""
+    import math
+    import os
+
+    import lie_gen
+
+    sentences = load_sentence_corpus()
+    workers = max(os.cpu_count() or 1, 2)
+    chunk_size = math.ceil(len(sentences) / workers)  # one chunk per worker process
+    serial = lie_gen.generate_lies(sentences, processes=1)
+    if lie_gen.generate_lies(sentences, processes=workers, chunk_size=chunk_size) != serial:
+        raise SystemExit("Process-pool output differs from in-process generate_lies")
+
+    print(f"Batch lie generation ({len(sentences)} distinct fixture sentences, {os.cpu_count() or 1} cores, "
+          f"pool output identical):")
+    single = measure(lambda batch: lie_gen.generate_lies(batch, processes=1),
+                     [sentences], args.min_time) * len(sentences)
+    print_result("generate_lies, 1 process", single, "sentences/s")
+    sharded = measure(lambda batch: lie_gen.generate_lies(batch, processes=workers, chunk_size=chunk_size),
+                      [sentences], args.min_time) * len(sentences)
+    print_result(f"generate_lies, {workers} processes", sharded, "sentences/s", single)
+
+    transforms = {}
+    for _, transform in serial:
+        transforms[transform] = transforms.get(transform, 0) + 1
+    for transform, count in sorted(transforms.items(), key=lambda item: -item[1]):
+        print(f"  {'transform ' + str(transform):<40}{count:>12,}")
+
+
+def bench_corpus(args):
+    """Memory and random page access: pages as Python lists versus the memory-mapped sentence corpus."""
+    import os
+    import random
+    import tempfile
+    import tracemalloc
+
+    import sentence_corpus
+
+    distinct = load_sentence_corpus()
+    sentences = tile(distinct, 200000)  # memory is measured by volume, so the fixture is repeated
+    categories = ["Ghosts", "Cryptids", "Unsolved_mysteries"]
+    pages = [(f"Page {index // 10}", sentences[index:index + 10], [0, 2, 4], [categories[index // 10 % 3]])
+             for index in range(0, len(sentences), 10)]
+    indices = [random.randrange(len(pages)) for _ in range(1000)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.bin")
+        sentence_corpus.write_corpus(path, pages)
+        print(f"Sentence corpus ({len(pages):,} pages, {len(sentences):,} sentences tiled from "
+              f"{len(distinct)} distinct, {os.path.getsize(path) / 1e6:.1f} MB on disk):")
+
+        tracemalloc.start()
+        loaded = [(title, [sentence.encode().decode() for sentence in page], candidates)
+                  for title, page, candidates, _ in pages]  # private copies, as unpickled or parsed data would be
+        lists_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del loaded
+
+        tracemalloc.start()
+        corpus = sentence_corpus.SentenceCorpus(path)
+        mapped_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"  {'Python heap, lists of str':<40}{lists_memory / 1e6:>12,.1f} MB")
+        print(f"  {'Python heap, memory-mapped corpus':<40}{mapped_memory / 1e6:>12,.3f} MB")
+
+        rate = measure(corpus.page, indices, args.min_time)
+        print_result("random page decode", rate, "pages/s")
+        rate = measure(lambda _: corpus.random_page(["Ghosts", "Cryptids"]), indices, args.min_time)
+        print_result("random page in spooky categories", rate, "pages/s")
+        corpus.close()
+
+
+def bench_rounds(args):
+    """Playable pages/second and time to a valid page through wiki_api, served offline by the MediaWiki stub."""
+    import page_cache
+    import wiki_api
+    import wiki_replay
+
+    recording = wiki_replay.Recording.load(EXTRACTS_PATH)
+    print(f"Round pipeline against the MediaWiki stub ({len(recording.pages)} recorded pages, no spare pages, "
+          f"{wiki_api.RATE_LIMIT:g} requests/s limit):")
+    for latency in (0.0, 0.05):
+        server, url = wiki_replay.start_stub_server(recording, latency=latency)
+        wiki_api.set_client(wiki_api.WikiClient(api_url=url))
+        wiki_api.set_page_cache(page_cache.PageCache(path=None))
+        try:
+            baseline = None
+            for race in (1, wiki_api.RACE_WIDTH):
+                wiki_api.reset_page_latency_stats()
+                calls = wiki_api.get_scheduler().metrics()["calls"]
+                rate = measure(lambda _: wiki_api.get_valid_wikipedia_page(race=race, spare=False), [None],
+                               args.min_time)
+                wiki_api.wait_for_race_batches()
+                print_result(f"{latency * 1000:.0f} ms stub latency, race={race}", rate, "pages/s", baseline)
+                baseline = baseline or rate
+                stats = wiki_api.get_page_latency_stats()
+                requests = (wiki_api.get_scheduler().metrics()["calls"] - calls) / stats["count"]
+                print(f"  {'  time to valid page p50 / p95':<40}{stats['p50'] * 1000:>10,.1f} ms / "
+                      f"{stats['p95'] * 1000:,.1f} ms  ({requests:.1f} requests per page)")
+        finally:
+            wiki_api.wait_for_race_batches()  # losing batches must not reach the stub after shutdown
+            wiki_api.set_client(None)
+            wiki_api.set_page_cache(None)
+            server.shutdown()
+            server.server_close()
+
+
+class _CountingStream:
+    """Text stream stand-in for a terminal that counts write calls and UTF-8 bytes."""
+
+    def __init__(self):
+        self.writes = 0
+        self.bytes = 0
+
+    def write(self, text):
+        self.writes += 1
+        self.bytes += len(text.encode("utf-8"))
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def _legacy_print_round(lives, points, time_left, page_title, sentences):
+    """One round screen as drawn before the frame renderer: shell clear plus one print per line."""
+    import os
+    import subprocess
+    import textwrap
+
+    green, reset, width = "\033[92m", "\033[0m", 117
+    if os.name != 'nt' and 'TERM' in os.environ:
+        # Same process spawn as os.system('clear'), without clearing the benchmark output
+        subprocess.run("clear", shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    lives_str, points_str = f"Lives: {lives * '❤️ '}".strip(), f"Points: {points}"
+    time_str = f"    Time Left: {time_left}"
+    spacing = (width - len(lives_str) - len(points_str) - len(time_str) - 2) // 2
+    print(f"{green}╔" + "═" * width + "╗")
+    print(f" {(lives_str + ' ' * spacing + time_str + ' ' * spacing + points_str).ljust(width)} ")
+    print("╚" + "═" * width + "╝" + reset)
+    print(f"{green}╔" + "═" * width + "╗")
+    for line in textwrap.wrap(f"    Wikipedia Article: {page_title}", width):
+        print(f" {line.ljust(width)} ")
+    print("╚" + "═" * width + "╝" + reset)
+    for index, sentence in enumerate(sentences, 1):
+        print("╔" + "═" * width + "╗")
+        for i, line in enumerate(textwrap.wrap(sentence, width=width - 5)):
+            print(f" {index}.  {line.ljust(width - 5)} " if i == 0 else f"      {line.ljust(width - 5)} ")
+        print("╚" + "═" * width + "╝")
+    print(f"{green}╔" + "═" * width + "╗")
+    for line in textwrap.wrap("    What's the lie? (1-3)", width):
+        print(f" {line.ljust(width)} ")
+    print("╚" + "═" * width + "╝" + reset)
+
+
+def bench_render(args):
+    """Writes, bytes and time per round screen: shell clear plus prints versus one buffered frame."""
+    import contextlib
+
+    import game_logic
+    import screen
+
+    sentences = load_sentence_corpus(3)
+    title = "Bell Witch"
+
+    def new_frame(stream):
+        header = game_logic.render_lives_and_points(3, 7, "04:12")
+        screen.Frame().add(header).add(game_logic.render_sentences(title, sentences)).add(
+            game_logic.render_boxed_text(["    What's the lie? (1-3)", ""])).write(stream)
+
+    print(f"Round screen rendering (terminal clear via {'ANSI' if screen.supports_ansi() else 'fallback'}):")
+    stream = _CountingStream()
+    with contextlib.redirect_stdout(stream):
+        _legacy_print_round(3, 7, "04:12", title, sentences)
+    legacy_writes, legacy_bytes = stream.writes, stream.bytes
+    stream = _CountingStream()
+    new_frame(stream)
+    print(f"  {'legacy: writes / bytes per frame':<40}{legacy_writes:>12,} / {legacy_bytes:,} (+ clear subprocess)")
+    print(f"  {'frame renderer: writes / bytes per frame':<40}{stream.writes:>12,} / {stream.bytes:,}")
+
+    def legacy(_):
+        with contextlib.redirect_stdout(_CountingStream()):
+            _legacy_print_round(3, 7, "04:12", title, sentences)
+
+    before = measure(legacy, [None], args.min_time)
+    print_result("legacy frame", before, "frames/s")
+    after = measure(lambda _: new_frame(_CountingStream()), [None], args.min_time)
+    print_result("buffered frame", after, "frames/s", before)
+
+
+def _legacy_gif_frames(path, target_size):
+    """All frames of a GIF, converted and scaled up front the way end_gif did before streaming."""
+    from PIL import Image
+
+    frames = []
+    with Image.open(path) as gif:
+        try:
+            while True:
+                frames.append(gif.copy().convert("RGBA").resize(target_size).tobytes())
+                gif.seek(gif.tell() + 1)
+        except EOFError:
+            pass
+    return frames
+
+
+def bench_gif(args):
+    """Time to first frame and frame bytes held for the quit screen GIF: eager decode versus streaming."""
+    import os
+    import tempfile
+
+    from PIL import Image, ImageDraw
+
+    import gif_stream
+
+    frame_count, source_size, target_size = 40, (320, 180), (1920, 1080)
+    print(f"Quit screen GIF ({frame_count} frames, {source_size[0]}x{source_size[1]} "
+          f"scaled to {target_size[0]}x{target_size[1]}):")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "synthetic.gif")
+        images = []
+        for index in range(frame_count):
+            image = Image.new("RGB", source_size, (index * 6 % 256, 0, 0))
+            ImageDraw.Draw(image).ellipse((index * 4, 40, index * 4 + 100, 140), fill=(255, 255, 255))
+            images.append(image)
+        images[0].save(path, save_all=True, append_images=images[1:], duration=80, loop=0)
+
+        start = time.perf_counter()
+        frames = _legacy_gif_frames(path, target_size)
+        eager = time.perf_counter() - start
+        held = sum(len(frame) for frame in frames)
+        del frames
+        print(f"  {'eager: first frame after / bytes held':<40}{eager * 1000:>10,.1f} ms / {held / 2 ** 20:,.1f} MiB")
+
+        cache_dir = os.path.join(directory, "cache")
+        for label, cache in (("streaming", None), ("streaming, cold cache", cache_dir),
+                             ("streaming, warm cache", cache_dir)):
+            stream = gif_stream.GifFrameStream(path, target_size, cache_dir=cache)
+            start = time.perf_counter()
+            with stream:
+                first = stream.next_frame()
+                first_after = time.perf_counter() - start
+                for _ in range(frame_count - 1):  # one full pass, so a cold cache gets committed
+                    stream.next_frame()
+                full_pass = time.perf_counter() - start
+            held = (gif_stream.DEFAULT_BUFFER_SIZE + 1) * len(first.pixels)  # buffer plus the frame on screen
+            print(f"  {label + ': first frame after / bytes held':<40}{first_after * 1000:>10,.1f} ms / "
+                  f"{held / 2 ** 20:,.1f} MiB  (full pass {full_pass * 1000:,.0f} ms)")
+
+
+class _CyclingFrames:
+    """In-memory stand-in for gif_stream.GifFrameStream that loops over pre-scaled frames."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.index = 0
+
+    def next_frame(self, timeout=None):
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        return frame
+
+
+def bench_playback(args):
+    """CPU usage of the quit screen loop: 60 fps redraws versus redrawing when a frame's duration has passed."""
+    from collections import namedtuple
+
+    import frame_player
+
+    Frame = namedtuple("Frame", ["index", "pixels", "size", "duration"])
+    size = (1920, 1080)
+    pixels = bytes(size[0] * size[1] * 3)
+    frames = [Frame(index, pixels, size, duration) for index, duration in enumerate((80, 80, 120, 200, 60))]
+    seconds = max(2.0, args.min_time)
+    idle = threading.Event()  # never set; its wait() stands in for pygame.event.wait(timeout)
+    print(f"Quit screen playback ({seconds:.0f} s, {size[0]}x{size[1]}, one frame copy per redraw):")
+
+    stream = _CyclingFrames(frames)
+    frame, redraws = stream.next_frame(), 0
+    start, cpu_start = time.monotonic(), time.process_time()
+    last_update = start
+    while time.monotonic() - start < seconds:  # the old loop: fixed 100 ms frames, blit and flip at 60 fps
+        now = time.monotonic()
+        if now - last_update > 0.1:
+            frame, last_update = stream.next_frame(), now
+        bytearray(frame.pixels)
+        redraws += 1
+        idle.wait(1 / 60)
+    cpu = time.process_time() - cpu_start
+    print(f"  {'60 fps loop: redraws / CPU':<40}{redraws:>12,} / {100 * cpu / seconds:.1f}%")
+
+    player = frame_player.FramePlayer(_CyclingFrames(frames))
+    frame, redraws = player.start(), 0
+    start = time.monotonic()
+    while time.monotonic() - start < seconds:
+        if frame is not None:
+            bytearray(frame.pixels)
+            redraws += 1
+        idle.wait(player.wait_time())
+        frame = player.advance()
+    stats = player.finish()
+    print(f"  {'frame player: redraws / CPU':<40}{redraws:>12,} / {stats.cpu_percent:.1f}%  "
+          f"({stats.frames_dropped} dropped, {stats.frames_late} late)")
+
+
+def _leaderboard_writer(path, legacy, worker, submissions, players):
+    """Process body of bench_leaderboard: submits random scores, returns the best score sent per player."""
+    import random
+
+    import leaderboard_store
+
+    rng = random.Random(worker)
+    store = None if legacy else leaderboard_store.LeaderboardStore(path, legacy_path=None)
+    sent = {}
+    for _ in range(submissions):
+        player, score = f"player{rng.randrange(players)}", rng.randrange(1, 1000)
+        sent[player] = max(sent.get(player, 0), score)
+        if store:
+            store.submit(player, score)
+            continue
+        # Load, update, rewrite: how leaderboard_utils worked with data/leaderboard.json
+        try:
+            with open(path, "r") as file:
+                scores = json.load(file)
+        except (OSError, ValueError):
+            scores = {}
+        scores[player] = max(scores.get(player, 0), score)
+        with open(path, "w") as file:
+            json.dump(scores, file)
+    return sent
+
+
+def bench_leaderboard(args):
+    """Parallel writer processes: lost updates of the JSON file versus the SQLite leaderboard store."""
+    import os
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    import leaderboard_store
+
+    writers, submissions, players = 8, 250, 50
+    print(f"Leaderboard stress ({writers} processes x {submissions} submissions, {players} players):")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, legacy in (("JSON file rewrite", True), ("SQLite store upsert", False)):
+            path = os.path.join(directory, "leaderboard.json" if legacy else "leaderboard.db")
+            if not legacy:
+                leaderboard_store.LeaderboardStore(path, legacy_path=None)  # create the schema once
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=writers) as executor:
+                futures = [executor.submit(_leaderboard_writer, path, legacy, worker, submissions, players)
+                           for worker in range(writers)]
+                expected = {}
+                for future in futures:
+                    for player, score in future.result().items():
+                        expected[player] = max(expected.get(player, 0), score)
+            elapsed = time.perf_counter() - start
+
+            if legacy:
+                try:
+                    with open(path, "r") as file:
+                        stored = json.load(file)
+                except ValueError:
+                    stored = {}
+            else:
+                stored = dict(leaderboard_store.LeaderboardStore(path, legacy_path=None).top(players))
+            wrong = sum(stored.get(player) != score for player, score in expected.items())
+            rate = writers * submissions / elapsed
+            print(f"  {label:<40}{rate:>12,.1f} writes/s  {wrong:>3} of {len(expected)} best scores wrong")
+
+        store = leaderboard_store.LeaderboardStore(path, legacy_path=None)
+        print_result("top-5 query", measure(lambda _: store.top(5), [None], args.min_time), "queries/s")
+
+
+def _parse_import_times(stderr):
+    """Parses `python -X importtime` output into {module: (self us, cumulative us)}."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def bench_startup(args):
+    """Time to the main menu in a fresh interpreter, checked against the startup budget."""
+    import statistics
+    import subprocess
+
+    script = ("import sys, main, menu; menu.print_main_menu(); "
+              f"print('loaded:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    print(f"Startup to main menu (budget {args.startup_budget:.0f} ms):")
+    wall_times, runs = [], 0
+    start = time.perf_counter()
+    while runs < 5 or time.perf_counter() - start < args.min_time:
+        run_start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                                capture_output=True, text=True)
+        wall_times.append((time.perf_counter() - run_start) * 1000)
+        runs += 1
+        if result.returncode != 0:
+            print(f"  startup failed:\n{result.stderr.strip().splitlines()[-1]}")
+            return False
+
+    times = _parse_import_times(result.stderr)
+    loaded = [module for module in result.stdout.strip().splitlines()[-1][len("loaded:"):].split(",") if module]
+    time_to_menu = statistics.median(wall_times)
+    print(f"  {'time to menu (median of ' + str(runs) + ' runs)':<40}{time_to_menu:>12,.1f} ms")
+    print(f"  {'import main (cumulative)':<40}{times['main'][1] / 1000:>12,.1f} ms")
+    for name, (_, cumulative) in sorted(times.items(), key=lambda item: -item[1][1])[1:4]:
+        print(f"    {name:<38}{cumulative / 1000:>12,.1f} ms")
+    print(f"  {'heavy modules loaded':<40}{', '.join(loaded) or 'none':>12}")
+
+    if loaded or time_to_menu > args.startup_budget:
+        print(f"  OVER BUDGET: menu after {time_to_menu:.1f} ms"
+              + (f", eagerly imported {', '.join(loaded)}" if loaded else ""))
+        return False
+    return True
+
+
+def _server_stubs(ports, stop, latency):
+    """Process body of bench_server: serves the fixture pages as MediaWiki and answers as OpenAI until stopped."""
+    import wiki_api
+    import wiki_replay
+
+    fixture = wiki_replay.Recording.load(EXTRACTS_PATH)
+    categories = wiki_api.load_categories_from_json(wiki_api.CATEGORY_JSON_PATH)
+    recording = wiki_replay.Recording(fixture.pages, {category: list(fixture.pages) for category in categories})
+    wiki_server, wiki_url = wiki_replay.start_stub_server(recording, latency=latency)
+    openai_server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOpenAIHandler)
+    threading.Thread(target=openai_server.serve_forever, daemon=True).start()
+    ports.put((wiki_url, f"http://127.0.0.1:{openai_server.server_port}/v1"))
+    stop.wait()
+    wiki_server.shutdown()
+    openai_server.shutdown()
+
+
+def _server_clients(port, sessions, rounds):
+    """Process body of bench_server: plays `sessions` games at once, returns answer-to-next-prompt latencies."""
+    import asyncio
+
+    async def play(session):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1 << 20)
+        await reader.readuntil(b"unknown: ")
+        writer.write(f"bench{session}\n".encode())
+        await reader.readuntil(b"press Enter: ")
+        latencies = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            writer.write(b"1\n")
+            await reader.readuntil(b"press Enter: ")
+            latencies.append(time.perf_counter() - start)
+        writer.write(b"quit\n")
+        await reader.read()
+        writer.close()
+        return latencies
+
+    async def run():
+        results = await asyncio.gather(*(play(session) for session in range(sessions)))
+        return [latency for latencies in results for latency in latencies]
+
+    return asyncio.run(run())
+
+
+def bench_server(args):
+    """
+    Server CPU per round and round latency with many concurrent sessions, against the sessions-per-core target.
+
+    Rounds come from the real pipeline (game_logic.generate_round: page fetch,
+    caches, lie strategy, LLM escalation) against MediaWiki and OpenAI stubs
+    running in another process, so their CPU is not counted as server CPU.
+    """
+    import asyncio
+    import multiprocessing
+    import os
+    import statistics
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    from openai import OpenAI
+
+    import game_server
+    import gpt_api
+    import leaderboard_store
+    import leaderboard_utils
+    import lie_cache
+    import wiki_api
+
+    sessions, rounds, stub_latency = 200, 5, 0.02
+    ports, stop = multiprocessing.Queue(), multiprocessing.Event()
+    stubs = multiprocessing.Process(target=_server_stubs, args=(ports, stop, stub_latency), daemon=True)
+    stubs.start()
+    wiki_url, openai_url = ports.get(timeout=30)
+    print(f"Game server ({sessions} concurrent sessions x {rounds} rounds, real round pipeline against "
+          f"MediaWiki and OpenAI stubs, {stub_latency * 1000:.0f} / {_StubOpenAIHandler.latency * 1000:.0f} ms):")
+    with tempfile.TemporaryDirectory() as directory:
+        leaderboard_utils.set_store(leaderboard_store.LeaderboardStore(os.path.join(directory, "leaderboard.db"),
+                                                                       legacy_path=None))
+        gpt_api.set_lie_cache(lie_cache.LieCache(os.path.join(directory, "lie_cache.db")))
+        gpt_api.set_client(OpenAI(api_key="stub", base_url=openai_url))
+        wiki_api.set_client(wiki_api.WikiClient(api_url=wiki_url))
+        wiki_api.use_memory_caches()
+        openai_calls = gpt_api.get_scheduler().metrics()["calls"]
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        server = game_server.GameServer(port=0, lives=rounds + 1, total_time=3600)
+        asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+        try:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                executor.submit(_server_clients, server.port, 1, 1).result()  # warm up the client process
+                cpu_start, start = time.process_time(), time.perf_counter()
+                latencies = executor.submit(_server_clients, server.port, sessions, rounds).result()
+                elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+        finally:
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            leaderboard_utils.set_store(None)
+            wiki_api.wait_for_race_batches()
+            wiki_api.set_client(None)
+            wiki_api.use_memory_caches()
+            gpt_api.set_client(None)
+            gpt_api.set_lie_cache(None)
+            stop.set()
+            stubs.join(5)
+
+    latencies.sort()
+    cpu_per_round = cpu / len(latencies)
+    sessions_per_core = game_server.THINK_TIME / cpu_per_round
+    print_result("rounds played", len(latencies) / elapsed, "rounds/s")
+    print(f"  {'round latency p50 / p95':<40}{statistics.median(latencies) * 1000:>12,.1f} / "
+          f"{latencies[int(len(latencies) * 0.95)] * 1000:,.1f} ms")
+    print(f"  {'server CPU per round':<40}{cpu_per_round * 1000:>12,.3f} ms")
+    print(f"  {'sessions per core':<40}{sessions_per_core:>12,.0f} (target {game_server.SESSIONS_PER_CORE_TARGET:,}, "
+          f"one answer every {game_server.THINK_TIME:.0f} s)")
+    print(f"  {'OpenAI requests':<40}{gpt_api.get_scheduler().metrics()['calls'] - openai_calls:>12,}")
+    print(f"  {'server metrics':<40}{server.metrics()}")
+    if sessions_per_core < game_server.SESSIONS_PER_CORE_TARGET:
+        print("  BELOW TARGET")
+        return False
+    return True
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive MediaWiki stand-in that counts TCP connections."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    requests = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        type(self).requests += 1
+        body = json.dumps({"query": {"random": [{"title": "Stub page"}]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench_connections(args):
+    """Checks that WikiClient reuses one keep-alive connection across many requests."""
+    import wiki_api
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = wiki_api.WikiClient(api_url=f"http://127.0.0.1:{server.server_port}/w/api.php")
+    count = 200
+
+    try:
+        start = time.perf_counter()
+        for _ in range(count):
+            client.get({"action": "query", "list": "random", "format": "json"})
+        elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+    print("Connection reuse (local stub server):")
+    print(f"  {'requests served':<40}{_CountingHandler.requests:>12}")
+    print(f"  {'TCP connections opened':<40}{_CountingHandler.connections:>12}")
+    print_result("request rate", count / elapsed, "req/s")
+    if _CountingHandler.connections != 1:
+        raise SystemExit("WikiClient opened more than one connection for sequential requests")
+
+
+class _ThrottlingHandler(BaseHTTPRequestHandler):
+    """API stand-in that serves `capacity` requests per second and answers 429 with Retry-After beyond that."""
+
+    protocol_version = "HTTP/1.1"
+    capacity = 20
+    lock = threading.Lock()
+    window = [0.0, 0]  # window start, requests served in it
+    throttled = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            now = time.monotonic()
+            if now - cls.window[0] >= 1.0:
+                cls.window[:] = [now, 0]
+            allowed = cls.window[1] < cls.capacity
+            cls.window[1] += allowed
+            cls.throttled += not allowed
+        body = b"{}" if allowed else b'{"error": "throttled"}'
+        self.send_response(200 if allowed else 429)
+        if not allowed:
+            self.send_header("Retry-After", "1")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench_scheduler(args):
+    """Concurrent sessions against a throttled upstream: per-call backoff versus the shared scheduler."""
+    import urllib.error
+    import urllib.request
+    from concurrent.futures import ThreadPoolExecutor
+
+    import request_scheduler
+
+    sessions, calls_per_session = 16, 5
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ThrottlingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+
+    def fetch():
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                return response.read()
+        except urllib.error.HTTPError as e:
+            retry_after = request_scheduler.parse_retry_after(e.headers.get("Retry-After"))
+            raise request_scheduler.ThrottledError(f"HTTP {e.code}", retry_after) from None
+
+    def per_call_backoff():
+        for attempt in range(10):
+            try:
+                return fetch()
+            except request_scheduler.ThrottledError:
+                time.sleep(0.1 * 2 ** attempt)
+        raise RuntimeError("gave up")
+
+    scheduler = request_scheduler.Scheduler("bench", rate=_ThrottlingHandler.capacity * 0.9,
+                                            burst=5, max_attempts=10)
+    print(f"{sessions} sessions x {calls_per_session} calls against a "
+          f"{_ThrottlingHandler.capacity} req/s upstream:")
+    try:
+        for label, call in (("per-call exponential backoff", per_call_backoff),
+                            ("shared token bucket scheduler", lambda: scheduler.call(fetch))):
+            _ThrottlingHandler.throttled = 0
+            time.sleep(1.0)  # let the upstream window reset
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=sessions) as executor:
+                for future in [executor.submit(call) for _ in range(sessions * calls_per_session)]:
+                    future.result()
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<40}{elapsed:>9,.2f} s  {_ThrottlingHandler.throttled:>5} throttled responses")
+        metrics = scheduler.metrics()
+        print(f"  {'scheduler queue delay avg / p95':<40}"
+              f"{metrics['queue_delay_avg_ms']:>9,.0f} / {metrics['queue_delay_p95_ms']:,.0f} ms")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _StubOpenAIHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible chat completions stand-in that answers after a fixed delay."""
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.2
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        user_content = request["messages"][-1]["content"]
+        time.sleep(self.latency)
+        try:
+            facts = json.loads(user_content)
+        except ValueError:
+            facts = None
+        if isinstance(facts, list):
+            content = json.dumps([f"It is a myth that {fact}" for fact in facts])
+        else:
+            content = f"It is a myth that {user_content}"
+
+        body = json.dumps({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench_lies(args):
+    """Lie generation latency against a local OpenAI stub: sequential, concurrent and batched."""
+    from openai import OpenAI
+
+    import gpt_api
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    gpt_api.set_client(OpenAI(api_key="stub", base_url=f"http://127.0.0.1:{server.server_port}/v1"))
+    facts = [sentence for _, extract in load_extracts() for sentence in extract.split(". ")][:8]
+    service = gpt_api.LieService()
+
+    print(f"Lie generation for {len(facts)} sentences ({_StubOpenAIHandler.latency * 1000:.0f} ms stub latency):")
+    try:
+        for label, generate in (
+            ("sequential get_gpt_lie", lambda: [gpt_api.get_gpt_lie(fact) for fact in facts]),
+            ("LieService.generate (concurrent)", lambda: service.generate(facts)),
+            ("get_gpt_lies_batched (one prompt)", lambda: gpt_api.get_gpt_lies_batched(facts)),
+        ):
+            start = time.perf_counter()
+            lies = generate()
+            elapsed = time.perf_counter() - start
+            if len(lies) != len(facts):
+                raise SystemExit(f"{label} returned {len(lies)} lies for {len(facts)} sentences")
+            print(f"  {label:<40}{elapsed * 1000:>12,.1f} ms")
+    finally:
+        service.shutdown()
+        gpt_api.set_client(None)
+        server.shutdown()
+        server.server_close()
+
+
+BENCHMARKS = {
+    "cleaning": bench_cleaning,
+    "connections": bench_connections,
+    "corpus": bench_corpus,
+    "gif": bench_gif,
+    "leaderboard": bench_leaderboard,
+    "lie_batch": bench_lie_batch,
+    "lie_gen": bench_lie_gen,
+    "lie_quality": bench_lie_quality,
+    "lies": bench_lies,
+    "pipeline": bench_pipeline,
+    "playback": bench_playback,
+    "render": bench_render,
+    "rounds": bench_rounds,
+    "scheduler": bench_scheduler,
+    "server": bench_server,
+    "startup": bench_startup,
+}
+
+
+def main():
+    """Runs the selected benchmarks."""
+    parser = argparse.ArgumentParser(description="Beyond Belief performance benchmarks.")
+    parser.add_argument("names", nargs="*", metavar="name",
+                        help=f"benchmarks to run: {', '.join(sorted(BENCHMARKS))} (default: all)")
+    parser.add_argument("--min-time", type=float, default=1.0, help="minimum seconds per measurement")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_MS,
+                        help="milliseconds allowed from interpreter start to the main menu")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    # Benchmarks that enforce a budget return False when it is exceeded
+    failed = [name for name in args.names or sorted(BENCHMARKS) if BENCHMARKS[name](args) is False]
+    if failed:
+        sys.exit(f"Over budget: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
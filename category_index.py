@@ -0,0 +1,155 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+CATEGORY_CACHE_PATH = "data/category_cache.json"
+DEFAULT_TTL = 7 * 24 * 60 * 60  # one week
+DEFAULT_MAX_CATEGORIES = 64
+EMPTY_TTL = 6 * 60 * 60  # empty (or misspelled) categories are asked again after six hours
+
+
+class CategoryIndex:
+    """
+    Local index of category members with a time-to-live and LRU eviction.
+
+    Members are downloaded once per category, kept in memory and persisted to
+    disk, so random picks are served without a network call until the entry
+    expires. Concurrent misses on one category share a single download.
+
+    Args:
+        fetch_members (callable): Function taking a category name and returning
+            the list of its page titles, or None if the request failed.
+        path (str | None): JSON file used to persist the index. None keeps it in memory only.
+        ttl (float): Seconds before a category is downloaded again.
+        empty_ttl (float): Seconds before a category without members is downloaded again.
+        max_categories (int): Maximum number of categories kept; the least
+            recently used ones are evicted first.
+    """
+
+    def __init__(self, fetch_members, path=CATEGORY_CACHE_PATH, ttl=DEFAULT_TTL,
+                 max_categories=DEFAULT_MAX_CATEGORIES, empty_ttl=EMPTY_TTL):
+        self.fetch_members = fetch_members
+        self.path = path
+        self.ttl = ttl
+        self.empty_ttl = min(empty_ttl, ttl)
+        self.max_categories = max_categories
+        self._entries = OrderedDict()
+        self._pending = {}  # category -> Future of the download in progress
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._load()
+
+    def members(self, category):
+        """
+        Returns all known page titles of a category, downloading them if needed.
+
+        Args:
+            category (str): Category name.
+
+        Returns:
+            list: Page titles (empty if the category has no pages or could not be fetched).
+        """
+        with self._lock:
+            entry = self._entries.get(category)
+            if entry and not self._expired(entry, time.time()):
+                self._entries.move_to_end(category)
+                return entry["members"]
+            pending = self._pending.get(category)
+            downloading = pending is None
+            if downloading:
+                pending = self._pending[category] = Future()
+        if not downloading:
+            return pending.result()
+
+        try:
+            titles = self.fetch_members(category)
+        except BaseException as e:
+            with self._lock:
+                del self._pending[category]
+            pending.set_exception(e)
+            raise
+
+        fetched = titles is not None
+        if not fetched:
+            # Serve stale data rather than nothing if the refresh failed
+            titles = entry["members"] if entry else []
+        with self._lock:
+            if fetched:
+                self._entries[category] = {"fetched_at": time.time(), "members": titles}
+                self._entries.move_to_end(category)
+                while len(self._entries) > self.max_categories:
+                    self._entries.popitem(last=False)
+            del self._pending[category]
+        pending.set_result(titles)
+        if fetched:
+            self._save()
+        return titles
+
+    def random_member(self, category):
+        """
+        Picks a random page title from a category.
+
+        Args:
+            category (str): Category name.
+
+        Returns:
+            str | None: Page title or None if the category is empty or unavailable.
+        """
+        titles = self.members(category)
+        return random.choice(titles) if titles else None
+
+    def sample(self, category, count, rng=random):
+        """
+        Picks up to count distinct random page titles from a category.
+
+        Args:
+            category (str): Category name.
+            count (int): Number of titles.
+            rng (random.Random, optional): Random generator, e.g. a seeded one for replays.
+
+        Returns:
+            list: Page titles.
+        """
+        titles = self.members(category)
+        return rng.sample(titles, min(count, len(titles)))
+
+    def _load(self):
+        """Loads persisted entries, dropping expired ones."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable category cache '{self.path}': {e}")
+            return
+
+        now = time.time()
+        for category, entry in sorted(data.items(), key=lambda item: item[1]["fetched_at"]):
+            if not self._expired(entry, now):
+                self._entries[category] = entry
+        while len(self._entries) > self.max_categories:
+            self._entries.popitem(last=False)
+
+    def _expired(self, entry, now):
+        """Returns True if an entry is older than its TTL; empty entries expire sooner."""
+        return now - entry["fetched_at"] >= (self.ttl if entry["members"] else self.empty_ttl)
+
+    def _save(self):
+        """Writes a snapshot of the index to disk atomically, without blocking lookups."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with self._save_lock:
+            with self._lock:
+                snapshot = dict(self._entries)  # taken under the save lock, so a newer write is never overwritten
+            try:
+                with open(tmp_path, "w") as file:
+                    json.dump(snapshot, file)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Could not write category cache '{self.path}': {e}")
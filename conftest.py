@@ -0,0 +1,9 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _repo_root(monkeypatch):
+    """Runs every test from the repository root, where the game's relative data/ paths resolve."""
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
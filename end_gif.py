@@ -1,7 +1,14 @@
+import math
 import os
 import pygame
 from PIL import Image
 
+import frame_player
+import gif_stream
+
+
+GIF_PATH = "data/BIGGY.gif"
+
 
 def load_gif_from_file(path):
     """
@@ -20,6 +27,9 @@ def gif_to_pygame_frames(gif, target_size):
     """
     Converts a GIF into a list of Pygame-compatible frames.
 
+    Decodes and scales every frame up front; show_gif streams frames with
+    gif_stream.GifFrameStream instead, which keeps memory bounded.
+
     Args:
         gif (PIL.Image.Image): GIF image object.
         target_size (tuple): Target size as (width, height).
@@ -40,6 +50,19 @@ def gif_to_pygame_frames(gif, target_size):
     return frames
 
 
+def frame_to_surface(frame):
+    """
+    Wraps a decoded frame in a Pygame surface without copying its pixels.
+
+    Args:
+        frame (gif_stream.Frame): Decoded, scaled frame.
+
+    Returns:
+        pygame.Surface: Surface backed by the frame's pixel buffer.
+    """
+    return pygame.image.frombuffer(frame.pixels, frame.size, "RGB")
+
+
 def sound_test():
     """
     Checks if the sound file exists.
@@ -94,19 +117,16 @@ def show_gif():
     info = pygame.display.Info()
     screen_size = (info.current_w, info.current_h)
 
-    # Load and prepare GIF
-    try:
-        gif = load_gif_from_file("data/BIGGY.gif")
-        frames = gif_to_pygame_frames(gif, screen_size)
-    except Exception as e:
-        print(f"Error loading GIF: {e}")
+    # Start decoding in the background; frames are scaled as they are needed
+    if not os.path.exists(GIF_PATH):
+        print(f"Error loading GIF: '{GIF_PATH}' not found")
         pygame.quit()
         return
+    frames = gif_stream.GifFrameStream(GIF_PATH, screen_size).start()
 
     # Setup fullscreen window
     screen = pygame.display.set_mode(screen_size, pygame.FULLSCREEN)
     pygame.display.set_caption("GIF with blowing sound")
-    clock = pygame.time.Clock()
 
     # Play sound if possible
     if mixer_initialized and sound_exists:
@@ -127,26 +147,40 @@ def show_gif():
                 print(f"Error with pygame.mixer.music: {e2}")
                 sound_method = None
 
-    # Animate GIF frames
-    running = True
-    frame_index = 0
-    frame_delay = 100  # milliseconds between frames
-    last_update = pygame.time.get_ticks()
+    # Animate GIF frames, redrawing only when a frame's own duration has passed
+    player = frame_player.FramePlayer(frames)
+    first_frame = player.start()
+    if first_frame is None:
+        print(f"Error loading GIF: {frames.error}")
+        frames.stop()
+        pygame.quit()
+        return
+    current_frame = frame_to_surface(first_frame)
+    redraw = True
 
+    running = True
     while running:
-        for event in pygame.event.get():
+        if redraw:
+            screen.blit(current_frame, (0, 0))
+            pygame.display.flip()
+            redraw = False
+
+        # Sleep until the next frame is due or input arrives; a timeout of 0 would wait forever
+        timeout = max(1, math.ceil(player.wait_time() * 1000))
+        for event in [pygame.event.wait(timeout)] + pygame.event.get():
             if event.type == pygame.QUIT or \
                     (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
                 running = False
+            elif event.type == pygame.VIDEOEXPOSE:
+                redraw = True
 
-        now = pygame.time.get_ticks()
-        if now - last_update > frame_delay:
-            frame_index = (frame_index + 1) % len(frames)
-            last_update = now
+        next_frame = player.advance()
+        if next_frame is not None:
+            current_frame = frame_to_surface(next_frame)
+            redraw = True
 
-        screen.blit(frames[frame_index], (0, 0))
-        pygame.display.flip()
-        clock.tick(60)
+    frames.stop()
+    print(f"Quit screen: {player.finish().summary()}")
 
     # Stop sound on exit
     if sound_method == "sound":
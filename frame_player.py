@@ -0,0 +1,138 @@
+import time
+
+MIN_FRAME_DURATION = 20  # milliseconds; shorter GIF delays are clamped like browsers do
+STARVED_POLL = 0.005  # seconds between checks while the decoder has no frame ready
+RESYNC_AFTER = 1.0  # seconds behind schedule after which playback restarts from now instead of catching up
+
+
+class PlaybackStats:
+    """
+    Counters of one animation playback.
+
+    Attributes:
+        frames_shown (int): Frames drawn.
+        frames_dropped (int): Frames skipped to stay on schedule.
+        frames_late (int): Times the next frame was due but not decoded yet.
+        wall_time (float): Seconds of playback.
+        cpu_time (float): Process CPU seconds used meanwhile, decoder thread included.
+    """
+
+    def __init__(self):
+        self.frames_shown = 0
+        self.frames_dropped = 0
+        self.frames_late = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+    @property
+    def cpu_percent(self):
+        """Average CPU usage of one core, in percent."""
+        return 100 * self.cpu_time / self.wall_time if self.wall_time else 0.0
+
+    def summary(self):
+        """Returns a one-line report."""
+        return (f"{self.frames_shown} frames shown, {self.frames_dropped} dropped, {self.frames_late} late, "
+                f"{self.cpu_percent:.1f}% CPU over {self.wall_time:.1f} s")
+
+
+class FramePlayer:
+    """
+    Decides when the next frame of an animation is due.
+
+    Each frame stays on screen for its own duration, so the caller only needs
+    to redraw when advance() returns a frame and can sleep, or wait for input
+    events, for wait_time() seconds in between. Frames whose display time has
+    already passed are dropped to keep the animation in step with the clock.
+
+    Args:
+        frames (gif_stream.GifFrameStream): Source with a next_frame(timeout) method.
+        clock (callable): Monotonic time in seconds.
+    """
+
+    def __init__(self, frames, clock=time.monotonic):
+        self.frames = frames
+        self.clock = clock
+        self.stats = PlaybackStats()
+        self._due = None
+        self._starved = False
+        self._started_at = None
+        self._cpu_started_at = None
+
+    def start(self, timeout=None):
+        """
+        Waits for the first frame and starts the playback clock.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the decoder; None waits indefinitely.
+
+        Returns:
+            Frame | None: First frame to draw, or None if none could be decoded.
+        """
+        frame = self.frames.next_frame(timeout)
+        if frame is None:
+            return None
+        self._started_at = self.clock()
+        self._cpu_started_at = time.process_time()
+        self._due = self._started_at + self._duration(frame)
+        self.stats.frames_shown += 1
+        return frame
+
+    def wait_time(self):
+        """
+        Returns how long the caller may wait before calling advance().
+
+        Returns:
+            float: Seconds until the next frame is due.
+        """
+        if self._starved:
+            return STARVED_POLL
+        return max(0.0, self._due - self.clock())
+
+    def advance(self):
+        """
+        Returns the frame to draw now, if the current one has been shown long enough.
+
+        Returns:
+            Frame | None: New frame to draw, or None to keep the current one.
+        """
+        now = self.clock()
+        if now < self._due:
+            return None
+        frame = self.frames.next_frame(timeout=0)
+        if frame is None:
+            if not self._starved:
+                self.stats.frames_late += 1
+            self._starved = True
+            return None
+        self._starved = False
+
+        if now - self._due > RESYNC_AFTER:
+            self._due = now  # e.g. the window was suspended; don't replay the backlog
+        due = self._due + self._duration(frame)
+        while due <= now:
+            skipped = self.frames.next_frame(timeout=0)
+            if skipped is None:
+                break
+            self.stats.frames_dropped += 1
+            frame = skipped
+            due += self._duration(frame)
+        self._due = due
+        self.stats.frames_shown += 1
+        return frame
+
+    def finish(self):
+        """
+        Stops timing the playback.
+
+        Returns:
+            PlaybackStats: Final counters.
+        """
+        if self._started_at is not None:
+            self.stats.wall_time = self.clock() - self._started_at
+            self.stats.cpu_time = time.process_time() - self._cpu_started_at
+        return self.stats
+
+    @staticmethod
+    def _duration(frame):
+        """Display time of a frame in seconds."""
+        return max(frame.duration, MIN_FRAME_DURATION) / 1000
@@ -1,11 +1,16 @@
+import logging
 import os
 import random
-import textwrap
+import threading
 import time
 
 import gpt_api
-import lie_gen
+import lie_strategy
 import menu
+import request_scheduler
+import round_pool
+import round_prefetch
+import screen
 import wiki_api
 
 # Terminal color codes
@@ -16,6 +21,21 @@ RESET = "\033[0m"
 # Game constants
 LIVES = 3
 TOTAL_TIME = 60 * 5  # 5 minutes
+PREFETCH_DEPTH = 2  # rounds prepared in the background while the player reads
+MAX_LIE_PAGES = 3  # pages tried before giving up on a round without a lie
+# Where rounds come from: "live" (Wikipedia + OpenAI) or "pool" (pre-generated local rounds)
+ROUND_SOURCE = os.getenv("ROUND_SOURCE", "live")
+# Names of the request schedulers as shown to players
+SERVICE_NAMES = {"wikipedia": "Wikipedia", "openai": "OpenAI"}
+
+logger = logging.getLogger(__name__)
+
+_round_pool = None
+_round_pool_lock = threading.Lock()
+
+
+class NoLieError(RuntimeError):
+    """Raised when no lie could be generated for any of the fetched pages."""
 
 truth_quotes = [
     "You're right — this story was entirely made up.",
@@ -56,35 +76,110 @@ lie_quotes = [
 
 def clear_screen():
     """Clears the terminal screen."""
-    if os.name == 'nt':
-        os.system('cls')
-    else:
-        if 'TERM' in os.environ:
-            os.system('clear')
-        else:
-            print("\n" * 100)
+    screen.clear_screen()
 
 
-def get_sentences_for_game():
+def get_round_pool():
+    """
+    Returns the shared round pool, opening it on first use.
+
+    Returns:
+        RoundPool: Pool of pre-generated rounds.
+    """
+    global _round_pool
+    if _round_pool is None:
+        with _round_pool_lock:
+            if _round_pool is None:
+                _round_pool = round_pool.RoundPool()
+    return _round_pool
+
+
+def get_sentences_for_game(player_name=None, source=None):
+    """
+    Returns the next round, either generated live or drawn from the local round pool.
+
+    In pool mode each player only sees rounds they have not played before; once the
+    pool is exhausted for them, rounds are generated live instead.
+
+    Args:
+        player_name (str, optional): Player name used for repeat tracking in pool mode.
+        source (str, optional): "live" or "pool". Defaults to ROUND_SOURCE.
+
+    Returns:
+        tuple: (page_title, sentences, lie_index)
+    """
+    if (source or ROUND_SOURCE) == "pool":
+        game_round = get_round_pool().draw_round(player_name)
+        if game_round:
+            return game_round
+    return generate_round()
+
+
+def generate_round():
     """
     Retrieves three sentences from a spooky Wikipedia page,
     replaces one with a generated lie, and returns them along with the page title and index of the lie.
+
+    The lie replaces one of the page's precomputed lie-eligible sentences; the two
+    truths are drawn from the other sentences at the start of the article. If no
+    lie can be made from any eligible sentence, another page is tried.
+
+    Raises:
+        NoLieError: If no lie could be generated for MAX_LIE_PAGES pages in a row.
+        PageUnavailableError: If Wikipedia is unavailable and no fallback page exists.
     """
-    page_title, sentences = wiki_api.get_valid_wikipedia_page_info(spooky=True)
-    selected_sentences = random.sample(sentences[:6], 3)
-    lie_index = random.randrange(3)
-    original_sentence = selected_sentences[lie_index]
+    rng = wiki_api.get_backend().random  # seeded for replays, see wiki_api.ContentBackend
+    for _ in range(MAX_LIE_PAGES):
+        page_title, sentences, lie_candidates = wiki_api.get_valid_wikipedia_page(spooky=True)
+        window = min(len(sentences), wiki_api.ROUND_WINDOW)
+
+        for lie_source in rng.sample(lie_candidates, len(lie_candidates)):
+            context = [sentence for i, sentence in enumerate(sentences) if i != lie_source]
+            lie = lie_strategy.generate_lie(sentences[lie_source], context=context)
+            if lie is None:
+                continue
+            chosen = rng.sample([i for i in range(window) if i != lie_source], 2)
+            lie_index = rng.randrange(3)
+            chosen.insert(lie_index, lie_source)
 
-    attempts = 0
-    while ('=' in original_sentence or
-           any(char.isdigit() for char in original_sentence) or
-           attempts > 5):
-        selected_sentences = random.sample(sentences[:6], 3)
-        original_sentence = selected_sentences[lie_index]
-        attempts += 1
+            selected_sentences = [sentences[i] for i in chosen]
+            selected_sentences[lie_index] = lie
+            return page_title, selected_sentences, lie_index
+        print(f"No lie could be generated for '{page_title}', trying another page.")
+    if gpt_api.get_scheduler().is_open():
+        raise NoLieError("OpenAI is unavailable and no lie could be made locally for the fetched pages.")
+    raise NoLieError("No lie could be generated for the fetched pages.")
 
-    selected_sentences[lie_index] = gpt_api.get_gpt_lie(original_sentence)
-    return page_title, selected_sentences, lie_index
+
+def describe_round_error(error):
+    """
+    Explains to the player why the next round could not be prepared.
+
+    Args:
+        error (Exception): What building the round raised.
+
+    Returns:
+        str: The cause, in one line.
+    """
+    if isinstance(error, (wiki_api.PageUnavailableError, NoLieError)):
+        return str(error)
+    if isinstance(error, request_scheduler.CircuitOpenError):
+        return f"{SERVICE_NAMES.get(error.service, 'A service the game needs')} is unavailable right now."
+    return "The next round could not be prepared because of an unexpected error."
+
+
+def render_boxed_text(lines, title=None):
+    """
+    Renders a box around a list of text lines with an optional title.
+
+    Args:
+        lines (list): List of strings to display.
+        title (str, optional): Optional title string.
+
+    Returns:
+        str: The rendered box.
+    """
+    return screen.box(lines, title, color=GREEN, reset=RESET)
 
 
 def print_boxed_text(lines, title=None):
@@ -95,41 +190,65 @@ def print_boxed_text(lines, title=None):
         lines (list): List of strings to display.
         title (str, optional): Optional title string.
     """
-    max_width = 117
-    print(f"{GREEN}╔" + "═" * max_width + "╗")
-    if title:
-        title_lines = textwrap.wrap(title, max_width)
-        for line in title_lines:
-            print(f" {line.ljust(max_width)} ")
-    for line in lines:
-        wrapped = textwrap.wrap(line, max_width)
-        for w_line in wrapped:
-            print(f" {w_line.ljust(max_width)} ")
-    print("╚" + "═" * max_width + "╝" + f"{RESET}")
+    screen.write(render_boxed_text(lines, title))
 
 
-def print_lives_and_points(lives, points, time_left_formatted):
+def render_lives_and_points(lives, points, time_left_formatted):
     """
-    Displays lives, points, and time left in a styled box.
+    Renders lives, points, and time left in a styled box.
 
     Args:
         lives (int): Number of remaining lives.
         points (int): Player's current score.
         time_left_formatted (str): Formatted remaining time.
+
+    Returns:
+        str: The rendered box.
     """
     lives_str = f"Lives: {lives * '❤️ '}".strip()
     points_str = f"Points: {points}"
     time_left_str = f"    Time Left: {time_left_formatted}"
 
-    max_width = 117
+    max_width = screen.WIDTH
     total_content_width = len(lives_str) + len(points_str) + len(time_left_str) + 2
     middle_spacing = (max_width - total_content_width) // 2
 
     line = f"{lives_str}{' ' * middle_spacing}{time_left_str}{' ' * middle_spacing}{points_str}"
+    return (f"{GREEN}{screen.border('╔', '╗')}\n"
+            f" {line.ljust(max_width)} \n"
+            f"{screen.border('╚', '╝')}{RESET}\n")
 
-    print(f"{GREEN}╔" + "═" * max_width + "╗")
-    print(f" {line.ljust(max_width)} ")
-    print(f"╚" + "═" * max_width + "╝" + f"{RESET}")
+
+def print_lives_and_points(lives, points, time_left_formatted):
+    """
+    Displays lives, points, and time left in a styled box.
+
+    Args:
+        lives (int): Number of remaining lives.
+        points (int): Player's current score.
+        time_left_formatted (str): Formatted remaining time.
+    """
+    screen.write(render_lives_and_points(lives, points, time_left_formatted))
+
+
+def render_wrapped_sentence(index, sentence):
+    """
+    Renders a single sentence with a number label in a styled box.
+
+    Args:
+        index (int): Sentence number (1-based).
+        sentence (str): The sentence text.
+
+    Returns:
+        str: The rendered box.
+    """
+    text_width = screen.WIDTH - 5
+    parts = [screen.border("╔", "╗")]
+    for i, line in enumerate(screen.wrap(sentence, text_width)):
+        label = f" {index}.  " if i == 0 else "      "
+        parts.append(f"{label}{line.ljust(text_width)} ")
+    parts.append(screen.border("╚", "╝"))
+    return "\n".join(parts) + "\n"
 
 
 def print_wrapped_sentence(index, sentence):
@@ -140,15 +259,23 @@ def print_wrapped_sentence(index, sentence):
         index (int): Sentence number (1-based).
         sentence (str): The sentence text.
     """
-    max_width = 117
-    wrapped = textwrap.wrap(sentence, width=max_width - 5)
-    print("╔" + "═" * max_width + "╗")
-    for i, line in enumerate(wrapped):
-        if i == 0:
-            print(f" {index}.  {line.ljust(max_width - 5)} ")
-        else:
-            print(f"      {line.ljust(max_width - 5)} ")
-    print("╚" + "═" * max_width + "╝")
+    screen.write(render_wrapped_sentence(index, sentence))
+
+
+def render_sentences(page_title, sentences):
+    """
+    Renders the Wikipedia page title and three sentences in boxes.
+
+    Args:
+        page_title (str): Title of the Wikipedia article.
+        sentences (list): List of sentence strings.
+
+    Returns:
+        str: The rendered boxes.
+    """
+    parts = [render_boxed_text([], title=f"    Wikipedia Article: {page_title}")]
+    parts.extend(render_wrapped_sentence(idx, sentence) for idx, sentence in enumerate(sentences, 1))
+    return "".join(parts)
 
 
 def display_sentences(page_title, sentences):
@@ -159,21 +286,35 @@ def display_sentences(page_title, sentences):
         page_title (str): Title of the Wikipedia article.
         sentences (list): List of sentence strings.
     """
-    print_boxed_text([], title=f"    Wikipedia Article: {page_title}")
-    for idx, sentence in enumerate(sentences, 1):
-        print_wrapped_sentence(idx, sentence)
+    screen.write(render_sentences(page_title, sentences))
 
 
-def main_game_loop():
+def main_game_loop(prefetcher=None, player_name=None, header=""):
     """
     Executes a single round of the game: shows sentences and gets player input.
 
+    The round is drawn as one frame: screen clear, header, sentences and
+    prompt are written to the terminal at once.
+
+    Args:
+        prefetcher (RoundPrefetcher, optional): Source of prepared rounds.
+            Rounds are fetched synchronously if omitted.
+        player_name (str, optional): Current player, used for pool repeat tracking.
+        header (str): Rendered text shown above the sentences, e.g. lives and points.
+
     Returns:
         bool: True if the player guessed correctly, False otherwise.
+
+    Raises:
+        Exception: If no round can be built, e.g. Wikipedia is unavailable and nothing is cached,
+            see describe_round_error.
     """
-    page_title, sentences, lie_index = get_sentences_for_game()
-    display_sentences(page_title, sentences)
-    print_boxed_text(["    What's the lie? (1-3)", ""])
+    if prefetcher:
+        page_title, sentences, lie_index = prefetcher.get_round()
+    else:
+        page_title, sentences, lie_index = get_sentences_for_game(player_name)
+    screen.Frame().add(header).add(render_sentences(page_title, sentences)).add(
+        render_boxed_text(["    What's the lie? (1-3)", ""])).write()
 
     while True:
         try:
@@ -197,11 +338,38 @@ def main_game_loop():
         return False
 
 
-def play_game():
+def play_game(player_name=None, prefetch_depth=PREFETCH_DEPTH):
     """
     Main game loop that manages lives, score, and time tracking.
     Ends when time is up or lives are lost.
 
+    Args:
+        player_name (str, optional): Current player, used for pool repeat tracking.
+        prefetch_depth (int): Number of rounds prepared in the background.
+            0 disables prefetching. Pool rounds are local and never prefetched.
+
+    Returns:
+        int: Final player score.
+    """
+    prefetcher = None
+    if prefetch_depth > 0 and ROUND_SOURCE != "pool":
+        prefetcher = round_prefetch.RoundPrefetcher(generate_round, depth=prefetch_depth).start()
+
+    try:
+        return _run_game(prefetcher, player_name)
+    finally:
+        if prefetcher:
+            prefetcher.stop()
+
+
+def _run_game(prefetcher, player_name):
+    """
+    Runs rounds until time is up or lives are lost.
+
+    Args:
+        prefetcher (RoundPrefetcher | None): Source of prepared rounds.
+        player_name (str | None): Current player.
+
     Returns:
         int: Final player score.
     """
@@ -212,18 +380,28 @@ def play_game():
     start_time = time.time()
 
     while True:
-        clear_screen()
         elapsed = time.time() - start_time
         time_left = total_time - elapsed
 
         if time_left <= 0:
+            clear_screen()
             menu.display_game_over_screen(points_count)
             break
 
         time_left_formatted = f"{int(time_left // 60):02}:{int(time_left % 60):02}"
-        print_lives_and_points(lives_count, points_count, time_left_formatted)
+        header = render_lives_and_points(lives_count, points_count, time_left_formatted)
+
+        try:
+            guessed = main_game_loop(prefetcher, player_name, header)
+        except EOFError:
+            raise
+        except Exception as e:
+            logger.exception("Round generation failed")
+            print_boxed_text([f"    {describe_round_error(e)}", "    The game ends here."])
+            menu.display_game_over_screen(points_count)
+            break
 
-        if main_game_loop():
+        if guessed:
             points_count += 1
             print_boxed_text([f"    You have {points_count} point!" if points_count == 1
                               else f"You have {points_count} points!"])
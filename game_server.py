@@ -0,0 +1,397 @@
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import random
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+import game_logic
+import leaderboard_utils
+import menu
+import round_prefetch
+import screen
+
+GREEN = game_logic.GREEN
+RED = game_logic.RED
+RESET = game_logic.RESET
+
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = int(os.getenv("GAME_SERVER_PORT", "7777"))
+MAX_SESSIONS = 1000  # further connections are turned away until a session ends
+ROUND_BUFFER = 16  # rounds prepared ahead, shared by all sessions
+ROUND_WORKERS = 4  # background round builders; also the limit of rounds built on demand at once
+ROUND_WAIT = 5.0  # seconds a session waits for a prepared round before building one itself
+MAX_LINE_LENGTH = 256  # bytes per client line; longer lines end the session
+SEND_TIMEOUT = 10.0  # seconds a client may take to read its output before it is disconnected
+NAME_TIMEOUT = 60.0  # seconds to enter a name
+MAX_NAME_LENGTH = 20
+SESSIONS_PER_CORE_TARGET = 1000  # players answering every THINK_TIME seconds, per server core
+THINK_TIME = 10.0  # seconds a player typically takes per round
+
+# CSI sequences (colours, cursor moves), OSC sequences (window titles, links) and two-character escapes
+_ESCAPE_SEQUENCE_RE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)?|.)", re.DOTALL)
+
+logger = logging.getLogger(__name__)
+
+WELCOME = [
+    "    Welcome to Beyond Belief: Fact or Fiction – The game where knowledge meets instinct",
+    "    Three statements. One is a lie. Will your instincts guide you?",
+    "    Type the number of the lie and press Enter, or 'quit' to end the game.",
+]
+
+
+def format_time_left(seconds):
+    """Formats remaining seconds as MM:SS."""
+    seconds = max(0, seconds)
+    return f"{int(seconds // 60):02}:{int(seconds % 60):02}"
+
+
+def sanitize_name(name):
+    """
+    Makes a player name safe to show on other players' terminals and the leaderboard.
+
+    Terminal escape sequences are removed, as are control, format and other
+    invisible characters (Unicode category C).
+
+    Args:
+        name (str): Name as typed by the player.
+
+    Returns:
+        str: The cleaned name, at most MAX_NAME_LENGTH characters, or "Anonymous" if nothing is left.
+    """
+    name = _ESCAPE_SEQUENCE_RE.sub("", name)
+    name = "".join(char for char in name if not unicodedata.category(char).startswith("C"))
+    return name.strip()[:MAX_NAME_LENGTH] or "Anonymous"
+
+
+class GameServer:
+    """
+    Hosts many game sessions in one process over line-based TCP.
+
+    Every session plays by the rules of game_logic.play_game (LIVES,
+    TOTAL_TIME, one point per lie found) with its own timer, while all of
+    them draw rounds from one shared RoundPrefetcher. Wikipedia, OpenAI,
+    the tokenizer and the page, category and lie caches are therefore
+    loaded once and shared, and the request schedulers see a single
+    process.
+
+    Sessions wait for prepared rounds on the event loop, woken by the
+    prefetcher whenever a build finishes; only rounds built on demand take
+    a thread.
+
+    Backpressure: round builds run on a bounded thread pool, output waits
+    for each client to accept it, and connections beyond max_sessions are
+    turned away.
+
+    Args:
+        build_round (callable, optional): Returns (page_title, sentences, lie_index).
+            Defaults to game_logic.generate_round.
+        host (str): Interface to listen on.
+        port (int): TCP port; 0 picks a free one.
+        max_sessions (int): Concurrent sessions allowed.
+        round_buffer (int): Rounds prepared ahead.
+        round_workers (int): Background round builders.
+        total_time (float): Seconds per game.
+        lives (int): Wrong answers allowed per game.
+    """
+
+    def __init__(self, build_round=None, host=SERVER_HOST, port=SERVER_PORT, max_sessions=MAX_SESSIONS,
+                 round_buffer=ROUND_BUFFER, round_workers=ROUND_WORKERS, total_time=game_logic.TOTAL_TIME,
+                 lives=game_logic.LIVES):
+        self.build_round = build_round or game_logic.generate_round
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.total_time = total_time
+        self.lives = lives
+        # Pool rounds are drawn per player to avoid repeats, so they cannot be shared ahead of time
+        self.use_pool = build_round is None and game_logic.ROUND_SOURCE == "pool"
+        self.active_sessions = 0
+        self.stats = {"sessions": 0, "rejected": 0, "dropped": 0, "rounds": 0, "round_errors": 0, "games": 0}
+        self._executor = ThreadPoolExecutor(max_workers=round_workers, thread_name_prefix="round-build")
+        self._prefetcher = round_prefetch.RoundPrefetcher(self.build_round, depth=round_buffer, workers=round_workers)
+        self._round_ready = None  # future resolved when a background build finishes, then replaced
+        self._server = None
+
+    async def start(self):
+        """
+        Starts listening and preparing rounds.
+
+        Returns:
+            GameServer: The server itself, with port set to the bound port.
+        """
+        if not self.use_pool:
+            loop = asyncio.get_running_loop()
+            self._round_ready = loop.create_future()
+
+            def on_build_finished():
+                with contextlib.suppress(RuntimeError):  # the loop is already closed
+                    loop.call_soon_threadsafe(self._signal_round_ready)
+
+            self._prefetcher.add_ready_callback(on_build_finished)
+            self._prefetcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_LINE_LENGTH)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        """Serves sessions until cancelled."""
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stops accepting connections and shuts down the round builders."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        self._prefetcher.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def next_round(self, player_name):
+        """
+        Returns a round for a player without blocking the event loop.
+
+        Args:
+            player_name (str): Player, used for repeat tracking in pool mode.
+
+        Returns:
+            tuple: (page_title, sentences, lie_index)
+        """
+        loop = asyncio.get_running_loop()
+        if self.use_pool:
+            game_round = await loop.run_in_executor(self._executor, game_logic.get_sentences_for_game, player_name)
+        else:
+            game_round = await self._wait_for_round(ROUND_WAIT)
+            if game_round is None:
+                game_round = await loop.run_in_executor(self._executor, self._prefetcher.build_now)
+        self.stats["rounds"] += 1
+        return game_round
+
+    async def _wait_for_round(self, wait):
+        """
+        Takes a prepared round, waiting on the event loop while the prefetcher builds one.
+
+        Args:
+            wait (float): Seconds to wait at most.
+
+        Returns:
+            tuple | None: (page_title, sentences, lie_index), or None if no round
+                became ready in time or none is being built.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while True:
+            signal = self._round_ready  # taken before looking, so a build finishing meanwhile still wakes us
+            game_round = self._prefetcher.wait_for_round(0)
+            if game_round is not None:
+                return game_round
+            remaining = deadline - loop.time()
+            if remaining <= 0 or not self._prefetcher.is_building():
+                return None
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(asyncio.shield(signal), remaining)
+
+    def _signal_round_ready(self):
+        """Wakes the sessions waiting for a round; runs on the event loop."""
+        signal, self._round_ready = self._round_ready, asyncio.get_running_loop().create_future()
+        signal.set_result(None)
+
+    def metrics(self):
+        """
+        Returns counters of the server and its shared round pipeline.
+
+        Returns:
+            dict: Active sessions, totals and prefetch hits and misses.
+        """
+        return dict(self.stats, active=self.active_sessions, prefetched=self._prefetcher.prefetched_count,
+                    built_on_demand=self._prefetcher.fallback_count, ready=self._prefetcher.ready_count())
+
+    async def _handle(self, reader, writer):
+        """Runs one connection from greeting to game over."""
+        try:
+            if self.active_sessions >= self.max_sessions:
+                self.stats["rejected"] += 1
+                writer.write(f"{RED}The server is full, please try again later.{RESET}\n".encode())
+                return
+            self.active_sessions += 1
+            self.stats["sessions"] += 1
+            try:
+                await GameSession(self, reader, writer).run()
+            except (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                self.stats["dropped"] += 1  # disconnected, too slow to read output, or sent an overlong line
+            finally:
+                self.active_sessions -= 1
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+class GameSession:
+    """
+    One player's game on a GameServer connection.
+
+    The player's clock keeps running while a round is prepared and while
+    they think; a round or an answer that is still pending when the time is
+    up ends the game right away. So does a round that cannot be built, e.g.
+    while Wikipedia or OpenAI is unavailable - the player is told why and
+    the score is still recorded.
+
+    Args:
+        server (GameServer): Server providing rounds and rules.
+        reader (asyncio.StreamReader): Client input.
+        writer (asyncio.StreamWriter): Client output.
+    """
+
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, text):
+        """Sends text, waiting while the client's buffer is full."""
+        self.writer.write(text.encode())
+        await asyncio.wait_for(self.writer.drain(), SEND_TIMEOUT)
+
+    async def read_line(self, timeout):
+        """
+        Reads one line from the client.
+
+        Args:
+            timeout (float): Seconds to wait.
+
+        Returns:
+            str: The line without surrounding whitespace.
+
+        Raises:
+            asyncio.TimeoutError: If no line arrives in time.
+            ConnectionResetError: If the client disconnected.
+        """
+        line = await asyncio.wait_for(self.reader.readline(), timeout)
+        if not line:
+            raise ConnectionResetError("Client disconnected.")
+        return line.decode(errors="replace").strip()
+
+    async def run(self):
+        """Greets the player, plays one game and records the score."""
+        await self.send(screen.CLEAR + game_logic.render_boxed_text(WELCOME)
+                        + f"  {GREEN}State your name as you step into the unknown: {RESET}")
+        player_name = sanitize_name(await self.read_line(NAME_TIMEOUT))
+
+        points_count = await self.play(player_name)
+        self.server.stats["games"] += 1
+
+        text = menu.render_game_over_screen(points_count)
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, leaderboard_utils.update_leaderboard_if_high_score,
+                                      player_name, points_count):
+            text += f"    {GREEN}NEW HIGHSCORE!{RESET}\n"
+        await self.send(text)
+
+    async def play(self, player_name):
+        """
+        Runs rounds until time is up, lives are lost or the player quits.
+
+        Args:
+            player_name (str): Current player.
+
+        Returns:
+            int: Final score.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.server.total_time
+        lives_count = self.server.lives
+        points_count = 0
+
+        while lives_count > 0 and loop.time() < deadline:
+            fetch = asyncio.ensure_future(self.server.next_round(player_name))
+            done, _ = await asyncio.wait({fetch}, timeout=deadline - loop.time())
+            if not done:
+                fetch.cancel()
+                await self.send(f"\n{RED}     Time is up!{RESET}\n")
+                break
+            try:
+                page_title, sentences, lie_index = fetch.result()
+            except Exception as e:
+                self.server.stats["round_errors"] += 1
+                logger.exception("Round generation failed for %s", player_name)
+                await self.send(f"{RED}     {game_logic.describe_round_error(e)} The game ends here.{RESET}\n")
+                break
+            header = game_logic.render_lives_and_points(lives_count, points_count,
+                                                        format_time_left(deadline - loop.time()))
+            await self.send(screen.Frame(clear=False).add(screen.CLEAR).add(header)
+                            .add(game_logic.render_sentences(page_title, sentences))
+                            .add(game_logic.render_boxed_text(["    What's the lie? (1-3)", ""]))
+                            .add(f"{GREEN}     Type here and press Enter: {RESET}").render())
+
+            choice = await self.read_choice(deadline)
+            if choice is None:
+                break
+            if choice == lie_index + 1:
+                points_count += 1
+                await self.send(f"     ✅ {GREEN}{random.choice(game_logic.truth_quotes)} ✅{RESET}\n"
+                                + game_logic.render_boxed_text([f"    You have {points_count} point!"
+                                                                if points_count == 1
+                                                                else f"You have {points_count} points!"]))
+            else:
+                lives_count -= 1
+                text = (f"     ❌ {RED}{random.choice(game_logic.lie_quotes)} ❌\n"
+                        f"     The correct answer was: {lie_index + 1}{RESET}\n")
+                if lives_count > 0:
+                    text += game_logic.render_boxed_text(
+                        [f"    You have {lives_count} {'life' if lives_count == 1 else 'lives'} left!"])
+                await self.send(text)
+        return points_count
+
+    async def read_choice(self, deadline):
+        """
+        Reads answers until one is valid.
+
+        Args:
+            deadline (float): Event loop time at which the game ends.
+
+        Returns:
+            int | None: Choice 1-3, or None if time ran out or the player quit.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                answer = await self.read_line(deadline - loop.time())
+            except asyncio.TimeoutError:
+                await self.send(f"\n{RED}     Time is up!{RESET}\n")
+                return None
+            if answer.lower() in ("q", "quit", "exit"):
+                return None
+            if answer in ("1", "2", "3"):
+                return int(answer)
+            await self.send(f"{RED}     Invalid input. Please enter a number (1, 2, or 3).{RESET}\n"
+                            f"{GREEN}     Type here and press Enter: {RESET}")
+
+
+async def _serve(args):
+    """Runs the server until interrupted."""
+    server = await GameServer(host=args.host, port=args.port, max_sessions=args.max_sessions).start()
+    print(f"Beyond Belief server listening on {server.host}:{server.port} (e.g. nc {server.host} {server.port})")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+        print(f"Server stopped: {server.metrics()}")
+
+
+def main():
+    """Command-line entry point for hosting games over TCP."""
+    parser = argparse.ArgumentParser(description="Host Beyond Belief games for many players over line-based TCP.")
+    parser.add_argument("--host", default=SERVER_HOST, help="interface to listen on")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="TCP port")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS, help="concurrent sessions allowed")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()
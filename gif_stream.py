@@ -0,0 +1,192 @@
+import json
+import os
+import queue
+import shutil
+import threading
+from collections import namedtuple
+
+from PIL import Image, ImageSequence
+
+DEFAULT_BUFFER_SIZE = 4  # decoded frames held ahead of the player
+DEFAULT_FRAME_DURATION = 100  # milliseconds, for frames without a duration
+GIF_CACHE_DIR = os.getenv("END_GIF_CACHE_DIR")  # pre-scaled frame cache; None disables it
+
+# One decoded frame: RGB bytes of `size`, shown for `duration` milliseconds
+Frame = namedtuple("Frame", ["index", "pixels", "size", "duration"])
+
+
+class GifFrameStream:
+    """
+    Decodes and scales GIF frames lazily in a background thread.
+
+    Only `buffer_size` frames are held in memory at any time, whatever the
+    length of the GIF or the display resolution, and the first frame is
+    available as soon as it is decoded. The GIF loops forever.
+
+    With a cache directory, the scaled frames of the first pass are written
+    to disk, keyed by GIF and resolution; later passes and later runs read
+    them back instead of decoding and scaling again.
+
+    Args:
+        path (str): GIF file.
+        target_size (tuple): Output (width, height).
+        buffer_size (int): Frames decoded ahead of the consumer.
+        cache_dir (str, optional): Directory for pre-scaled frames.
+        resample (int): PIL resampling filter used for scaling.
+    """
+
+    def __init__(self, path, target_size, buffer_size=DEFAULT_BUFFER_SIZE, cache_dir=GIF_CACHE_DIR,
+                 resample=Image.Resampling.BILINEAR):
+        self.path = path
+        self.target_size = tuple(target_size)
+        self.cache_dir = cache_dir
+        self.resample = resample
+        self.error = None
+        self._frames = queue.Queue(maxsize=buffer_size)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Starts the decoder thread.
+
+        Returns:
+            GifFrameStream: The stream itself, for chaining.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="gif-decoder", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Stops the decoder thread and drops buffered frames."""
+        self._stop_event.set()
+        while True:
+            try:
+                self._frames.get_nowait()
+            except queue.Empty:
+                break
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def next_frame(self, timeout=None):
+        """
+        Returns the next frame, waiting for the decoder if needed.
+
+        Args:
+            timeout (float, optional): Seconds to wait; None waits until a frame is ready.
+
+        Returns:
+            Frame | None: Next frame, or None on timeout, after stop() or if decoding failed (see error).
+        """
+        try:
+            return self._frames.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _put(self, frame):
+        """Hands a frame to the consumer, blocking while the buffer is full. Returns False once stopped."""
+        while not self._stop_event.is_set():
+            try:
+                self._frames.put(frame, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        """Decoder thread: replays the cache if there is one, otherwise decodes (and fills the cache)."""
+        try:
+            cache_path = self._cache_path()
+            while not self._stop_event.is_set():
+                if cache_path and os.path.isdir(cache_path):
+                    frames = self._read_cache(cache_path)
+                else:
+                    frames = self._decode(cache_path)
+                for frame in frames:
+                    if not self._put(frame):
+                        frames.close()  # lets an unfinished cache pass clean up
+                        return
+        except Exception as e:
+            self.error = e
+            self._put(None)
+
+    def _decode(self, cache_path=None):
+        """Yields decoded, scaled frames; writes them to cache_path when given."""
+        writer = _CacheWriter(cache_path, self.target_size) if cache_path else None
+        completed = False
+        try:
+            with Image.open(self.path) as gif:
+                for index, image in enumerate(ImageSequence.Iterator(gif)):
+                    duration = image.info.get("duration") or DEFAULT_FRAME_DURATION
+                    rgb = image.convert("RGB")
+                    if rgb.size != self.target_size:
+                        rgb = rgb.resize(self.target_size, self.resample)
+                    frame = Frame(index, rgb.tobytes(), self.target_size, duration)
+                    if writer:
+                        writer.add(frame)
+                    yield frame
+            completed = True
+        finally:
+            # Only a full pass is cached; a stopped or failed one leaves nothing behind
+            if writer and completed:
+                writer.commit()
+            elif writer:
+                writer.discard()
+
+    def _cache_path(self):
+        """Returns the cache directory of this GIF at this resolution, or None without a cache."""
+        if not self.cache_dir:
+            return None
+        stat = os.stat(self.path)
+        name = os.path.splitext(os.path.basename(self.path))[0]
+        width, height = self.target_size
+        return os.path.join(self.cache_dir, f"{name}-{stat.st_size}-{int(stat.st_mtime)}-{width}x{height}")
+
+    def _read_cache(self, cache_path):
+        """Yields the pre-scaled frames stored in a cache directory."""
+        with open(os.path.join(cache_path, "index.json"), "r") as file:
+            durations = json.load(file)["durations"]
+        width, height = self.target_size
+        frame_bytes = width * height * 3
+        with open(os.path.join(cache_path, "frames.rgb"), "rb") as file:
+            for index, duration in enumerate(durations):
+                pixels = file.read(frame_bytes)
+                if len(pixels) != frame_bytes:
+                    raise ValueError(f"GIF frame cache {cache_path} is truncated.")
+                yield Frame(index, pixels, self.target_size, duration)
+
+
+class _CacheWriter:
+    """Writes scaled frames to a temporary directory that is renamed into place once complete."""
+
+    def __init__(self, cache_path, size):
+        self.cache_path = cache_path
+        self.size = size
+        self.temp_path = f"{cache_path}.tmp{os.getpid()}"
+        os.makedirs(self.temp_path, exist_ok=True)
+        self.durations = []
+        self.file = open(os.path.join(self.temp_path, "frames.rgb"), "wb")
+
+    def add(self, frame):
+        self.file.write(frame.pixels)
+        self.durations.append(frame.duration)
+
+    def commit(self):
+        self.file.close()
+        with open(os.path.join(self.temp_path, "index.json"), "w") as file:
+            json.dump({"size": list(self.size), "durations": self.durations}, file)
+        try:
+            os.rename(self.temp_path, self.cache_path)
+        except OSError:  # another process cached the same GIF first
+            self.discard()
+
+    def discard(self):
+        self.file.close()
+        shutil.rmtree(self.temp_path, ignore_errors=True)
@@ -1,13 +1,122 @@
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from dotenv import load_dotenv
-from openai import OpenAI
+
+import lie_cache
+import request_scheduler
 
 # Load environment variables
 load_dotenv()
 API_KEY = os.getenv("OPENAI_API_KEY")
+API_BASE_URL = os.getenv("OPENAI_BASE_URL")  # e.g. a local stub server; None uses the OpenAI default
+MODEL = "gpt-4o-mini"
+REQUEST_TIMEOUT = 30  # seconds
+MAX_CONCURRENT_REQUESTS = int(os.getenv("OPENAI_MAX_CONCURRENCY", "4"))
+RATE_LIMIT = float(os.getenv("OPENAI_RATE_LIMIT", "5"))  # requests per second shared by all sessions
+RATE_BURST = 10
+
+DEVELOPER_CONTENT = (
+    "Be in the same style and tone as the true facts — "
+    "Sound plausible and not obviously false — "
+    "Be specific enough to be interesting — "
+    "Be based on real aspects of the topic, but with a crucial piece of false information. "
+    "Return ONLY the false statement, with no additional explanation or commentary."
+)
+
+BATCH_DEVELOPER_CONTENT = (
+    "You receive a JSON array of true facts. For each fact write one false statement that is "
+    "in the same style and tone as the true fact, sounds plausible and not obviously false, "
+    "is specific enough to be interesting and is based on real aspects of the topic, "
+    "but with a crucial piece of false information. "
+    "Return ONLY a JSON array of strings with exactly one false statement per fact, in the same order."
+)
+
+_client = None
+_client_lock = threading.Lock()
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+_lie_cache = None
+
+
+def get_client():
+    """
+    Returns the shared OpenAI client, creating it on first use.
+
+    Returns:
+        OpenAI: Shared client.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI  # heavy import, deferred until the first lie is generated
+
+                # Retries are left to the shared scheduler, which honors Retry-After for all threads
+                _client = OpenAI(api_key=API_KEY, base_url=API_BASE_URL, timeout=REQUEST_TIMEOUT, max_retries=0)
+    return _client
+
+
+def set_client(client):
+    """
+    Replaces the shared OpenAI client, e.g. to point it at another endpoint.
+
+    Args:
+        client (OpenAI): New shared client.
+    """
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def get_scheduler():
+    """
+    Returns the request scheduler shared by all OpenAI calls of the process.
+
+    Returns:
+        Scheduler: Rate limiter and circuit breaker for OpenAI.
+    """
+    return request_scheduler.get_scheduler("openai", RATE_LIMIT, RATE_BURST)
+
+
+def _complete(system_content, user_content, timeout=None):
+    """
+    Runs one chat completion through the shared scheduler and a free request slot.
+
+    At most MAX_CONCURRENT_REQUESTS completions run at the same time across
+    all threads of the process, within the OpenAI rate limit.
+
+    Args:
+        system_content (str): System prompt.
+        user_content (str): User message.
+        timeout (float, optional): Overrides the client timeout.
+
+    Returns:
+        str: Stripped completion text.
+
+    Raises:
+        request_scheduler.CircuitOpenError: If OpenAI is considered unavailable.
+    """
+    client = get_client()
+    if timeout is not None:
+        client = client.with_options(timeout=timeout)
+
+    def create():
+        with _request_slots:
+            return client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": system_content},
+                    {"role": "user", "content": user_content},
+                ],
+            )
+
+    completion = get_scheduler().call(create)
+    return completion.choices[0].message.content.strip()
 
 
-def get_gpt_lie(text: str) -> str:
+def get_gpt_lie(text: str, timeout: float = None) -> str:
     """
     Generates a plausible lie based on a given true statement.
 
@@ -20,26 +129,141 @@ def get_gpt_lie(text: str) -> str:
 
     Args:
         text (str): A true factual sentence.
+        timeout (float, optional): Request timeout in seconds.
 
     Returns:
         str: A single, plausible false sentence.
     """
-    client = OpenAI(api_key=API_KEY)
+    return _complete(DEVELOPER_CONTENT, text, timeout)
 
-    developer_content = (
-        "Be in the same style and tone as the true facts — "
-        "Sound plausible and not obviously false — "
-        "Be specific enough to be interesting — "
-        "Be based on real aspects of the topic, but with a crucial piece of false information. "
-        "Return ONLY the false statement, with no additional explanation or commentary."
-    )
 
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": developer_content},
-            {"role": "user", "content": text},
-        ],
-    )
+def get_lie_cache():
+    """
+    Returns the shared lie cache, opening it on first use.
 
-    return completion.choices[0].message.content.strip()
+    Returns:
+        LieCache: Shared cache of generated lies.
+    """
+    global _lie_cache
+    if _lie_cache is None:
+        with _client_lock:
+            if _lie_cache is None:
+                _lie_cache = lie_cache.LieCache()
+    return _lie_cache
+
+
+def set_lie_cache(cache):
+    """
+    Replaces the shared lie cache, e.g. with one in a temporary file for benchmarks.
+
+    Args:
+        cache (LieCache | None): New shared cache; None opens the default one on next use.
+    """
+    global _lie_cache
+    with _client_lock:
+        _lie_cache = cache
+
+
+def get_cached_gpt_lie(text: str, timeout: float = None) -> str:
+    """
+    Returns a lie for a true statement, reusing previously generated lies.
+
+    Only the first few occurrences of a sentence reach the model; after
+    that, its cached lies are served in rotation.
+
+    Args:
+        text (str): A true factual sentence.
+        timeout (float, optional): Request timeout in seconds.
+
+    Returns:
+        str: A single, plausible false sentence.
+    """
+    return get_lie_cache().get_or_generate(text, lambda sentence: get_gpt_lie(sentence, timeout))
+
+
+def get_gpt_lies_batched(texts: list, timeout: float = None) -> list:
+    """
+    Generates lies for several true statements with a single completion.
+
+    If the model does not answer with a JSON array of the right length,
+    the lies are generated one request per statement instead.
+
+    Args:
+        texts (list): True factual sentences.
+        timeout (float, optional): Request timeout in seconds.
+
+    Returns:
+        list: One false sentence per input, in the same order.
+    """
+    if not texts:
+        return []
+
+    answer = _complete(BATCH_DEVELOPER_CONTENT, json.dumps(texts), timeout)
+    answer = answer.strip("`").removeprefix("json").strip()
+    try:
+        lies = json.loads(answer)
+    except ValueError:
+        lies = None
+
+    if isinstance(lies, list) and len(lies) == len(texts) and all(isinstance(lie, str) for lie in lies):
+        return [lie.strip() for lie in lies]
+
+    print("Batched lie generation returned an unexpected answer, falling back to single requests.")
+    return [get_gpt_lie(text, timeout) for text in texts]
+
+
+class LieService:
+    """
+    Generates lies concurrently on a pool of worker threads sharing one client.
+
+    Concurrency is additionally capped process-wide by MAX_CONCURRENT_REQUESTS.
+
+    Args:
+        max_workers (int): Number of worker threads.
+    """
+
+    def __init__(self, max_workers=MAX_CONCURRENT_REQUESTS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lie-service")
+
+    def submit(self, text, timeout=None):
+        """
+        Starts generating a lie in the background.
+
+        Args:
+            text (str): A true factual sentence.
+            timeout (float, optional): Request timeout in seconds.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the false sentence.
+        """
+        return self._executor.submit(get_gpt_lie, text, timeout)
+
+    def submit_batch(self, texts, timeout=None):
+        """
+        Starts generating lies for several sentences with one batched prompt.
+
+        Args:
+            texts (list): True factual sentences.
+            timeout (float, optional): Request timeout in seconds.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the list of false sentences.
+        """
+        return self._executor.submit(get_gpt_lies_batched, texts, timeout)
+
+    def generate(self, texts, timeout=None):
+        """
+        Generates one lie per sentence, running the requests concurrently.
+
+        Args:
+            texts (list): True factual sentences.
+            timeout (float, optional): Request timeout in seconds.
+
+        Returns:
+            list: False sentences in input order.
+        """
+        return [future.result() for future in [self.submit(text, timeout) for text in texts]]
+
+    def shutdown(self):
+        """Stops the worker threads after pending requests finish."""
+        self._executor.shutdown(wait=True)
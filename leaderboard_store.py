@@ -0,0 +1,128 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+LEADERBOARD_DB_PATH = "data/leaderboard.db"
+LEGACY_LEADERBOARD_PATH = "data/leaderboard.json"
+SCHEMA_VERSION = 1  # stored in PRAGMA user_version once the legacy JSON file is imported
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    player TEXT PRIMARY KEY,
+    best_score INTEGER NOT NULL,
+    achieved_at REAL NOT NULL,
+    games INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS scores_rank ON scores (best_score DESC, player);
+"""
+
+
+class LeaderboardStore:
+    """
+    Leaderboard keeping every player's best score in SQLite.
+
+    Scores are submitted with a single atomic upsert, so any number of game
+    processes can write at the same time without losing updates, and a
+    lower score never replaces a player's best. Top-N queries read the
+    rank index instead of sorting every player.
+
+    On first use, the scores of the old data/leaderboard.json are imported.
+
+    Args:
+        path (str): SQLite database file.
+        legacy_path (str | None): JSON leaderboard to import once. None skips the import.
+    """
+
+    def __init__(self, path=LEADERBOARD_DB_PATH, legacy_path=LEGACY_LEADERBOARD_PATH):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+            self._migrate(conn, legacy_path)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _migrate(self, conn, legacy_path):
+        """Imports the legacy JSON leaderboard exactly once, even with several processes starting together."""
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                if legacy_path and os.path.exists(legacy_path):
+                    with open(legacy_path, "r") as file:
+                        legacy_scores = json.load(file)
+                    now = time.time()
+                    conn.executemany(
+                        "INSERT INTO scores (player, best_score, achieved_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(player) DO UPDATE SET best_score = MAX(best_score, excluded.best_score)",
+                        [(player, int(score), now) for player, score in legacy_scores.items()],
+                    )
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def submit(self, player, score):
+        """
+        Records a finished game, keeping the player's best score.
+
+        Args:
+            player (str): Player name.
+            score (int): Final score of the game.
+
+        Returns:
+            int | None: The player's previous best score, or None for a new player.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")  # read the previous best and write in one transaction
+            row = conn.execute("SELECT best_score FROM scores WHERE player = ?", (player,)).fetchone()
+            conn.execute(
+                "INSERT INTO scores (player, best_score, achieved_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(player) DO UPDATE SET "
+                "achieved_at = CASE WHEN excluded.best_score > best_score "
+                "THEN excluded.achieved_at ELSE achieved_at END, "
+                "best_score = MAX(best_score, excluded.best_score), "
+                "games = games + 1",
+                (player, score, time.time()),
+            )
+        return row[0] if row else None
+
+    def top(self, count=5):
+        """
+        Returns the best players, highest score first and ties by name.
+
+        Args:
+            count (int): Number of players.
+
+        Returns:
+            list: (player, best score) tuples.
+        """
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT player, best_score FROM scores ORDER BY best_score DESC, player LIMIT ?", (count,)
+            ).fetchall()
+
+    def best_score(self, player):
+        """
+        Returns a player's best score.
+
+        Args:
+            player (str): Player name.
+
+        Returns:
+            int | None: Best score, or None if the player never scored.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT best_score FROM scores WHERE player = ?", (player,)).fetchone()
+        return row[0] if row else None
+
+    def reset(self):
+        """Deletes all scores."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM scores")
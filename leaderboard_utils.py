@@ -1,42 +1,48 @@
-import os
-import json
+import threading
+
+import leaderboard_store
 
 GREEN = "\033[92m"
 RESET = "\033[0m"
 
-LEADERBOARD_FILE = "data/leaderboard.json"
+LEADERBOARD_FILE = leaderboard_store.LEGACY_LEADERBOARD_PATH  # imported into the SQLite store on first use
+LEADERBOARD_SIZE = 5
 
-def load_leaderboard():
-    """Loads the leaderboard from a JSON file."""
-    if os.path.exists(LEADERBOARD_FILE):
-        with open(LEADERBOARD_FILE, "r") as f:
-            return json.load(f)
-    return {}
+_store = None
+_store_lock = threading.Lock()
 
-def save_leaderboard(leaderboard):
-    """Saves the leaderboard to a JSON file."""
-    with open(LEADERBOARD_FILE, "w") as f:
-        json.dump(leaderboard, f, indent=4, sort_keys=True)
+def get_store():
+    """Returns the shared leaderboard store, opening it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = leaderboard_store.LeaderboardStore()
+    return _store
+
+def set_store(store):
+    """Replaces the shared leaderboard store, e.g. with one in a temporary file."""
+    global _store
+    with _store_lock:
+        _store = store
+
+def load_leaderboard():
+    """Returns the top players as a dict of player name to best score."""
+    return dict(get_store().top(LEADERBOARD_SIZE))
 
 def update_leaderboard_if_high_score(player_name, score):
-    """Updates the leaderboard if the score is in the top 5.
-    Returns True if it's a high score, False otherwise.
+    """Records the score and checks whether it made the top 5.
+    Returns True if it's a new personal best within the top 5, False otherwise.
     """
 
     # Score von 0 wird ignoriert
     if score == 0:
         return False
-    
-    leaderboard = load_leaderboard()
-    all_scores = list(leaderboard.items()) + [(player_name, score)]
-    all_scores.sort(key=lambda x: (-x[1], x[0]))
-    new_top_five = dict(all_scores[:5])
-
-    is_highscore = (player_name, score) in all_scores[:5]
-    if is_highscore:
-        save_leaderboard(new_top_five)
 
-    return is_highscore
+    previous_best = get_store().submit(player_name, score)
+    if previous_best is not None and score <= previous_best:
+        return False
+    return (player_name, score) in get_store().top(LEADERBOARD_SIZE)
 
 def reset_leaderboard():
     """Clears the leaderboard."""
@@ -46,7 +52,7 @@ def reset_leaderboard():
     print(f"{RESET}")
 
     if confirm.lower() == "y":
-        save_leaderboard({})
+        get_store().reset()
         print(f"{GREEN}╔═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╗")
         print(" Leaderboard has been reset.{RESET}")
         print("╚═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╝")
@@ -56,8 +62,7 @@ def reset_leaderboard():
 
 def show_leaderboard():
     """Lists all players and their scores."""
-    leaderboard = load_leaderboard()
-    leaderboard_list = list(leaderboard.items())
+    top_scores = get_store().top(LEADERBOARD_SIZE)
     print(
         f"{GREEN}╔═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╗")
     print()
@@ -71,10 +76,9 @@ def show_leaderboard():
     print("╚═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╝")
     print(
         f"{GREEN}╔═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╗")
-    # SORT THE LEADERBOARD LIST
-    sorted_scores = sorted(leaderboard_list, key=lambda x: x[1], reverse=True)
+    # The store returns the players already ranked
     print(f"    RANK\t\tPLAYER\t\t\t\t\t\tSCORE")
-    for index, (player, score) in enumerate(sorted_scores, start=1):
+    for index, (player, score) in enumerate(top_scores, start=1):
         print(f"    {index:<4}\t\t{player.upper():<20}\t\t{score:>5}")
     print(
         f"╚═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╝{RESET}")
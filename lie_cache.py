@@ -0,0 +1,197 @@
+import atexit
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+LIE_CACHE_PATH = "data/lie_cache.db"
+DEFAULT_VARIANTS = 2  # different lies generated per sentence before reusing them
+USE_FLUSH_THRESHOLD = 32  # usage counts written to disk in batches of this size
+MEMORY_LIMIT = 2048  # sentences mirrored in memory; the least recently used are dropped first
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lies (
+    sentence_hash TEXT NOT NULL,
+    lie TEXT NOT NULL,
+    uses INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (sentence_hash, lie)
+);
+"""
+
+
+def sentence_key(sentence):
+    """
+    Builds the cache key of a sentence: a SHA-256 of its normalized text.
+
+    Normalization collapses whitespace and ignores case, so trivially
+    different copies of the same sentence share their lies.
+
+    Args:
+        sentence (str): Source sentence.
+
+    Returns:
+        str: Hex digest.
+    """
+    normalized = " ".join(sentence.split()).casefold()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class LieCache:
+    """
+    Persistent store of generated lies keyed by the hash of their source sentence.
+
+    Each sentence keeps up to `variants` different lies with usage counts;
+    once enough variants exist, the least used one is served instead of
+    generating a new one. Sentences with cached lies are mirrored in a
+    bounded in-memory LRU and usage counts are written back in batches, so a
+    cache hit does not touch the disk.
+
+    Args:
+        path (str): SQLite database file.
+        variants (int): Lies generated per sentence before cached ones are reused.
+        memory_limit (int): Sentences mirrored in memory.
+    """
+
+    def __init__(self, path=LIE_CACHE_PATH, variants=DEFAULT_VARIANTS, memory_limit=MEMORY_LIMIT):
+        self.path = path
+        self.variants = variants
+        self.memory_limit = memory_limit
+        self._memory = OrderedDict()
+        self._pending_uses = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+        atexit.register(self.flush)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _variants(self, key):
+        """Returns the variant list of a key, loading it from disk if needed. Misses are not mirrored."""
+        with self._lock:
+            variants = self._memory.get(key)
+            if variants is not None:
+                self._memory.move_to_end(key)
+                return variants
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT lie, uses FROM lies WHERE sentence_hash = ?", (key,)).fetchall()
+        if not rows:
+            return []
+        with self._lock:
+            return self._remember(key, [list(row) for row in rows])
+
+    def _remember(self, key, variants):
+        """
+        Mirrors a variant list in memory, evicting the least recently used sentences.
+        Must be called with the lock held.
+
+        Returns:
+            list: The mirrored list, which is another thread's if it mirrored the key first.
+        """
+        variants = self._memory.setdefault(key, variants)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_limit:
+            self._memory.popitem(last=False)
+        return variants
+
+    def get(self, sentence):
+        """
+        Serves the least used cached lie for a sentence and counts the use.
+
+        Args:
+            sentence (str): Source sentence.
+
+        Returns:
+            str | None: Cached lie or None if none is stored.
+        """
+        key = sentence_key(sentence)
+        variants = self._variants(key)
+        with self._lock:
+            if not variants:
+                return None
+            variant = min(variants, key=lambda item: item[1])
+            variant[1] += 1
+        self._record_use(key, variant[0])
+        return variant[0]
+
+    def add(self, sentence, lie, uses=0):
+        """
+        Stores a newly generated lie for a sentence.
+
+        Args:
+            sentence (str): Source sentence.
+            lie (str): Generated lie.
+            uses (int): Initial usage count.
+        """
+        key = sentence_key(sentence)
+        variants = self._variants(key)
+        with self._lock:
+            variants = self._remember(key, variants)
+            if any(variant[0] == lie for variant in variants):
+                return
+            variants.append([lie, uses])
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO lies (sentence_hash, lie, uses, created_at) VALUES (?, ?, ?, ?)",
+                (key, lie, uses, time.time()),
+            )
+
+    def get_or_generate(self, sentence, generate):
+        """
+        Returns a lie for a sentence, generating one only while fewer than `variants` are cached.
+
+        Args:
+            sentence (str): Source sentence.
+            generate (callable): Function turning the sentence into a new lie.
+
+        Returns:
+            str: Lie for the sentence.
+        """
+        if len(self._variants(sentence_key(sentence))) >= self.variants:
+            with self._lock:
+                self.hits += 1
+            return self.get(sentence)
+
+        with self._lock:
+            self.misses += 1
+        lie = generate(sentence)
+        self.add(sentence, lie, uses=1)
+        return lie
+
+    def stats(self):
+        """
+        Returns hit/miss counters and the number of sentences mirrored in memory.
+
+        Returns:
+            dict: Counter values.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "sentences": len(self._memory)}
+
+    def flush(self):
+        """Writes pending usage counts to disk."""
+        with self._lock:
+            pending, self._pending_uses = self._pending_uses, {}
+        if not pending:
+            return
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "UPDATE lies SET uses = uses + ? WHERE sentence_hash = ? AND lie = ?",
+                [(uses, key, lie) for (key, lie), uses in pending.items()],
+            )
+
+    def _record_use(self, key, lie):
+        """Counts one use of a cached lie, flushing to disk once enough uses are pending."""
+        with self._lock:
+            self._pending_uses[(key, lie)] = self._pending_uses.get((key, lie), 0) + 1
+            should_flush = sum(self._pending_uses.values()) >= USE_FLUSH_THRESHOLD
+        if should_flush:
+            self.flush()
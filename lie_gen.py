@@ -1,3 +1,7 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
 # Dictionary mapping attributes to their opposites
 attribute_opposites = {
     "largest": "smallest", "smallest": "largest",
@@ -49,6 +53,186 @@ attribute_opposites = {
 }
 
 
+NEGATABLE_VERBS = ("is", "are", "was", "were", "will")
+
+# Transform names, in the priority order used by generate_lie
+NUMBERS = "numbers"
+ATTRIBUTES = "attributes"
+NEGATION = "negation"
+TRANSFORMS = (NUMBERS, ATTRIBUTES, NEGATION)
+BATCH_CHUNK_SIZE = 2000  # sentences per worker task in generate_lies
+
+# Punctuation that may surround a word without being part of it
+_PUNCTUATION = "\"'()[]{},.;:!?"
+_PUNCTUATION_SET = frozenset(_PUNCTUATION)
+_DIGITS = frozenset("0123456789")
+# Whole numbers with optional thousands separators and decimals: "42", "1,200", "3.5"
+_NUMBER_RE = re.compile(r"(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?")
+
+# Lookup table built once from attribute_opposites: every single-word key,
+# negatable verb and first word of a multi-word key maps to what it starts.
+# Multi-word keys are indexed by their first word, longest first.
+_PHRASE = "phrase"
+_WORD_TRANSFORMS = {verb: NEGATION for verb in NEGATABLE_VERBS}
+_PHRASES = {}
+for _key in sorted(attribute_opposites, key=lambda key: -len(key.split())):
+    _first, *_rest = _key.split()
+    if _rest:
+        _PHRASES.setdefault(_first, []).append(tuple(_rest))
+    else:
+        _WORD_TRANSFORMS[_first] = ATTRIBUTES
+_LOOKUP = {**_WORD_TRANSFORMS, **{first: _PHRASE for first in _PHRASES}}
+
+
+def skew_number(token: str) -> str:
+    """
+    Shifts a numeric token by 25%, keeping its thousands separators and decimals.
+
+    Even numbers are increased and odd numbers decreased, as before.
+
+    Args:
+        token (str): Number such as "42", "1,200" or "3.5".
+
+    Returns:
+        str: The shifted number in the same format.
+    """
+    grouped = "," in token
+    integer_part, _, fraction = token.replace(",", "").partition(".")
+    if fraction:
+        number = float(f"{integer_part}.{fraction}")
+        delta = number * 0.25
+        new_number = number + delta if int(number) % 2 == 0 else number - delta
+        return f"{new_number:{',' if grouped else ''}.{len(fraction)}f}"
+
+    number = int(integer_part)
+    delta = int(number * 0.25)
+    new_number = number + delta if number % 2 == 0 else number - delta
+    return f"{new_number:,}" if grouped else str(new_number)
+
+
+def _split_punctuation(token):
+    """Splits a token into (leading punctuation, word, trailing punctuation)."""
+    word = token.strip(_PUNCTUATION)
+    if not word:
+        return token, "", ""
+    start = token.index(word)
+    return token[:start], word, token[start + len(word):]
+
+
+def _match_phrase(lowered, index, first_word):
+    """
+    Checks whether a multi-word attribute key starts at token index.
+
+    Returns:
+        int: Number of tokens the phrase spans, or 0 if none matches.
+    """
+    for rest in _PHRASES.get(first_word, ()):
+        end = index + 1 + len(rest)
+        if end > len(lowered) or lowered[index][-1:] in _PUNCTUATION_SET:
+            continue
+        words = lowered[index + 1:end]
+        if all(word == expected or (i == len(rest) - 1 and word.rstrip(_PUNCTUATION) == expected)
+               for i, (word, expected) in enumerate(zip(words, rest))):
+            return len(rest) + 1
+    return 0
+
+
+def _replacement(tokens, start, end, transform, key):
+    """Builds the rewritten text of tokens[start:end] for one transform."""
+    lead, word, _ = _split_punctuation(tokens[start])
+    _, _, trail = _split_punctuation(tokens[end - 1])
+    if transform == NUMBERS:
+        return f"{lead}{skew_number(word)}{trail}"
+    if transform == ATTRIBUTES:
+        replacement = attribute_opposites[key]
+        if word[0].isupper():
+            replacement = replacement.capitalize()
+        return f"{lead}{replacement}{trail}"
+    return f"{lead}{word} not{trail}"
+
+
+def find_rewrites(text: str) -> tuple:
+    """
+    Scans a sentence once and lists every possible rewrite.
+
+    The sentence is split into space-separated tokens; each token is looked up
+    once against the number pattern, the attribute table (including
+    multi-word phrases such as "most famous") and the negatable verbs.
+
+    Args:
+        text (str): A sentence.
+
+    Returns:
+        tuple: (tokens, rewrites) where rewrites is a list of
+            (transform, start, end, replacement) tuples over token indices,
+            in text order. Rewrites that would not change the text are left out.
+    """
+    tokens = text.split(" ")
+    lowered = text.lower().split(" ")
+    rewrites = []
+    skip_until = 0
+    for index, token in enumerate(lowered):
+        if index < skip_until:
+            continue
+
+        transform = _LOOKUP.get(token)
+        if transform is None:
+            if token.isalpha():
+                continue
+            if token[-1:] in _PUNCTUATION_SET or token[:1] in _PUNCTUATION_SET:
+                token = token.strip(_PUNCTUATION)
+                transform = _LOOKUP.get(token)
+            if transform is None:
+                if token[:1] in _DIGITS and _NUMBER_RE.fullmatch(token):
+                    transform = NUMBERS
+                else:
+                    continue
+
+        if transform is _PHRASE:
+            length = _match_phrase(lowered, index, token)
+            if length:
+                end = index + length
+                key = " ".join([token] + [word.rstrip(_PUNCTUATION) for word in lowered[index + 1:end]])
+                rewrites.append((ATTRIBUTES, index, end, _replacement(tokens, index, end, ATTRIBUTES, key)))
+                skip_until = end
+                continue
+            transform = _WORD_TRANSFORMS.get(token)
+            if transform is None:
+                continue
+
+        replacement = _replacement(tokens, index, index + 1, transform, token)
+        if replacement != tokens[index]:
+            rewrites.append((transform, index, index + 1, replacement))
+    return tokens, rewrites
+
+
+def apply_rewrites(tokens: list, rewrites) -> str:
+    """
+    Applies non-overlapping rewrites from find_rewrites to the sentence tokens.
+
+    Args:
+        tokens (list): Tokens returned by find_rewrites.
+        rewrites (iterable): (transform, start, end, replacement) tuples in text order.
+
+    Returns:
+        str: The rewritten sentence.
+    """
+    parts = []
+    position = 0
+    for _, start, end, replacement in rewrites:
+        parts.extend(tokens[position:start])
+        parts.append(replacement)
+        position = end
+    parts.extend(tokens[position:])
+    return " ".join(parts)
+
+
+def _apply_transform(text: str, transform: str) -> str:
+    """Applies every rewrite of one transform to the text."""
+    tokens, rewrites = find_rewrites(text)
+    return apply_rewrites(tokens, [rewrite for rewrite in rewrites if rewrite[0] == transform])
+
+
 def slightly_wrong_numbers(text: str) -> str:
     """
     Slightly alters numeric values in the input text by ±25%.
@@ -59,19 +243,7 @@ def slightly_wrong_numbers(text: str) -> str:
     Returns:
         str: The modified text with changed numeric values.
     """
-    words = text.split()
-    new_words = []
-
-    for word in words:
-        if word.isdigit():
-            number = int(word)
-            delta = int(number * 0.25)
-            new_number = number + delta if number % 2 == 0 else number - delta
-            new_words.append(str(new_number))
-        else:
-            new_words.append(word)
-
-    return " ".join(new_words)
+    return _apply_transform(text, NUMBERS)
 
 
 def opposite_attribute(text: str) -> str:
@@ -84,20 +256,7 @@ def opposite_attribute(text: str) -> str:
     Returns:
         str: The sentence with swapped attributes (if found).
     """
-    words = text.split()
-    new_words = []
-
-    for word in words:
-        clean_word = word.lower().strip(",.!?")
-        if clean_word in attribute_opposites:
-            replacement = attribute_opposites[clean_word]
-            if word[0].isupper():
-                replacement = replacement.capitalize()
-            new_words.append(replacement)
-        else:
-            new_words.append(word)
-
-    return " ".join(new_words)
+    return _apply_transform(text, ATTRIBUTES)
 
 
 def flip_meaning(text: str) -> str:
@@ -110,25 +269,35 @@ def flip_meaning(text: str) -> str:
     Returns:
         str: The sentence with logical negation applied.
     """
-    words = text.split()
-    new_words = []
-
-    for word in words:
-        lower = word.lower()
-        if lower == "is":
-            new_words.append("is not")
-        elif lower == "are":
-            new_words.append("are not")
-        elif lower == "was":
-            new_words.append("was not")
-        elif lower == "were":
-            new_words.append("were not")
-        elif lower == "will":
-            new_words.append("will not")
-        else:
-            new_words.append(word)
+    return _apply_transform(text, NEGATION)
+
+
+def generate_lie_candidates(true_fact: str, max_candidates: int = 5) -> list:
+    """
+    Produces several different lies for one sentence from a single scan.
+
+    For each transform, in priority order, the first candidate applies all of
+    its rewrites at once; further candidates change one spot at a time.
 
-    return " ".join(new_words)
+    Args:
+        true_fact (str): A factual sentence.
+        max_candidates (int): Maximum number of candidates returned.
+
+    Returns:
+        list: (transform, lie) tuples, best candidates first.
+    """
+    tokens, rewrites = find_rewrites(true_fact)
+    candidates = []
+    for transform in TRANSFORMS:
+        selected = [rewrite for rewrite in rewrites if rewrite[0] == transform]
+        if not selected:
+            continue
+        candidates.append((transform, apply_rewrites(tokens, selected)))
+        if len(selected) > 1:
+            candidates.extend((transform, apply_rewrites(tokens, [rewrite])) for rewrite in selected)
+        if len(candidates) >= max_candidates:
+            break
+    return candidates[:max_candidates]
 
 
 def generate_lie(true_fact: str) -> str:
@@ -147,16 +316,60 @@ def generate_lie(true_fact: str) -> str:
         str: A sentence that contains a fabricated element.
     """
     try:
-        modified = slightly_wrong_numbers(true_fact)
-        if modified != true_fact:
-            return modified
-
-        modified = opposite_attribute(true_fact)
-        if modified != true_fact:
-            return modified
-
-        return flip_meaning(true_fact)
+        candidates = generate_lie_candidates(true_fact, max_candidates=1)
+        return candidates[0][1] if candidates else true_fact
 
     except Exception as e:
         print(f"An error has occurred: {e}")
         return true_fact  # Fallback to original input if failure occurs
+
+
+def _generate_chunk(sentences):
+    """
+    Generates lies for a list of sentences in the current process.
+
+    Args:
+        sentences (list): Factual sentences.
+
+    Returns:
+        list: (lie, transform) tuples; transform is None if no rewrite applied.
+    """
+    results = []
+    for sentence in sentences:
+        candidates = generate_lie_candidates(sentence, max_candidates=1)
+        if candidates:
+            transform, lie = candidates[0]
+            results.append((lie, transform))
+        else:
+            results.append((sentence, None))
+    return results
+
+
+def generate_lies(sentences, processes: int = 1, chunk_size: int = BATCH_CHUNK_SIZE) -> list:
+    """
+    Generates lies for a large batch of sentences, e.g. whole article corpora.
+
+    With processes > 1 the batch is cut into chunks that are handled by a
+    process pool, using one worker per core when processes is None. Small
+    batches stay in-process, where pool start-up would cost more than it saves.
+
+    Args:
+        sentences (iterable): Factual sentences.
+        processes (int | None): Worker processes; 1 runs in-process, None uses all cores.
+        chunk_size (int): Sentences per worker task.
+
+    Returns:
+        list: (lie, transform) tuples in input order; transform is one of
+            TRANSFORMS, or None if the sentence could not be rewritten.
+    """
+    sentences = list(sentences)
+    workers = processes or os.cpu_count() or 1
+    if workers <= 1 or len(sentences) <= chunk_size:
+        return _generate_chunk(sentences)
+
+    chunks = [sentences[start:start + chunk_size] for start in range(0, len(sentences), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        for chunk_results in executor.map(_generate_chunk, chunks):
+            results.extend(chunk_results)
+    return results
@@ -0,0 +1,211 @@
+import difflib
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import gpt_api
+import lie_gen
+import request_scheduler
+
+LLM_TIMEOUT = 4.0  # seconds before a round falls back to the local lie
+MIN_LENGTH_RATIO = 0.5  # lies much shorter than the original look suspicious
+# Words after an inserted "not" that make the negation stand out: negated
+# definitions ("is not a mansion"), double negations and negated hearsay
+OBVIOUS_NEGATION_WORDS = frozenset({
+    "a", "an", "the", "one", "not", "also", "still", "once", "anything",
+    "said", "reported", "claimed", "believed", "described", "known", "thought", "considered",
+})
+
+# Reasons is_acceptable_lie turns a lie down, as returned by rejection_reason
+UNCHANGED = "unchanged"
+TOO_SHORT = "too short"
+OBVIOUS_NEGATION = "obvious negation"
+PROPER_NOUN = "proper noun changed"
+CONTRADICTED = "contradicted by the page"
+# Rejected lies that may still be shown when nothing better arrives in time,
+# mildest first; unchanged, mangled or contradicted lies are never shown
+FALLBACK_REASONS = (OBVIOUS_NEGATION, TOO_SHORT)
+
+_executor = ThreadPoolExecutor(max_workers=gpt_api.MAX_CONCURRENT_REQUESTS, thread_name_prefix="lie-llm")
+_metrics_lock = threading.Lock()
+_metrics = {
+    tier: {"calls": 0, "accepted": 0, "errors": 0, "total_time": 0.0, "max_time": 0.0}
+    for tier in ("local", "llm", "fallback")
+}
+
+
+def _changed_spans(original_tokens, lie_tokens):
+    """Returns (start, old tokens, new tokens) for every span the lie changed, in original token indices."""
+    matcher = difflib.SequenceMatcher(a=original_tokens, b=lie_tokens, autojunk=False)
+    return [(i1, original_tokens[i1:i2], lie_tokens[j1:j2])
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+
+def _is_obvious_negation(spans, original_tokens):
+    """Checks whether a lie only inserts "not" and at least one of them reads as an obvious lie."""
+    if not all(not old and [token.lower() for token in new] == ["not"] for _, old, new in spans):
+        return False
+    words = [token.strip(string.punctuation).lower() for token in original_tokens]
+    return any(start < len(words) and words[start] in OBVIOUS_NEGATION_WORDS or start > 0 and words[start - 1] == "not"
+               for start, _, _ in spans)
+
+
+def rejection_reason(original, lie, context=()):
+    """
+    Explains why a generated lie is not good enough to show to the player.
+
+    Besides empty, unchanged and much shorter lies, it rejects changes a
+    player can spot without knowing the topic: an inserted "not" that negates
+    a definition or hearsay ("is not a mansion", "was not said to"), a proper
+    noun turned into its opposite ("New York" -> "Old York") and a changed
+    word or number that the other sentences of the page still state.
+
+    Args:
+        original (str): The true sentence.
+        lie (str): The generated lie.
+        context (iterable): Other sentences of the same page.
+
+    Returns:
+        str | None: One of the rejection constants, or None if the lie can be used.
+    """
+    if not lie or lie.strip() == original.strip():
+        return UNCHANGED
+    if len(lie) < len(original) * MIN_LENGTH_RATIO:
+        return TOO_SHORT
+
+    original_tokens = original.split()
+    spans = _changed_spans(original_tokens, lie.split())
+    if _is_obvious_negation(spans, original_tokens):
+        return OBVIOUS_NEGATION
+
+    context_words = {word.strip(string.punctuation).lower() for sentence in context for word in sentence.split()}
+    for start, old, new in spans:
+        replacements = [token.strip(string.punctuation).lower() for token in new]
+        for offset, token in enumerate(old):
+            word = token.strip(string.punctuation)
+            if (start + offset > 0 and word[:1].isupper()
+                    and lie_gen.attribute_opposites.get(word.lower()) in replacements):
+                return PROPER_NOUN
+            if (len(word) >= 3 or word.isdigit() and len(word) >= 2) and word.lower() in context_words:
+                return CONTRADICTED
+    return None
+
+
+def is_acceptable_lie(original, lie, context=()):
+    """
+    Checks whether a generated lie is good enough to show to the player.
+
+    Args:
+        original (str): The true sentence.
+        lie (str): The generated lie.
+        context (iterable): Other sentences of the same page.
+
+    Returns:
+        bool: True if the lie can be used, see rejection_reason.
+    """
+    return rejection_reason(original, lie, context) is None
+
+
+def _record(tier, started, accepted=False, error=False):
+    """Adds one call to the metrics of a tier."""
+    elapsed = time.perf_counter() - started
+    with _metrics_lock:
+        stats = _metrics[tier]
+        stats["calls"] += 1
+        stats["accepted"] += accepted
+        stats["errors"] += error
+        stats["total_time"] += elapsed
+        stats["max_time"] = max(stats["max_time"], elapsed)
+
+
+def _mildest_fallback(rated_lies):
+    """Picks the rejected lie with the mildest reason in FALLBACK_REASONS, or None if all would give themselves away."""
+    usable = [(FALLBACK_REASONS.index(reason), order, lie)
+              for order, (lie, reason) in enumerate(rated_lies) if reason in FALLBACK_REASONS]
+    return min(usable)[2] if usable else None
+
+
+def generate_lie(sentence, llm_timeout=LLM_TIMEOUT, context=()):
+    """
+    Generates a lie, trying the local rule-based engine before the LLM.
+
+    1. The first lie_gen candidate that passes is_acceptable_lie is used directly.
+    2. Otherwise the (cached) LLM is asked, waiting at most llm_timeout seconds.
+       Its answer goes through the same check. A late answer still lands in
+       the lie cache for future rounds.
+    3. If the LLM fails, is too slow or is rejected, the rejected lie with the
+       mildest reason in FALLBACK_REASONS is used. Without one, a slow LLM is
+       waited for after all.
+
+    Args:
+        sentence (str): A true factual sentence.
+        llm_timeout (float): Seconds to wait for the LLM before falling back.
+        context (iterable): Other sentences of the same page, see rejection_reason.
+
+    Returns:
+        str | None: A false sentence, or None if no usable lie could be made from this sentence.
+    """
+    started = time.perf_counter()
+    rated_lies = [(lie, rejection_reason(sentence, lie, context))
+                  for _, lie in lie_gen.generate_lie_candidates(sentence)]
+    local_lie = next((lie for lie, reason in rated_lies if reason is None), None)
+    _record("local", started, accepted=local_lie is not None)
+    if local_lie is not None:
+        return local_lie
+
+    started = time.perf_counter()
+    pending = None
+    try:
+        if gpt_api.get_scheduler().is_open():
+            raise request_scheduler.CircuitOpenError("OpenAI is unavailable, circuit breaker open.", service="openai")
+        future = _executor.submit(gpt_api.get_cached_gpt_lie, sentence)
+        lie = future.result(timeout=llm_timeout)
+        reason = rejection_reason(sentence, lie, context)
+        _record("llm", started, accepted=reason is None)
+        if reason is None:
+            return lie
+        print(f"LLM lie rejected ({reason}).")
+        rated_lies.append((lie, reason))
+    except TimeoutError:
+        fallback_lie = _mildest_fallback(rated_lies)
+        print(f"LLM lie took longer than {llm_timeout:.1f}s, "
+              f"{'using the local lie' if fallback_lie else 'waiting for it'}.")
+        _record("llm", started, error=True)
+        pending = future
+    except Exception as e:
+        print(f"LLM lie generation failed: {e}.")
+        _record("llm", started, error=True)
+
+    fallback_lie = _mildest_fallback(rated_lies)
+    if fallback_lie is None and pending is not None:
+        try:
+            lie = pending.result()  # the LLM is the only source of a lie for this sentence
+            reason = rejection_reason(sentence, lie, context)
+            fallback_lie = lie if reason is None else _mildest_fallback([(lie, reason)])
+        except Exception as e:
+            print(f"LLM lie generation failed: {e}.")
+    _record("fallback", started, accepted=fallback_lie is not None, error=fallback_lie is None)
+    return fallback_lie
+
+
+def get_metrics():
+    """
+    Returns per-tier call counts, acceptance rates and latencies.
+
+    Returns:
+        dict: Metrics keyed by tier name ("local", "llm", "fallback").
+    """
+    with _metrics_lock:
+        report = {}
+        for tier, stats in _metrics.items():
+            calls = stats["calls"]
+            report[tier] = {
+                "calls": calls,
+                "accepted": stats["accepted"],
+                "errors": stats["errors"],
+                "hit_rate": stats["accepted"] / calls if calls else 0.0,
+                "avg_ms": stats["total_time"] / calls * 1000 if calls else 0.0,
+                "max_ms": stats["max_time"] * 1000,
+            }
+        return report
@@ -0,0 +1,168 @@
+import json
+import random
+import sqlite3
+import threading
+
+LOCAL_CORPUS_PATH = "data/local_corpus.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL UNIQUE,
+    sentences TEXT NOT NULL,
+    lie_candidates TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS page_categories (
+    category TEXT NOT NULL,
+    page_id INTEGER NOT NULL REFERENCES pages(id),
+    PRIMARY KEY (category, page_id)
+) WITHOUT ROWID;
+"""
+
+
+def normalize_category(name):
+    """
+    Normalizes a category name so dump categories and data/spooky_categories.json agree.
+
+    Args:
+        name (str): Category name, with spaces or underscores.
+
+    Returns:
+        str: Name with underscores, surrounding whitespace removed and first letter uppercase.
+    """
+    name = name.strip().replace(" ", "_")
+    return name[:1].upper() + name[1:]
+
+
+class LocalCorpus:
+    """
+    Indexed local article corpus stored in SQLite.
+
+    Each page holds its already filtered sentences and lie-eligible indices,
+    so serving a round needs no network access and no sentence processing.
+
+    Args:
+        path (str): SQLite database file.
+    """
+
+    def __init__(self, path=LOCAL_CORPUS_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._category_sizes = {}
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self):
+        """Returns this thread's connection; SQLite connections cannot be shared across threads."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def add_pages(self, pages):
+        """
+        Stores a batch of pages in one transaction. Existing titles are replaced.
+
+        Args:
+            pages (list): (title, sentences, lie_candidates, categories) tuples.
+        """
+        conn = self._conn()
+        with conn:
+            for title, sentences, lie_candidates, categories in pages:
+                conn.execute(
+                    "INSERT INTO pages (title, sentences, lie_candidates) VALUES (?, ?, ?) "
+                    "ON CONFLICT(title) DO UPDATE SET sentences = excluded.sentences, "
+                    "lie_candidates = excluded.lie_candidates",
+                    (title, json.dumps(sentences), json.dumps(lie_candidates)),
+                )
+                page_id = conn.execute("SELECT id FROM pages WHERE title = ?", (title,)).fetchone()[0]
+                conn.executemany(
+                    "INSERT OR IGNORE INTO page_categories (category, page_id) VALUES (?, ?)",
+                    [(normalize_category(category), page_id) for category in categories],
+                )
+        self._category_sizes.clear()
+
+    def page_count(self):
+        """Returns the number of stored pages."""
+        return self._conn().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def category_size(self, category):
+        """Returns the number of pages tagged with a category."""
+        category = normalize_category(category)
+        size = self._category_sizes.get(category)
+        if size is None:
+            size = self._category_sizes[category] = self._conn().execute(
+                "SELECT COUNT(*) FROM page_categories WHERE category = ?", (category,)
+            ).fetchone()[0]
+        return size
+
+    def get_page(self, page_id):
+        """
+        Loads one page.
+
+        Args:
+            page_id (int): Page id.
+
+        Returns:
+            tuple | None: (title, sentences, lie_candidates) or None if missing.
+        """
+        row = self._conn().execute(
+            "SELECT title, sentences, lie_candidates FROM pages WHERE id = ?", (page_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        title, sentences, lie_candidates = row
+        return title, json.loads(sentences), json.loads(lie_candidates)
+
+    def iter_pages(self, category=None):
+        """
+        Streams all stored pages in id order, with the categories they are tagged with.
+
+        Args:
+            category (str, optional): Only pages tagged with this category.
+
+        Yields:
+            tuple: (title, sentences, lie_candidates, categories)
+        """
+        columns = ("title, sentences, lie_candidates, "
+                   "(SELECT json_group_array(category) FROM page_categories WHERE page_id = id)")
+        if category:
+            rows = self._conn().execute(
+                f"SELECT {columns} FROM pages WHERE id IN "
+                "(SELECT page_id FROM page_categories WHERE category = ?) ORDER BY id",
+                (normalize_category(category),)
+            )
+        else:
+            rows = self._conn().execute(f"SELECT {columns} FROM pages ORDER BY id")
+        for title, sentences, lie_candidates, categories in rows:
+            yield title, json.loads(sentences), json.loads(lie_candidates), json.loads(categories)
+
+    def random_page(self, categories=None, rng=random):
+        """
+        Picks a random page, optionally restricted to some categories.
+
+        Args:
+            categories (list, optional): Category names; a random non-empty one is used.
+            rng (random.Random, optional): Random generator, e.g. a seeded one for replays.
+
+        Returns:
+            tuple | None: (title, sentences, lie_candidates) or None if nothing matches.
+        """
+        conn = self._conn()
+        if categories:
+            available = [category for category in categories if self.category_size(category)]
+            if not available:
+                return None
+            category = normalize_category(rng.choice(available))
+            row = conn.execute(
+                "SELECT page_id FROM page_categories WHERE category = ? LIMIT 1 OFFSET ?",
+                (category, rng.randrange(self.category_size(category))),
+            ).fetchone()
+        else:
+            max_id = conn.execute("SELECT MAX(id) FROM pages").fetchone()[0]
+            if max_id is None:
+                return None
+            row = conn.execute(
+                "SELECT id FROM pages WHERE id >= ? ORDER BY id LIMIT 1", (rng.randint(1, max_id),)
+            ).fetchone()
+        return self.get_page(row[0]) if row else None
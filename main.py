@@ -1,3 +1,5 @@
+import logging
+
 import menu
 import leaderboard_utils
 
@@ -5,6 +7,9 @@ import leaderboard_utils
 GREEN = "\033[92m"
 RESET = "\033[0m"
 
+# Background errors (e.g. failed round prefetches) are logged here instead of onto the game screen
+LOG_PATH = "data/game.log"
+
 # Menu actions mapped to corresponding functions
 MENU_ACTIONS = {
     1: menu.play_game,
@@ -18,10 +23,10 @@ def main():
     """
     Main loop for displaying the menu and handling user input.
     """
+    logging.basicConfig(filename=LOG_PATH, level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
     while True:
-        menu.clear_screen()
         # menu.play_music()  # Uncomment if background music is needed
-        menu.print_main_menu()
+        menu.print_main_menu(clear=True)
 
         try:
             choice = menu.evaluate_menu_input(input(f"  {GREEN}Enter choice (1–4): {RESET}"))
@@ -1,18 +1,59 @@
 import sys
 import os
-import pygame
 
-import end_gif
-import game_logic
 import leaderboard_utils
+import screen
+
+# pygame (end_gif, play_music) and the game modules (game_logic -> wiki_api, gpt_api) are
+# imported where they are first needed, so the menu appears without loading them
 
 # Terminal color codes
 GREEN = "\033[92m"
 RED = "\033[91m"
 RESET = "\033[0m"
 
+# Pre-rendered once; the main menu is redrawn unchanged every time it is shown
+MAIN_MENU = (
+    f"{GREEN}╔═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╗\n"
+    "║ ▄▄▄▄     ▓█████▓  ██   ██▓  ▒█████▀    ███▄   ██   ▓█████▄    ▄▄▄▄   ▓█████   ██▓      ██▓  ▓██████  ████████ ║\n"
+    "║ ▓█████▄   ▓█      ▒██  ██▒  ▒█▒   ██▒  ██ ▀█  ██   ▒██▀ ██▌  ▓█████▄ ▓█   ▀  ▓██▒      ▓██  ▒▓█      ▓██      ║\n"
+    "║ ▒██▒ ▄█  █▒███     ▒██ ██░  ▒█░   ██▒  ██  ▀█ █▒   ██    █▌  ▒██▒ ▄█ █▒███   ▒██░      ▒██  ▒▒████   ▒██████  ║\n"
+    "║ ▒██░█▀    ▒▓█  ▄  ░ ▐██▓▒   ██   ██░▓  █▒   ▐▌█▒   ▓█▄   █▌  ▒██░█▀  ▒▓█  ▄  ▒██░      ░██  ░▒▓█  ▄  ░██▒  ░  ║\n"
+    "║ ░▓█  ▀█  ▓░▒████▒ ░ ██▒░    ████▓▒░▒█  █░    ██  ░ ▒████▓    ░▓█  ▀█ ▓░▒████▒ ░██████▒ ░██░ ░▒█████  ▒██░     ║\n"
+    "╠═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╣\n"
+    "║ Welcome to Beyond Belief: Fact or Fiction – The game where knowledge meets instinct                          ║\n"
+    "║ Three statements. One is a lie. Will your instincts guide you?                                               ║\n"
+    "║ Behind every fact lies a shadow. Find the one that doesn't belong.                                           ║\n"
+    "╠═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╣\n"
+    "║ Menu:                                                                                                        ║\n"
+    "║   1. Play Game                                                                                               ║\n"
+    "║   2. Show Leaderboard                                                                                        ║\n"
+    "║   3. Reset Leaderboard                                                                                       ║\n"
+    "║   4. Quit Game                                                                                               ║\n"
+    "╚═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╝\n"
+    f"{RESET}\n"
+)
+
+# Printed as one block at the end of every game
+GAME_OVER_ART = f"""{RED}
+╔═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╗
+║  ▄█████    ▄▄▄        ███▄ ▄███▓ ▓█████     ▒█████   ██▒   █▓▓ █████  ███▀██▄                                 ║
+║  ██▒  █▒  ▒████▄     ▓██▒▀█▀ ██▒ ▓█   ▀    ▒██▒  ██▒ ▓██░   █▒ ▓█   ▀ ▓██  ▒██▒                               ║
+║  ███░▄▄▄  ▒██  ▀█▄   ▓██    ▓██░ ▒███      ▒██░  ██▒ ▓██  █▒░ ▒███    ▓██ ░▄█▒                                ║
+║  ███  ██▓ ░██▄▄▄▄██  ▒██    ▒██  ▒▓█  ▄    ▒██   ██░  ▒██ █░ ░▒▓█  ▄  ▒██▀▀█▄                                 ║
+║  ░▒████▀▒  ▓█   ▓██ ▒▒██▒   ░██▒ ░▒████▒   ░ ████▓▒░   ▒██░  ░▒████▒░ ██▓  ▒█▒                                ║
+║   ░▒    ▒  ▒▒   ▓▒█ ░░ ▒░   ░  ░░ ░ ▒░ ░   ░ ▒░▒░▒░    ░▐░   ░░ ▒░ ░░  ▒▓ ░▒▓░                                ║
+║    ░    ░   ▒   ▒▒  ░░  ░      ░ ░  ░  ░     ░ ▒ ▒░    ░ ░░   ░ ░  ░   ░▒ ░ ▒░                                ║
+║  ░ ░    ░   ░   ▒    ░      ░       ░      ░ ░ ░ ▒       ░░     ░      ░░   ░                                 ║
+║      ░       ░   ░       ░       ░  ░       ░ ░        ░     ░  ░   ░                                         ║
+║                                                        ░                                                      ║
+╚═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╝                                                         
+{RESET}""" + "\n"
+
 def play_music():
     """Plays background music if the file exists."""
+    import pygame
+
     pygame.mixer.init()
     music_path = "/Users/alinamarcus/Library/Mobile Documents/com~apple~CloudDocs/beyond_belief_game/music/xxx.wav"
     if os.path.exists(music_path):
@@ -23,12 +64,7 @@ def play_music():
 
 def clear_screen():
     """Clears the terminal screen."""
-    if os.name == 'nt':
-        os.system('cls')
-    elif 'TERM' in os.environ:
-        os.system('clear')
-    else:
-        print("\n" * 100)
+    screen.clear_screen()
 
 def get_player_name():
     """Prompts the player to enter their name."""
@@ -44,8 +80,10 @@ def get_player_name():
 
 def play_game():
     """Starts a new game round."""
+    import game_logic  # also imports this module; loaded on first play
+
     player_name = get_player_name()
-    total_points = game_logic.play_game()
+    total_points = game_logic.play_game(player_name)
 
     if leaderboard_utils.update_leaderboard_if_high_score(player_name, total_points):
         print(f"    {GREEN}NEW HIGHSCORE!{RESET}")
@@ -60,29 +98,14 @@ def quit_game():
     print(f"{GREEN}╔═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╗{RESET}")
     print(f"{GREEN}❌     The game has been quit. The truth remains, waiting until we meet again.                                  ❌{RESET}")
     print(f"{GREEN}╚═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╝{RESET}")
+    import end_gif  # pygame and PIL are only needed for the farewell animation
+
     end_gif.show_gif()
     sys.exit()
 
-def print_main_menu():
-    """Displays the main menu."""
-    print(f"{GREEN}╔═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╗")
-    print("║ ▄▄▄▄     ▓█████▓  ██   ██▓  ▒█████▀    ███▄   ██   ▓█████▄    ▄▄▄▄   ▓█████   ██▓      ██▓  ▓██████  ████████ ║")
-    print("║ ▓█████▄   ▓█      ▒██  ██▒  ▒█▒   ██▒  ██ ▀█  ██   ▒██▀ ██▌  ▓█████▄ ▓█   ▀  ▓██▒      ▓██  ▒▓█      ▓██      ║")
-    print("║ ▒██▒ ▄█  █▒███     ▒██ ██░  ▒█░   ██▒  ██  ▀█ █▒   ██    █▌  ▒██▒ ▄█ █▒███   ▒██░      ▒██  ▒▒████   ▒██████  ║")
-    print("║ ▒██░█▀    ▒▓█  ▄  ░ ▐██▓▒   ██   ██░▓  █▒   ▐▌█▒   ▓█▄   █▌  ▒██░█▀  ▒▓█  ▄  ▒██░      ░██  ░▒▓█  ▄  ░██▒  ░  ║")
-    print("║ ░▓█  ▀█  ▓░▒████▒ ░ ██▒░    ████▓▒░▒█  █░    ██  ░ ▒████▓    ░▓█  ▀█ ▓░▒████▒ ░██████▒ ░██░ ░▒█████  ▒██░     ║")
-    print("╠═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╣")
-    print("║ Welcome to Beyond Belief: Fact or Fiction – The game where knowledge meets instinct                          ║")
-    print("║ Three statements. One is a lie. Will your instincts guide you?                                               ║")
-    print("║ Behind every fact lies a shadow. Find the one that doesn't belong.                                           ║")
-    print("╠═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╣")
-    print("║ Menu:                                                                                                        ║")
-    print("║   1. Play Game                                                                                               ║")
-    print("║   2. Show Leaderboard                                                                                        ║")
-    print("║   3. Reset Leaderboard                                                                                       ║")
-    print("║   4. Quit Game                                                                                               ║")
-    print("╚═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╝")
-    print(f"{RESET}")
+def print_main_menu(clear=False):
+    """Displays the main menu, optionally clearing the screen in the same write."""
+    screen.Frame(clear=clear).add(MAIN_MENU).write()
 
 def evaluate_menu_input(user_input):
     """Validates and converts the user's menu selection."""
@@ -94,23 +117,15 @@ def evaluate_menu_input(user_input):
     else:
         raise ValueError(f"{GREEN}  Invalid menu option. Please enter a number between 1 and 4.{RESET}")
 
+def render_game_over_screen(points_count):
+    """Renders the game over screen with ASCII art and score."""
+    return (
+        GAME_OVER_ART
+        + f"{GREEN}{screen.border('╔', '╗', 111)}\n"
+        + f"  Your final score: {points_count}\n"
+        + f"{screen.border('╚', '╝', 111)}{RESET}\n"
+    )
+
 def display_game_over_screen(points_count):
     """Displays the game over screen with ASCII art and score."""
-    ascii_art = f"""{RED}
-╔═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╗
-║  ▄█████    ▄▄▄        ███▄ ▄███▓ ▓█████     ▒█████   ██▒   █▓▓ █████  ███▀██▄                                 ║
-║  ██▒  █▒  ▒████▄     ▓██▒▀█▀ ██▒ ▓█   ▀    ▒██▒  ██▒ ▓██░   █▒ ▓█   ▀ ▓██  ▒██▒                               ║
-║  ███░▄▄▄  ▒██  ▀█▄   ▓██    ▓██░ ▒███      ▒██░  ██▒ ▓██  █▒░ ▒███    ▓██ ░▄█▒                                ║
-║  ███  ██▓ ░██▄▄▄▄██  ▒██    ▒██  ▒▓█  ▄    ▒██   ██░  ▒██ █░ ░▒▓█  ▄  ▒██▀▀█▄                                 ║
-║  ░▒████▀▒  ▓█   ▓██ ▒▒██▒   ░██▒ ░▒████▒   ░ ████▓▒░   ▒██░  ░▒████▒░ ██▓  ▒█▒                                ║
-║   ░▒    ▒  ▒▒   ▓▒█ ░░ ▒░   ░  ░░ ░ ▒░ ░   ░ ▒░▒░▒░    ░▐░   ░░ ▒░ ░░  ▒▓ ░▒▓░                                ║
-║    ░    ░   ▒   ▒▒  ░░  ░      ░ ░  ░  ░     ░ ▒ ▒░    ░ ░░   ░ ░  ░   ░▒ ░ ▒░                                ║
-║  ░ ░    ░   ░   ▒    ░      ░       ░      ░ ░ ░ ▒       ░░     ░      ░░   ░                                 ║
-║      ░       ░   ░       ░       ░  ░       ░ ░        ░     ░  ░   ░                                         ║
-║                                                        ░                                                      ║
-╚═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╝                                                         
-{RESET}"""
-    print(ascii_art)
-    print(f"{GREEN}╔═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╗")
-    print(f"  Your final score: {points_count}")
-    print(f"╚═══════════════════════════════════════════════════════════════════════════════════════════════════════════════╝{RESET}")
+    screen.write(render_game_over_screen(points_count))
@@ -0,0 +1,245 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+PAGE_CACHE_PATH = "data/page_cache.db"
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_DISK_ENTRIES = 20000
+DEFAULT_MAX_REJECTED = 4096  # rejected titles remembered in memory
+NEGATIVE_TTL = 24 * 60 * 60  # retry rejected pages after a day
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    title TEXT PRIMARY KEY,
+    sentences TEXT NOT NULL,
+    cached_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_cached_at ON pages (cached_at);
+CREATE TABLE IF NOT EXISTS rejected_pages (
+    title TEXT PRIMARY KEY,
+    rejected_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rejected_pages_rejected_at ON rejected_pages (rejected_at);
+"""
+
+
+class PageCache:
+    """
+    Bounded cache of filtered page sentences plus a negative cache of unusable titles.
+
+    Lookups hit an in-memory LRU first and an optional SQLite tier second.
+    Titles whose content failed the sentence filter are remembered for
+    negative_ttl seconds so they are skipped without a request; expired
+    rejections are purged from disk when the cache opens and on every new
+    rejection. Each thread keeps one SQLite connection open.
+
+    Args:
+        max_entries (int): Pages kept in memory.
+        path (str | None): SQLite file for the disk tier. None disables it.
+        max_disk_entries (int): Pages kept on disk; the oldest are evicted first.
+        negative_ttl (float): Seconds a rejected title stays rejected.
+        max_rejected (int): Rejected titles kept in memory; the least recently used are evicted first.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, path=PAGE_CACHE_PATH,
+                 max_disk_entries=DEFAULT_MAX_DISK_ENTRIES, negative_ttl=NEGATIVE_TTL,
+                 max_rejected=DEFAULT_MAX_REJECTED):
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.negative_ttl = negative_ttl
+        self.max_rejected = max_rejected
+        self._pages = OrderedDict()
+        self._rejected = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        if self.path:
+            conn = self._connection()
+            conn.executescript(_SCHEMA)
+            with conn:
+                self._purge_rejected(conn, time.time())
+
+    def _connection(self):
+        """Returns the calling thread's connection to the disk tier, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def close(self):
+        """Closes the calling thread's connection to the disk tier."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+
+    def get(self, title):
+        """
+        Looks up the cached sentences of a page.
+
+        Args:
+            title (str): Page title.
+
+        Returns:
+            list | None: Cached sentences or None on a miss.
+        """
+        with self._lock:
+            sentences = self._pages.get(title)
+            if sentences is not None:
+                self._pages.move_to_end(title)
+                self.hits += 1
+                return sentences
+
+        if self.path:
+            row = self._connection().execute("SELECT sentences FROM pages WHERE title = ?", (title,)).fetchone()
+            if row:
+                sentences = json.loads(row[0])
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(title, sentences)
+                return sentences
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, title, sentences):
+        """
+        Stores the filtered sentences of a usable page.
+
+        Args:
+            title (str): Page title.
+            sentences (list): Filtered sentences.
+        """
+        with self._lock:
+            self._rejected.pop(title, None)
+            self._remember(title, sentences)
+
+        if self.path:
+            now = time.time()
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM rejected_pages WHERE title = ?", (title,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages (title, sentences, cached_at) VALUES (?, ?, ?)",
+                    (title, json.dumps(sentences), now),
+                )
+                conn.execute(
+                    "DELETE FROM pages WHERE title IN "
+                    "(SELECT title FROM pages ORDER BY cached_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                )
+
+    def reject(self, title):
+        """
+        Marks a page as unusable.
+
+        Args:
+            title (str): Page title.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember_rejection(title, now)
+
+        if self.path:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO rejected_pages (title, rejected_at) VALUES (?, ?)",
+                    (title, now),
+                )
+                self._purge_rejected(conn, now)
+
+    def is_rejected(self, title):
+        """
+        Checks whether a page is known to be unusable.
+
+        Args:
+            title (str): Page title.
+
+        Returns:
+            bool: True if the title was rejected within negative_ttl.
+        """
+        with self._lock:
+            rejected_at = self._rejected.get(title)
+            if rejected_at is not None:
+                self._rejected.move_to_end(title)
+
+        if rejected_at is None and self.path:
+            row = self._connection().execute(
+                "SELECT rejected_at FROM rejected_pages WHERE title = ?", (title,)
+            ).fetchone()
+            if row:
+                rejected_at = row[0]
+                with self._lock:
+                    self._remember_rejection(title, rejected_at)
+
+        if rejected_at is None:
+            return False
+        with self._lock:
+            if time.time() - rejected_at >= self.negative_ttl:
+                self._rejected.pop(title, None)
+                return False
+            self.negative_hits += 1
+        return True
+
+    def random_page(self):
+        """
+        Picks a random cached page, from disk when the memory tier is empty.
+
+        Used to keep serving rounds while the live API is unavailable.
+
+        Returns:
+            tuple | None: (title, sentences) or None if nothing is cached.
+        """
+        with self._lock:
+            if self._pages:
+                return random.choice(list(self._pages.items()))
+
+        if not self.path:
+            return None
+        row = self._connection().execute("SELECT title, sentences FROM pages ORDER BY RANDOM() LIMIT 1").fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def stats(self):
+        """
+        Returns hit/miss counters and current sizes.
+
+        Returns:
+            dict: Counter values.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "negative_hits": self.negative_hits,
+                "entries": len(self._pages),
+                "rejected": len(self._rejected),
+            }
+
+    def _remember(self, title, sentences):
+        """Adds a page to the memory tier. Must be called with the lock held."""
+        self._pages[title] = sentences
+        self._pages.move_to_end(title)
+        while len(self._pages) > self.max_entries:
+            self._pages.popitem(last=False)
+
+    def _remember_rejection(self, title, rejected_at):
+        """Adds a rejected title to the memory tier. Must be called with the lock held."""
+        self._rejected[title] = rejected_at
+        self._rejected.move_to_end(title)
+        while len(self._rejected) > self.max_rejected:
+            self._rejected.popitem(last=False)
+
+    def _purge_rejected(self, conn, now):
+        """Deletes rejections older than negative_ttl from disk, inside the caller's transaction."""
+        conn.execute("DELETE FROM rejected_pages WHERE rejected_at <= ?", (now - self.negative_ttl,))
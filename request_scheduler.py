@@ -0,0 +1,346 @@
+import email.utils
+import threading
+import time
+from collections import deque
+
+DEFAULT_MAX_ATTEMPTS = 3  # tries per call while the upstream throttles
+BASE_BACKOFF = 1.0  # seconds paused after a throttling response without Retry-After
+MAX_BACKOFF = 60.0
+FAILURE_THRESHOLD = 5  # consecutive failures that open the circuit
+RESET_TIMEOUT = 30.0  # seconds an open circuit waits before letting a trial call through
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+class ThrottledError(Exception):
+    """
+    Raised by API clients when the upstream asks callers to slow down (e.g. a MediaWiki maxlag error).
+
+    Args:
+        message (str): Error description.
+        retry_after (float, optional): Seconds the upstream asked to wait.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling an upstream whose circuit breaker is open.
+
+    Args:
+        message (str): Error description.
+        service (str, optional): Name of the scheduler whose circuit is open, e.g. "openai".
+    """
+
+    def __init__(self, message, service=None):
+        super().__init__(message)
+        self.service = service
+
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header, given either in seconds or as an HTTP date.
+
+    Args:
+        value (str | None): Header value.
+
+    Returns:
+        float | None: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _classify(exc):
+    """
+    Sorts an exception into throttling, upstream failure or caller error.
+
+    Works with any exception carrying a requests/httpx-style `response`
+    (status_code and headers), so it covers both requests and openai errors.
+
+    Returns:
+        tuple: (kind, retry_after) with kind "throttled", "failure" or "client_error".
+    """
+    if isinstance(exc, ThrottledError):
+        return "throttled", exc.retry_after
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status in (429, 503):
+        return "throttled", parse_retry_after(response.headers.get("Retry-After"))
+    if status is not None and 400 <= status < 500:
+        return "client_error", None
+    return "failure", None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket; callers reserve a token and sleep until it is due.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (int): Bucket capacity.
+
+    Raises:
+        ValueError: If rate is not positive or burst is below one.
+    """
+
+    def __init__(self, rate, burst):
+        if not rate > 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate}.")
+        if burst < 1:
+            raise ValueError(f"Token bucket burst must be at least 1, got {burst}.")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes a token, going into debt if the bucket is empty.
+
+        Returns:
+            float: Seconds the caller has to wait before using the token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds):
+        """Stops handing out usable tokens for the given number of seconds."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """
+    Stops calls to an upstream after repeated failures.
+
+    The circuit opens after failure_threshold consecutive failures. Once
+    reset_timeout seconds have passed, one trial call is let through: success
+    closes the circuit, failure opens it again.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds before a trial call is allowed.
+    """
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """Returns "closed", "open" or "half-open"."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        """
+        Checks whether a call may go through, claiming the trial slot when half-open.
+
+        Returns:
+            bool: True if the call may be made.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        """Closes the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        """Counts a failure, opening the circuit once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def release_trial(self):
+        """Frees the trial slot of a call that ended without an outcome, e.g. on KeyboardInterrupt."""
+        with self._lock:
+            self._trial_running = False
+
+
+class Scheduler:
+    """
+    Shared gate for all calls to one upstream API.
+
+    Every call waits for a token-bucket slot, so concurrent sessions share
+    one request budget. Throttling responses pause the whole bucket for the
+    Retry-After time (or an adaptive backoff) and are retried; repeated
+    failures open a circuit breaker so callers can switch to cached or
+    local content instead of waiting on an unhealthy upstream.
+
+    Args:
+        name (str): Upstream name, used in metrics and errors.
+        rate (float): Requests per second.
+        burst (int): Requests allowed back to back.
+        max_attempts (int): Tries per call while the upstream throttles.
+        breaker (CircuitBreaker, optional): Circuit breaker; a default one is created if omitted.
+    """
+
+    def __init__(self, name, rate, burst, max_attempts=DEFAULT_MAX_ATTEMPTS, breaker=None):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._throttle_streak = 0
+        self._queue_delays = deque(maxlen=1000)
+        self._counters = {"calls": 0, "throttled": 0, "failures": 0, "rejected": 0}
+
+    def is_open(self):
+        """Returns True while the circuit breaker rejects calls."""
+        return self.breaker.state == "open"
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def call(self, func, *args, **kwargs):
+        """
+        Runs func under the rate limit and circuit breaker.
+
+        Args:
+            func (callable): Function performing the request.
+            *args: Positional arguments for func.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            Any: Result of func.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            Exception: Whatever func raised on its last attempt.
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            if not self.breaker.allow():
+                self._count("rejected")
+                raise CircuitOpenError(f"{self.name} is unavailable, circuit breaker open.", service=self.name)
+
+            settled = False
+            try:
+                queued = time.monotonic()
+                wait = self.bucket.reserve()
+                if wait > 0:
+                    time.sleep(wait)
+                with self._lock:
+                    self._counters["calls"] += 1
+                    self._queue_delays.append(time.monotonic() - queued)
+
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    settled = True
+                    kind, retry_after = _classify(e)
+                    if kind == "client_error":
+                        self.breaker.record_success()  # the upstream answered; the request was at fault
+                        raise
+                    self.breaker.record_failure()
+                    if kind == "failure":
+                        self._count("failures")
+                        raise
+                    with self._lock:
+                        self._counters["throttled"] += 1
+                        self._throttle_streak += 1
+                        backoff = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (self._throttle_streak - 1))
+                    self.bucket.pause(retry_after if retry_after is not None else backoff)
+                    if attempt == self.max_attempts:
+                        raise
+                    continue
+
+                settled = True
+                self.breaker.record_success()
+                with self._lock:
+                    self._throttle_streak = 0
+                return result
+            finally:
+                if not settled:
+                    self.breaker.release_trial()  # interrupted, so a half-open circuit can try again
+
+    def metrics(self):
+        """
+        Returns call counters, breaker state and queue delay statistics.
+
+        Returns:
+            dict: Metrics of this scheduler; delays in milliseconds.
+        """
+        with self._lock:
+            delays = sorted(self._queue_delays)
+            report = dict(self._counters)
+        report["breaker"] = self.breaker.state
+        report["queue_delay_avg_ms"] = sum(delays) / len(delays) * 1000 if delays else 0.0
+        report["queue_delay_p95_ms"] = delays[int(0.95 * (len(delays) - 1))] * 1000 if delays else 0.0
+        report["queue_delay_max_ms"] = delays[-1] * 1000 if delays else 0.0
+        return report
+
+
+def get_scheduler(name, rate, burst, **options):
+    """
+    Returns the process-wide scheduler of an upstream, creating it on first use.
+
+    Later calls return the existing scheduler and ignore the configuration.
+
+    Args:
+        name (str): Upstream name, e.g. "wikipedia" or "openai".
+        rate (float): Requests per second.
+        burst (int): Requests allowed back to back.
+        **options: Further Scheduler arguments.
+
+    Returns:
+        Scheduler: Shared scheduler.
+    """
+    scheduler = _schedulers.get(name)
+    if scheduler is None:
+        with _schedulers_lock:
+            scheduler = _schedulers.get(name)
+            if scheduler is None:
+                scheduler = _schedulers[name] = Scheduler(name, rate, burst, **options)
+    return scheduler
+
+
+def get_metrics():
+    """
+    Returns the metrics of every scheduler.
+
+    Returns:
+        dict: Metrics keyed by upstream name.
+    """
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+    return {scheduler.name: scheduler.metrics() for scheduler in schedulers}
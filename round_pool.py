@@ -0,0 +1,157 @@
+import argparse
+import json
+import random
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+
+ROUND_POOL_PATH = "data/round_pool.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    page_title TEXT NOT NULL,
+    sentences TEXT NOT NULL,
+    lie_index INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS played_rounds (
+    player TEXT NOT NULL,
+    round_id INTEGER NOT NULL REFERENCES rounds(id),
+    PRIMARY KEY (player, round_id)
+);
+"""
+
+
+class RoundPool:
+    """
+    Persistent store of pre-generated game rounds with per-player repeat tracking.
+
+    Args:
+        path (str): Path to the SQLite database file.
+    """
+
+    def __init__(self, path=ROUND_POOL_PATH):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def add_round(self, page_title, sentences, lie_index):
+        """
+        Stores a fully built round.
+
+        Args:
+            page_title (str): Wikipedia article title.
+            sentences (list): The three displayed sentences, one of them a lie.
+            lie_index (int): Index of the lie within sentences.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO rounds (page_title, sentences, lie_index, created_at) VALUES (?, ?, ?, ?)",
+                (page_title, json.dumps(sentences), lie_index, time.time()),
+            )
+
+    def draw_round(self, player=""):
+        """
+        Picks a random round the player has not seen yet and marks it as played.
+
+        The round is found through the id index from a random starting id, so
+        drawing stays cheap however large the pool grows.
+
+        Args:
+            player (str): Player name used for repeat tracking.
+
+        Returns:
+            tuple | None: (page_title, sentences, lie_index) or None if the pool is exhausted.
+        """
+        player = player or ""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            last_id = conn.execute("SELECT MAX(id) FROM rounds").fetchone()[0]
+            if last_id is None:
+                return None
+            # Start at a random id and take the next unseen round, wrapping around once
+            start = random.randint(1, last_id)
+            row = None
+            for condition, order in (("id >= ?", "ASC"), ("id < ?", "DESC")):
+                row = conn.execute(
+                    "SELECT id, page_title, sentences, lie_index FROM rounds "
+                    f"WHERE {condition} AND NOT EXISTS "
+                    "(SELECT 1 FROM played_rounds WHERE player = ? AND round_id = rounds.id) "
+                    f"ORDER BY id {order} LIMIT 1",
+                    (start, player),
+                ).fetchone()
+                if row is not None:
+                    break
+            if row is None:
+                return None
+            round_id, page_title, sentences, lie_index = row
+            conn.execute("INSERT INTO played_rounds (player, round_id) VALUES (?, ?)", (player, round_id))
+        return page_title, json.loads(sentences), lie_index
+
+    def size(self):
+        """Returns the total number of stored rounds."""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM rounds").fetchone()[0]
+
+    def unseen_count(self, player=""):
+        """Returns how many stored rounds the player has not played yet."""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM rounds "
+                "WHERE id NOT IN (SELECT round_id FROM played_rounds WHERE player = ?)",
+                (player or "",),
+            ).fetchone()[0]
+
+
+def warm_up(pool, build_round, count, workers=4):
+    """
+    Generates rounds in bulk and stores them in the pool.
+
+    Args:
+        pool (RoundPool): Destination pool.
+        build_round (callable): Function returning (page_title, sentences, lie_index).
+        count (int): Number of rounds to generate.
+        workers (int): Number of rounds generated concurrently.
+
+    Returns:
+        int: Number of rounds successfully stored.
+    """
+    stored = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(build_round) for _ in range(count)]
+        for future in as_completed(futures):
+            try:
+                page_title, sentences, lie_index = future.result()
+            except Exception as e:
+                print(f"Round generation failed: {e}")
+                continue
+            pool.add_round(page_title, sentences, lie_index)
+            stored += 1
+            print(f"[{stored}/{count}] {page_title}")
+    return stored
+
+
+def main():
+    """Command-line entry point for filling the round pool offline."""
+    parser = argparse.ArgumentParser(description="Pre-generate Beyond Belief rounds into the local round pool.")
+    parser.add_argument("--count", type=int, default=50, help="number of rounds to generate")
+    parser.add_argument("--workers", type=int, default=4, help="rounds generated concurrently")
+    parser.add_argument("--db", default=ROUND_POOL_PATH, help="path of the round pool database")
+    args = parser.parse_args()
+
+    import game_logic  # imported here because game_logic itself reads from the pool
+
+    pool = RoundPool(args.db)
+    stored = warm_up(pool, game_logic.generate_round, args.count, args.workers)
+    print(f"Stored {stored} new rounds. Pool size: {pool.size()}")
+
+
+if __name__ == "__main__":
+    main()
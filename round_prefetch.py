@@ -0,0 +1,191 @@
+import logging
+import queue
+import threading
+import time
+
+# Default number of ready rounds kept in the queue
+DEFAULT_DEPTH = 2
+# Pause after a failed background build before trying again
+RETRY_DELAY = 1.0
+# Seconds get_round waits for a round a worker is already building before building its own
+DEFAULT_WAIT = 15.0
+
+logger = logging.getLogger(__name__)
+
+
+class RoundPrefetcher:
+    """
+    Builds game rounds in background threads and keeps a bounded queue of them
+    ready, so the next puzzle is available as soon as the player asks for it.
+
+    Failures of background builds are retried and only logged, so they never
+    print into the game screen.
+
+    Args:
+        build_round (callable): Function returning a fully built round,
+            e.g. game_logic.get_sentences_for_game.
+        depth (int): Maximum number of ready rounds kept in the queue.
+        workers (int): Number of background builder threads.
+    """
+
+    def __init__(self, build_round, depth=DEFAULT_DEPTH, workers=1):
+        self.build_round = build_round
+        self.depth = max(1, depth)
+        self.workers = max(1, workers)
+        self._rounds = queue.Queue(maxsize=self.depth)
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._building = 0  # workers inside build_round, guarded by _state
+        self._state = threading.Condition()
+        self._ready_callbacks = []
+        self.prefetched_count = 0
+        self.fallback_count = 0
+
+    def start(self):
+        """Starts the background builder threads."""
+        if self._threads:
+            return self
+        self._stop_event.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"round-prefetch-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=1.0):
+        """
+        Stops the builder threads and drops any rounds still queued.
+
+        Args:
+            timeout (float): Seconds to wait for each thread to finish.
+        """
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        while True:
+            try:
+                self._rounds.get_nowait()
+            except queue.Empty:
+                break
+
+    def get_round(self, wait=DEFAULT_WAIT):
+        """
+        Returns the next ready round, building one synchronously if none is coming.
+
+        While a worker is building a round, that round is awaited for up to
+        wait seconds, since it is done sooner than a new build would be. If no
+        worker is building, e.g. while they pause after failures, the round is
+        built right away.
+
+        Args:
+            wait (float): Seconds to wait for a round in progress before falling back.
+
+        Returns:
+            tuple: (page_title, sentences, lie_index)
+
+        Raises:
+            Exception: Whatever the synchronous build raised, after logging it.
+        """
+        game_round = self.wait_for_round(wait)
+        if game_round is not None:
+            return game_round
+        return self.build_now()
+
+    def build_now(self):
+        """
+        Builds a round synchronously, for callers that cannot wait for the workers.
+
+        Returns:
+            tuple: (page_title, sentences, lie_index)
+
+        Raises:
+            Exception: Whatever the build raised, after logging it.
+        """
+        self.fallback_count += 1
+        try:
+            return self.build_round()
+        except Exception as e:
+            logger.warning("Round generation failed: %s", e)
+            raise
+
+    def wait_for_round(self, wait=DEFAULT_WAIT):
+        """
+        Takes a ready round, waiting while a worker is building one.
+
+        Args:
+            wait (float): Seconds to wait at most.
+
+        Returns:
+            tuple | None: (page_title, sentences, lie_index), or None if no round
+                became ready in time or none is being built.
+        """
+        deadline = time.monotonic() + wait
+        with self._state:
+            while True:
+                try:
+                    game_round = self._rounds.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if not self._building or remaining <= 0:
+                        return None
+                    self._state.wait(remaining)
+                    continue
+                self.prefetched_count += 1
+                return game_round
+
+    def add_ready_callback(self, callback):
+        """
+        Registers a function called without arguments whenever a worker finishes a build.
+
+        It runs on the worker thread, after the round (if any) was queued, so it
+        must be quick and thread-safe, e.g. loop.call_soon_threadsafe.
+
+        Args:
+            callback (callable): Function to call.
+        """
+        self._ready_callbacks.append(callback)
+
+    def is_building(self):
+        """Returns True while a worker is building a round."""
+        with self._state:
+            return self._building > 0
+
+    def ready_count(self):
+        """Returns the number of rounds currently waiting in the queue."""
+        return self._rounds.qsize()
+
+    def _worker(self):
+        """Keeps the queue filled until stopped."""
+        while not self._stop_event.is_set():
+            with self._state:
+                self._building += 1
+            try:
+                game_round = self.build_round()
+            except Exception as e:
+                self._finish_build()
+                logger.warning("Background round generation failed: %s", e)
+                self._stop_event.wait(RETRY_DELAY)
+                continue
+
+            while not self._stop_event.is_set():
+                try:
+                    self._rounds.put(game_round, timeout=0.2)
+                    break
+                except queue.Full:
+                    continue
+            self._finish_build()
+
+    def _finish_build(self):
+        """Marks a worker's build as done and wakes callers waiting for a round."""
+        with self._state:
+            self._building -= 1
+            self._state.notify_all()
+        for callback in self._ready_callbacks:
+            callback()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,151 @@
+import functools
+import os
+import sys
+import textwrap
+
+WIDTH = 117  # inner width of the game's boxes
+CLEAR = "\033[H\033[2J\033[3J"  # cursor home, clear screen, clear scrollback
+
+
+def supports_ansi():
+    """Returns True if the terminal is expected to understand ANSI escape sequences."""
+    return os.name != 'nt' and 'TERM' in os.environ
+
+
+def clear_sequence():
+    """
+    Returns the text that clears the screen, to be written as part of a frame.
+
+    Returns:
+        str: ANSI clear sequence, or blank lines on terminals without ANSI support.
+    """
+    if supports_ansi():
+        return CLEAR
+    if os.name == 'nt':
+        os.system('cls')  # older Windows consoles ignore ANSI sequences
+        return ""
+    return "\n" * 100
+
+
+@functools.lru_cache(maxsize=4096)
+def wrap(text, width=WIDTH):
+    """
+    Wraps text to a width, memoized because the same strings are redrawn every frame.
+
+    Args:
+        text (str): Text to wrap.
+        width (int): Maximum line width.
+
+    Returns:
+        tuple: Wrapped lines.
+    """
+    return tuple(textwrap.wrap(text, width))
+
+
+@functools.lru_cache(maxsize=None)
+def border(left, right, width=WIDTH, fill="═"):
+    """
+    Returns a pre-rendered horizontal box border.
+
+    Args:
+        left (str): Left corner, e.g. "╔".
+        right (str): Right corner, e.g. "╗".
+        width (int): Inner width.
+        fill (str): Line character.
+
+    Returns:
+        str: Border line without newline.
+    """
+    return left + fill * width + right
+
+
+def box(lines, title=None, color="", reset="", width=WIDTH):
+    """
+    Renders text lines inside a box.
+
+    Args:
+        lines (list): Lines of text, wrapped to the box width.
+        title (str, optional): Text shown above the lines.
+        color (str): ANSI color code opening the box.
+        reset (str): ANSI code written after the box.
+        width (int): Inner width.
+
+    Returns:
+        str: Rendered box ending with a newline.
+    """
+    parts = [color + border("╔", "╗", width)]
+    for text in ([title] if title else []) + list(lines):
+        parts.extend(f" {line.ljust(width)} " for line in wrap(text, width))
+    parts.append(border("╚", "╝", width) + reset)
+    return "\n".join(parts) + "\n"
+
+
+class Frame:
+    """
+    Collects a whole screen and writes it with a single call.
+
+    Composing the frame in memory and flushing it once avoids the flicker of
+    clearing the terminal and then drawing it line by line.
+
+    Args:
+        clear (bool): Start the frame by clearing the screen.
+    """
+
+    def __init__(self, clear=True):
+        self._parts = [clear_sequence()] if clear else []
+
+    def add(self, text):
+        """
+        Appends already rendered text.
+
+        Args:
+            text (str): Text, normally ending with a newline.
+
+        Returns:
+            Frame: The frame itself, for chaining.
+        """
+        self._parts.append(text)
+        return self
+
+    def line(self, text=""):
+        """Appends one line of text."""
+        self._parts.append(text + "\n")
+        return self
+
+    def render(self):
+        """Returns the frame as one string."""
+        return "".join(self._parts)
+
+    def write(self, stream=None):
+        """
+        Writes the frame with one write and one flush.
+
+        Args:
+            stream (file, optional): Output stream, sys.stdout by default.
+
+        Returns:
+            int: Number of characters written.
+        """
+        return write(self.render(), stream)
+
+
+def write(text, stream=None):
+    """
+    Writes text with one write and one flush.
+
+    Args:
+        text (str): Text to write.
+        stream (file, optional): Output stream, sys.stdout by default.
+
+    Returns:
+        int: Number of characters written.
+    """
+    stream = stream or sys.stdout
+    stream.write(text)
+    stream.flush()
+    return len(text)
+
+
+def clear_screen():
+    """Clears the terminal screen without starting a shell."""
+    write(clear_sequence())
@@ -0,0 +1,301 @@
+import argparse
+import mmap
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+import local_corpus
+
+SENTENCE_CORPUS_PATH = "data/sentence_corpus.bin"
+MAGIC = b"BBSCORP2"
+OLD_MAGICS = (b"BBSCORP1",)  # formats without category tags, rebuilt with main()
+# magic, byte order (0 little / 1 big), article count, entry count, blob size, category count, member count
+_HEADER = struct.Struct("<8sBxxxxxxxQQQQQ")
+_BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+# Every article is stored as consecutive text entries: its title, then its
+# sentences. The category names follow as one entry each after the last
+# article. File layout after the header, offset arrays are native uint64:
+#   article_starts    article_count + 1   entry index of each article's title
+#   entry_offsets     entry_count + 1     blob offset where each entry starts
+#   category_starts   category_count + 1  index of each category's first member
+#   category_members  member_count        article indices of each category, category by category
+#   lie_flags         entry_count         1 if the entry is a lie-eligible sentence, padded to 8 bytes
+#   blob              UTF-8 text of all entries, back to back
+
+
+def _padded(size):
+    """Rounds a byte size up to a multiple of 8 so the following arrays stay aligned."""
+    return (size + 7) & ~7
+
+
+def write_corpus(path, pages):
+    """
+    Writes pages into a compact sentence corpus file.
+
+    Text is streamed to a temporary file while only the offset arrays and
+    category member lists are kept in memory, so corpora larger than RAM can
+    be written.
+
+    Args:
+        path (str): Destination file; replaced atomically once complete.
+        pages (iterable): (title, sentences, lie_candidates) tuples, optionally
+            followed by the page's category names as a fourth item.
+
+    Returns:
+        tuple: (article count, sentence count)
+    """
+    article_starts = array("Q", [0])
+    entry_offsets = array("Q", [0])
+    lie_flags = bytearray()
+    members = {}
+    sentence_count = 0
+    directory = os.path.dirname(path) or "."
+
+    with tempfile.TemporaryFile(dir=directory) as blob:
+        position = 0
+        for title, sentences, lie_candidates, *categories in pages:
+            for category in set(categories[0]) if categories else ():
+                members.setdefault(category, array("Q")).append(len(article_starts) - 1)
+            position += blob.write(title.encode("utf-8"))
+            entry_offsets.append(position)
+            lie_flags.append(False)
+            eligible = set(lie_candidates)
+            for index, sentence in enumerate(sentences):
+                position += blob.write(sentence.encode("utf-8"))
+                entry_offsets.append(position)
+                lie_flags.append(index in eligible)
+            sentence_count += len(sentences)
+            article_starts.append(len(lie_flags))
+
+        category_starts = array("Q", [0])
+        for category in sorted(members):
+            position += blob.write(category.encode("utf-8"))
+            entry_offsets.append(position)
+            lie_flags.append(False)
+            category_starts.append(category_starts[-1] + len(members[category]))
+
+        article_count = len(article_starts) - 1
+        entry_count = len(lie_flags)
+        lie_flags.extend(bytes(_padded(entry_count) - entry_count))
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, _BYTE_ORDER, article_count, entry_count, position,
+                                    len(members), category_starts[-1]))
+            article_starts.tofile(file)
+            entry_offsets.tofile(file)
+            category_starts.tofile(file)
+            for category in sorted(members):
+                members[category].tofile(file)
+            file.write(lie_flags)
+            blob.seek(0)
+            shutil.copyfileobj(blob, file)
+        os.replace(temp_path, path)
+
+    return article_count, sentence_count
+
+
+class SentenceView:
+    """
+    Lazy, read-only sequence of one article's sentences.
+
+    Sentences are decoded from the memory map only when accessed.
+    """
+
+    def __init__(self, corpus, first, count):
+        self._corpus = corpus
+        self._first = first
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("sentence index out of range")
+        return self._corpus._entry(self._first + index)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._corpus._entry(self._first + index)
+
+    def lie_candidates(self):
+        """Returns the indices of the lie-eligible sentences."""
+        flags = self._corpus._lie_flags
+        return [index for index in range(self._count) if flags[self._first + index]]
+
+
+class SentenceCorpus:
+    """
+    Read-only, memory-mapped view of a compact sentence corpus.
+
+    Nothing is decoded up front: opening a corpus only maps the file, and
+    pages are read straight from the OS page cache, which all game processes
+    using the same file share.
+
+    Args:
+        path (str): Corpus file written by write_corpus.
+    """
+
+    def __init__(self, path=SENTENCE_CORPUS_PATH):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] in OLD_MAGICS:
+            self._mmap.close()
+            raise ValueError(f"{path} has no category tags; rebuild it with sentence_corpus.py.")
+        magic, byte_order, self.article_count, self.entry_count, blob_size, category_count, member_count = \
+            _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a sentence corpus file.")
+        if byte_order != _BYTE_ORDER:
+            self._mmap.close()
+            raise ValueError(f"{path} was written on a machine with a different byte order.")
+
+        view = memoryview(self._mmap)
+        position = _HEADER.size
+        sections = []
+        for size in (self.article_count + 1, self.entry_count + 1, category_count + 1, member_count):
+            sections.append(view[position:position + size * 8].cast("Q"))
+            position += size * 8
+        self._article_starts, self._entry_offsets, self._category_starts, self._category_members = sections
+        self._lie_flags = view[position:position + self.entry_count]
+        self._blob_start = position + _padded(self.entry_count)
+        self._view = view
+        if len(self._mmap) < self._blob_start + blob_size:
+            self.close()
+            raise ValueError(f"{path} is truncated.")
+
+        first_name = self.entry_count - category_count
+        self._categories = {self._entry(first_name + index): index for index in range(category_count)}
+
+    def __len__(self):
+        return self.article_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Releases the memory map."""
+        if self._mmap.closed:
+            return
+        for section in (self._article_starts, self._entry_offsets, self._category_starts, self._category_members,
+                        self._lie_flags, self._view):
+            section.release()
+        self._mmap.close()
+
+    def _entry(self, index):
+        """Decodes one text entry from the blob."""
+        start = self._blob_start + self._entry_offsets[index]
+        return str(self._mmap[start:self._blob_start + self._entry_offsets[index + 1]], "utf-8")
+
+    def title(self, article):
+        """Returns the title of an article."""
+        return self._entry(self._article_starts[article])
+
+    def sentences(self, article):
+        """
+        Returns the sentences of an article without decoding them.
+
+        Args:
+            article (int): Article index.
+
+        Returns:
+            SentenceView: Lazy sequence of sentence strings.
+        """
+        first = self._article_starts[article] + 1  # skip the title entry
+        return SentenceView(self, first, self._article_starts[article + 1] - first)
+
+    def get(self, article):
+        """
+        Returns one article in the shape of get_valid_wikipedia_page_info.
+
+        Args:
+            article (int): Article index.
+
+        Returns:
+            tuple: (title, SentenceView)
+        """
+        return self.title(article), self.sentences(article)
+
+    def page(self, article):
+        """
+        Returns one fully decoded article in the shape of get_valid_wikipedia_page.
+
+        Args:
+            article (int): Article index.
+
+        Returns:
+            tuple: (title, list of sentences, list of lie-eligible indices)
+        """
+        sentences = self.sentences(article)
+        return self.title(article), list(sentences), sentences.lie_candidates()
+
+    def categories(self):
+        """Returns the names of the categories the articles are tagged with."""
+        return list(self._categories)
+
+    def category_size(self, category):
+        """Returns the number of articles tagged with a category, 0 if it is unknown."""
+        index = self._categories.get(local_corpus.normalize_category(category))
+        if index is None:
+            return 0
+        return self._category_starts[index + 1] - self._category_starts[index]
+
+    def random_page(self, categories=None, rng=random):
+        """
+        Picks a random fully decoded article, optionally restricted to some categories.
+
+        Args:
+            categories (list, optional): Category names; a random non-empty one is used.
+            rng (random.Random, optional): Random generator, e.g. a seeded one for replays.
+
+        Returns:
+            tuple | None: (title, sentences, lie-eligible indices) or None if nothing matches.
+        """
+        if categories:
+            available = [category for category in categories if self.category_size(category)]
+            if not available:
+                return None
+            index = self._categories[local_corpus.normalize_category(rng.choice(available))]
+            first = self._category_starts[index]
+            return self.page(self._category_members[rng.randrange(first, self._category_starts[index + 1])])
+        if not self.article_count:
+            return None
+        return self.page(rng.randrange(self.article_count))
+
+    def __iter__(self):
+        for article in range(self.article_count):
+            yield self.get(article)
+
+
+def main():
+    """Command-line entry point converting the SQLite local corpus into a compact corpus file."""
+    parser = argparse.ArgumentParser(description="Build a compact memory-mapped sentence corpus.")
+    parser.add_argument("--db", default=local_corpus.LOCAL_CORPUS_PATH, help="local corpus built by wiki_dump.py")
+    parser.add_argument("--category", help="only export pages tagged with this category")
+    parser.add_argument("--out", default=SENTENCE_CORPUS_PATH, help="path of the corpus file")
+    args = parser.parse_args()
+
+    corpus = local_corpus.LocalCorpus(args.db)
+    articles, sentences = write_corpus(args.out, corpus.iter_pages(args.category))
+    print(f"Wrote {articles:,} articles with {sentences:,} sentences "
+          f"({os.path.getsize(args.out) / 1e6:,.1f} MB) to {args.out}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+import game_logic
+import game_server
+
+ROUND = ("Page", ["One.", "Two.", "Three."], 0)
+
+
+def test_sanitize_name_drops_escapes_and_control_characters():
+    assert game_server.sanitize_name("\x1b[31mRed\x1b[0m") == "Red"
+    assert game_server.sanitize_name("a\x1b]0;title\x07b") == "ab"
+    assert game_server.sanitize_name("‮evil​\x07") == "evil"
+    assert game_server.sanitize_name("\x1b[2J  ") == "Anonymous"
+    assert game_server.sanitize_name("x" * 50) == "x" * game_server.MAX_NAME_LENGTH
+
+
+def test_failed_round_reports_its_cause():
+    def build_round():
+        raise game_logic.NoLieError("No lie could be generated for the fetched pages.")
+
+    async def play():
+        server = await game_server.GameServer(build_round, port=0, round_workers=1).start()
+        try:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(b"ada\n")
+            await writer.drain()
+            text = (await asyncio.wait_for(reader.read(), 10)).decode()
+            writer.close()
+            return text, server.metrics()
+        finally:
+            await server.close()
+
+    text, metrics = asyncio.run(play())
+
+    assert "No lie could be generated for the fetched pages. The game ends here." in text
+    assert "Wikipedia" not in text
+    assert metrics["round_errors"] == 1
+
+
+def test_waiting_sessions_hold_no_threads():
+    release = threading.Event()
+
+    def build_round():
+        release.wait(10)
+        return ROUND
+
+    async def wait_for_rounds():
+        server = await game_server.GameServer(build_round, port=0, round_buffer=1, round_workers=1).start()
+        server._prefetcher.build_now = None  # would fail if a session built its own round
+        try:
+            sessions = [asyncio.ensure_future(server.next_round("ada")) for _ in range(8)]
+            await asyncio.sleep(0.2)
+            waiting = not any(session.done() for session in sessions)
+            threads = len(server._executor._threads)
+            release.set()
+            return waiting, threads, await asyncio.gather(*sessions)
+        finally:
+            await server.close()
+
+    waiting, threads, rounds = asyncio.run(wait_for_rounds())
+
+    assert waiting
+    assert threads == 0
+    assert rounds == [ROUND] * 8
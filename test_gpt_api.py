@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import gpt_api
+
+
+class FakeOpenAI:
+    """Stands in for the OpenAI client, recording calls and peak concurrency."""
+
+    def __init__(self, answer=None, latency=0.05):
+        self.answer = answer
+        self.latency = latency
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def with_options(self, **options):
+        return self
+
+    def _create(self, model, messages):
+        with self._lock:
+            self.requests.append(messages[-1]["content"])
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.active -= 1
+        content = messages[-1]["content"]
+        answer = self.answer(content) if self.answer else f"Not true: {content}"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=answer))])
+
+
+@pytest.fixture
+def fake_client():
+    client = FakeOpenAI()
+    gpt_api.set_client(client)
+    yield client
+    gpt_api.set_client(None)
+
+
+def test_get_client_is_shared(fake_client):
+    assert gpt_api.get_client() is fake_client
+    assert gpt_api.get_client() is gpt_api.get_client()
+
+
+def test_lie_service_caps_concurrency_and_keeps_order(fake_client):
+    texts = [f"Fact number {i}." for i in range(3 * gpt_api.MAX_CONCURRENT_REQUESTS)]
+    service = gpt_api.LieService(max_workers=len(texts))
+    try:
+        lies = service.generate(texts)
+    finally:
+        service.shutdown()
+
+    assert lies == [f"Not true: {text}" for text in texts]
+    assert len(fake_client.requests) == len(texts)
+    assert 1 < fake_client.peak <= gpt_api.MAX_CONCURRENT_REQUESTS
+
+
+def test_batched_lies_use_one_request(fake_client):
+    texts = ["The tower is 300 metres tall.", "The bridge opened in 1932."]
+    fake_client.answer = lambda content: json.dumps([f"False: {text}" for text in json.loads(content)])
+
+    lies = gpt_api.get_gpt_lies_batched(texts)
+
+    assert lies == [f"False: {text}" for text in texts]
+    assert len(fake_client.requests) == 1
+
+
+def test_batched_lies_fall_back_to_single_requests(fake_client):
+    texts = ["The tower is 300 metres tall.", "The bridge opened in 1932.", "The lake is frozen."]
+    fake_client.answer = lambda content: "Sorry, here are some lies." if content.startswith("[") else f"Lie: {content}"
+
+    lies = gpt_api.get_gpt_lies_batched(texts)
+
+    assert lies == [f"Lie: {text}" for text in texts]
+    assert len(fake_client.requests) == 1 + len(texts)
@@ -0,0 +1,105 @@
+import json
+import random
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+import leaderboard_store
+
+WRITERS = 4
+SUBMISSIONS = 100
+PLAYERS = 10
+
+
+def _submit_scores(path, worker):
+    """Process body: submits random scores, returns the best score sent per player."""
+    rng = random.Random(worker)
+    store = leaderboard_store.LeaderboardStore(path, legacy_path=None)
+    sent = {}
+    for _ in range(SUBMISSIONS):
+        player, score = f"player{rng.randrange(PLAYERS)}", rng.randrange(1, 1000)
+        sent[player] = max(sent.get(player, 0), score)
+        store.submit(player, score)
+    return sent
+
+
+def _merge(results):
+    expected = {}
+    for sent in results:
+        for player, score in sent.items():
+            expected[player] = max(expected.get(player, 0), score)
+    return expected
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "leaderboard.db")
+
+
+def test_lower_score_keeps_best(db_path):
+    store = leaderboard_store.LeaderboardStore(db_path, legacy_path=None)
+
+    assert store.submit("ada", 40) is None
+    assert store.submit("ada", 25) == 40
+    assert store.submit("ada", 55) == 40
+    assert store.best_score("ada") == 55
+    assert store.best_score("bob") is None
+
+
+def test_top_orders_by_score_then_name(db_path):
+    store = leaderboard_store.LeaderboardStore(db_path, legacy_path=None)
+    for player, score in (("carol", 30), ("bob", 50), ("ada", 50), ("dave", 10)):
+        store.submit(player, score)
+
+    assert store.top(3) == [("ada", 50), ("bob", 50), ("carol", 30)]
+
+
+def test_legacy_json_is_imported_once(db_path, tmp_path):
+    legacy_path = tmp_path / "leaderboard.json"
+    legacy_path.write_text(json.dumps({"ada": 12, "bob": 7}))
+
+    leaderboard_store.LeaderboardStore(db_path, legacy_path=str(legacy_path)).submit("ada", 20)
+    store = leaderboard_store.LeaderboardStore(db_path, legacy_path=str(legacy_path))
+
+    assert store.top(5) == [("ada", 20), ("bob", 7)]
+
+
+def test_concurrent_processes_lose_no_updates(db_path):
+    leaderboard_store.LeaderboardStore(db_path, legacy_path=None)
+    with ProcessPoolExecutor(max_workers=WRITERS) as executor:
+        expected = _merge(executor.map(_submit_scores, [db_path] * WRITERS, range(WRITERS)))
+
+    assert dict(leaderboard_store.LeaderboardStore(db_path, legacy_path=None).top(PLAYERS)) == expected
+
+
+def test_concurrent_threads_count_every_game(db_path):
+    store = leaderboard_store.LeaderboardStore(db_path, legacy_path=None)
+    with ThreadPoolExecutor(max_workers=WRITERS) as executor:
+        list(executor.map(lambda score: store.submit("ada", score), range(1, SUBMISSIONS + 1)))
+
+    assert store.best_score("ada") == SUBMISSIONS
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("SELECT games FROM scores WHERE player = 'ada'").fetchone()[0] == SUBMISSIONS
+    finally:
+        conn.close()
+
+
+def test_interleaved_games_keep_both_scores(db_path, tmp_path):
+    # Two games finishing together: with the old JSON leaderboard both read the
+    # file before either wrote it back, so the second write dropped the first score.
+    json_path = tmp_path / "leaderboard.json"
+    json_path.write_text("{}")
+    first, second = json.loads(json_path.read_text()), json.loads(json_path.read_text())
+    first["ada"] = 40
+    json_path.write_text(json.dumps(first))
+    second["bob"] = 30
+    json_path.write_text(json.dumps(second))
+    assert json.loads(json_path.read_text()) == {"bob": 30}
+
+    store = leaderboard_store.LeaderboardStore(db_path, legacy_path=None)
+    other = leaderboard_store.LeaderboardStore(db_path, legacy_path=None)
+    store.submit("ada", 40)
+    other.submit("bob", 30)
+    assert store.top(5) == [("ada", 40), ("bob", 30)]
@@ -0,0 +1,142 @@
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import benchmarks
+import wiki_api
+import wiki_replay
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    """Keep-alive MediaWiki stand-in that counts TCP connections and requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+        body = json.dumps({"query": {"random": [{"title": "Stub page"}]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    server.lock = threading.Lock()
+    server.connections = server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client_for(server, **options):
+    return wiki_api.WikiClient(api_url=f"http://127.0.0.1:{server.server_port}/w/api.php", **options)
+
+
+def test_sequential_requests_reuse_one_connection(stub_server):
+    client = _client_for(stub_server)
+    try:
+        for _ in range(20):
+            assert client.get({"action": "query", "list": "random"})["query"]["random"][0]["title"] == "Stub page"
+    finally:
+        client.close()
+    assert stub_server.requests == 20
+    assert stub_server.connections == 1
+
+
+def test_concurrent_requests_stay_within_the_pool(stub_server):
+    client = _client_for(stub_server, pool_size=4)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: client.get({"action": "query", "list": "random"}), range(40)))
+    finally:
+        client.close()
+    assert len(results) == 40
+    assert stub_server.requests == 40
+    assert stub_server.connections <= 4
+
+
+def test_get_client_returns_one_shared_client():
+    wiki_api.set_client(None)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = set(map(id, executor.map(lambda _: wiki_api.get_client(), range(32))))
+        assert len(clients) == 1
+    finally:
+        wiki_api.set_client(None)
+
+
+def _extract_pieces():
+    """Every fixture extract as whole paragraphs, lines and rough sentences, markup included."""
+    pieces = []
+    for _, extract in benchmarks.load_extracts():
+        pieces.append(extract)
+        pieces.extend(extract.split("\n\n"))
+        pieces.extend(extract.splitlines())
+        pieces.extend(re.split(r"(?<=[.!?])\s+", extract))
+    return pieces
+
+
+def test_extract_fixture_is_long_and_varied():
+    extracts = [extract for _, extract in benchmarks.load_extracts()]
+    assert len(extracts) >= 15
+    assert sum(map(len, extracts)) > 20000
+    for marker in ("[[", "{{", "<ref", "==", "\n*"):
+        assert any(marker in extract for extract in extracts)
+
+
+def test_clean_sentences_match_legacy_cleaner():
+    pieces = _extract_pieces()
+    assert wiki_api.clean_sentences(pieces) == benchmarks._legacy_clean_sentences(pieces)
+
+
+def test_clean_and_filter_match_legacy_pipeline():
+    pieces = _extract_pieces()
+    expected = benchmarks._legacy_filter(benchmarks._legacy_clean_sentences(pieces))
+    assert expected
+    assert wiki_api.clean_and_filter_sentences(pieces) == expected
+
+
+@pytest.fixture
+def replay_recording():
+    """Recording of the fixture extracts, filed under the first spooky categories."""
+    fixture = wiki_replay.Recording.load(benchmarks.EXTRACTS_PATH)
+    categories = wiki_api.load_categories_from_json(wiki_api.CATEGORY_JSON_PATH)[:3]
+    yield lambda: wiki_replay.Recording(fixture.pages, {category: list(fixture.pages) for category in categories})
+    wiki_api.set_backend(None)
+    wiki_api.use_memory_caches()
+
+
+def _replay_pages(recording, seed, count=3):
+    wiki_api.set_backend(wiki_api.ReplayBackend(seed))
+    wiki_api.set_client(wiki_replay.ReplayClient(recording))
+    wiki_api.use_memory_caches()
+    return [wiki_api.get_valid_wikipedia_page(spooky=True)[0] for _ in range(count)]
+
+
+def test_replay_repeats_the_same_pages(replay_recording):
+    first = _replay_pages(replay_recording(), seed=None)
+    assert _replay_pages(replay_recording(), seed=None) == first
+    assert _replay_pages(replay_recording(), seed=7) == _replay_pages(replay_recording(), seed=7)
+
+
+def test_unknown_backend_is_refused():
+    with pytest.raises(ValueError):
+        wiki_api.create_backend("dump")
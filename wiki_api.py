@@ -3,20 +3,77 @@ import pickle
 import json
 import time
 import random
+import math
 import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+
 import requests
-import nltk
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import category_index
+import local_corpus
+import page_cache
+import request_scheduler
+import sentence_corpus
+import wiki_replay
 
 # Constants
-WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
+WIKIPEDIA_API_URL = os.getenv("WIKI_API_URL", "https://en.wikipedia.org/w/api.php")  # or a wiki_replay.py stub
 NLTK_DATA_PATH = './data/nltk_data'
 PUNKT_MODEL_PATH = os.path.join(NLTK_DATA_PATH, 'tokenizers', 'punkt', 'english.pickle')
 CATEGORY_JSON_PATH = 'data/spooky_categories.json'
 MINIMUM_SENTENCE_COUNT = 3
 MIN_SENTENCE_LENGTH = 100
+MAX_LIE_SENTENCE_LENGTH = 300
+ROUND_WINDOW = 6  # rounds are built from the first sentences of an article
+REQUEST_TIMEOUT = 10  # seconds
+POOL_SIZE = 10
+EXTRACT_BATCH_SIZE = 20  # MediaWiki's exlimit for intro extracts
+CANDIDATE_BATCH_SIZE = 10  # candidate pages fetched per batch
+CATEGORY_PAGE_SIZE = 500  # cmlimit maximum per request
+MAX_CATEGORY_MEMBERS = 5000
+SPARE_PAGE_LIMIT = 20  # qualifying pages kept for later rounds
+RACE_WIDTH = 3  # candidate batches fetched concurrently per page
+MAX_PAGE_ATTEMPTS = 10  # candidate rounds before falling back to cached or local content
+RATE_LIMIT = float(os.getenv("WIKI_RATE_LIMIT", "10"))  # requests per second shared by all sessions
+RATE_BURST = 20
+MAXLAG = 5  # seconds of replication lag after which Wikipedia asks bots to back off
+# "live", "record" / "replay" (wiki_replay.py), "local" (wiki_dump.py) or "compact" (sentence_corpus.py)
+CONTENT_BACKEND = os.getenv("WIKI_BACKEND", "live")
+REPLAY_LATENCY = float(os.getenv("WIKI_REPLAY_LATENCY", "0"))  # seconds added per replayed request
+GAME_SEED = os.getenv("GAME_SEED")  # seeds page picks, sentence choice and lie placement, see ContentBackend
+USER_AGENT = "BeyondBeliefGame/1.0 (https://github.com/alina-marcus/beyond_belief_game_v1)"
+# Errors that mean "no answer from Wikipedia right now"
+REQUEST_ERRORS = (requests.RequestException, request_scheduler.ThrottledError, request_scheduler.CircuitOpenError)
+
+# Sentence cleaning and filtering
+FORBIDDEN_CHARACTERS = "{}[]|=*<>"
+_MARKUP_MARKER_RE = re.compile(r'==|\[\[|\]\]|\{\{|<ref')
+_MARKUP_PATTERNS = (
+    re.compile(r'\=\=.*?\=\='),
+    re.compile(r'\[\[|\]\]'),
+    re.compile(r'\{\{.*?\}\}'),
+    re.compile(r'<ref.*?>.*?</ref>'),
+)
+_ASCII_LETTER_RE = re.compile(r'[a-zA-Z]')
+_DIGIT_RE = re.compile(r'\d')
+
+# Process-wide tokenizer registry, keyed by model path
+_tokenizers = {}
+_tokenizer_lock = threading.Lock()
 
-# Ensure NLTK uses the local data path
-nltk.data.path.append(NLTK_DATA_PATH)
+# Qualifying pages left over from earlier batches, per spooky flag
+_spare_pages = {
+    True: deque(maxlen=SPARE_PAGE_LIMIT),
+    False: deque(maxlen=SPARE_PAGE_LIMIT),
+}
+
+
+class PageUnavailableError(RuntimeError):
+    """Raised when Wikipedia is unavailable and no cached or local page can stand in."""
 
 
 def load_categories_from_json(filepath):
@@ -34,6 +91,325 @@ def load_categories_from_json(filepath):
     return data.get("categories", [])
 
 
+class WikiClient:
+    """
+    HTTP client for the MediaWiki API that reuses keep-alive connections.
+
+    All Wikipedia requests go through one pooled session, so a round does not
+    pay a fresh TCP/TLS handshake per call. Server errors are retried with
+    exponential backoff; throttling (429/503 and maxlag errors) is left to the
+    shared request scheduler, which pauses every session at once.
+
+    Args:
+        api_url (str): MediaWiki API endpoint.
+        pool_size (int): Maximum number of pooled connections per host.
+        timeout (float): Per-request timeout in seconds.
+        retries (int): Retry attempts for failed requests.
+        backoff_factor (float): Backoff multiplier between retries.
+    """
+
+    def __init__(self, api_url=WIKIPEDIA_API_URL, pool_size=POOL_SIZE, timeout=REQUEST_TIMEOUT,
+                 retries=3, backoff_factor=0.5):
+        self.api_url = api_url
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": USER_AGENT,
+        })
+
+    def get(self, params, timeout=None):
+        """
+        Performs a GET request against the API.
+
+        Args:
+            params (dict): Query parameters.
+            timeout (float, optional): Overrides the client timeout.
+
+        Returns:
+            dict: Decoded JSON response.
+
+        Raises:
+            requests.RequestException: If the request fails after all retries.
+            request_scheduler.ThrottledError: If Wikipedia kept asking to slow down.
+            request_scheduler.CircuitOpenError: If Wikipedia is considered unavailable.
+        """
+        return get_scheduler().call(self._request, dict(params, maxlag=MAXLAG), timeout)
+
+    def _request(self, params, timeout):
+        """Performs one GET request, turning maxlag errors into ThrottledError."""
+        response = self.session.get(self.api_url, params=params, timeout=timeout or self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        error = data.get("error", {})
+        if error.get("code") == "maxlag":
+            retry_after = request_scheduler.parse_retry_after(response.headers.get("Retry-After"))
+            raise request_scheduler.ThrottledError(error.get("info", "maxlag"), retry_after)
+        return data
+
+    def close(self):
+        """Closes all pooled connections."""
+        self.session.close()
+
+
+_backend = None
+_client = None
+_client_lock = threading.Lock()
+_category_index = None
+_page_cache = None
+_local_corpus = None
+_sentence_corpus = None
+_sentence_corpus_unavailable = False  # set once opening the compact corpus failed
+_race_executor = None
+_race_batches = set()  # candidate batches still running, see wait_for_race_batches
+_race_batches_lock = threading.Lock()
+
+# Time-to-valid-page measurements of get_valid_wikipedia_page
+_latency_lock = threading.Lock()
+_page_latencies = deque(maxlen=1000)
+_latency_counters = {"spare_hits": 0}
+
+
+def get_scheduler():
+    """
+    Returns the request scheduler shared by all Wikipedia calls of the process.
+
+    Returns:
+        Scheduler: Rate limiter and circuit breaker for Wikipedia.
+    """
+    return request_scheduler.get_scheduler("wikipedia", RATE_LIMIT, RATE_BURST)
+
+
+class ContentBackend:
+    """
+    Where wiki_api gets its pages from: the live MediaWiki API at WIKIPEDIA_API_URL.
+
+    Subclasses swap the API client, serve pages from a local corpus first or
+    keep the caches off disk. One backend is chosen per process from
+    WIKI_BACKEND, see get_backend.
+
+    Its random generator drives every game-level choice (candidate pages,
+    round sentences and lie placement), so seeding it reproduces a run.
+
+    Args:
+        seed (int | str, optional): Seed of the game-level random generator; None seeds from the OS.
+    """
+
+    name = "live"
+    persistent_caches = True  # category and page caches survive in data/
+    race_width = RACE_WIDTH  # candidate batches raced per page, see get_valid_wikipedia_page
+
+    def __init__(self, seed=None):
+        self.random = random.Random(seed)
+
+    def create_client(self):
+        """Creates the client every API request goes through."""
+        return WikiClient()
+
+    def random_page(self, spooky=False):
+        """
+        Picks a playable page without asking the API.
+
+        Args:
+            spooky (bool): If True, only pages tagged with a spooky category are used.
+
+        Returns:
+            tuple | None: (title, sentences, lie-eligible indices), or None to fetch a page from the API.
+        """
+        return None
+
+    def fallback_page(self, spooky=False):
+        """
+        Picks a page from a local corpus for when Wikipedia is unavailable.
+
+        The local corpus or the compact sentence corpus is used if one was built.
+
+        Args:
+            spooky (bool): If True, only pages tagged with a spooky category are used.
+
+        Returns:
+            tuple | None: (title, sentences, lie-eligible indices) or None if no corpus has a match.
+        """
+        categories = load_categories_from_json(CATEGORY_JSON_PATH) if spooky else None
+        if os.path.exists(local_corpus.LOCAL_CORPUS_PATH):
+            page = get_local_corpus().random_page(categories, self.random)
+            if page is not None:
+                return page
+        if os.path.exists(sentence_corpus.SENTENCE_CORPUS_PATH):
+            corpus = get_sentence_corpus()
+            return corpus.random_page(categories, self.random) if corpus else None
+        return None
+
+
+class ReplayBackend(ContentBackend):
+    """
+    Answers every request from data/wiki_recording.json without any network access.
+
+    Caches stay in memory and local corpora are never used, so a replay only
+    depends on the recording. Candidate batches are fetched one at a time and
+    the random generator defaults to a fixed seed, so replays repeat exactly.
+    """
+
+    name = "replay"
+    persistent_caches = False
+    race_width = 1  # racing threads would draw recorded titles in scheduling order
+
+    def __init__(self, seed=None):
+        super().__init__(wiki_replay.DEFAULT_SEED if seed is None else seed)
+
+    def create_client(self):
+        return wiki_replay.ReplayClient(wiki_replay.Recording.load(), REPLAY_LATENCY)
+
+    def fallback_page(self, spooky=False):
+        return None
+
+
+class RecordBackend(ReplayBackend):
+    """Queries Wikipedia and extends data/wiki_recording.json with every response."""
+
+    name = "record"
+
+    def create_client(self):
+        path = wiki_replay.RECORDING_PATH
+        recording = wiki_replay.Recording.load(path) if os.path.exists(path) else wiki_replay.Recording()
+        return wiki_replay.RecordingClient(WikiClient(), recording, path)
+
+
+class LocalCorpusBackend(ContentBackend):
+    """Serves pages from the SQLite local corpus (wiki_dump.py), using the API only when it has no match."""
+
+    name = "local"
+
+    def random_page(self, spooky=False):
+        categories = load_categories_from_json(CATEGORY_JSON_PATH) if spooky else None
+        page = get_local_corpus().random_page(categories, self.random)
+        if page is None:
+            print("Local corpus has no matching page, falling back to the live API.")
+        return page
+
+
+class CompactCorpusBackend(ContentBackend):
+    """Serves pages from the memory-mapped corpus (sentence_corpus.py), using the API only when it has no match."""
+
+    name = "compact"
+
+    def random_page(self, spooky=False):
+        corpus = get_sentence_corpus()
+        if corpus is None:  # a missing file was reported once
+            return None
+        page = corpus.random_page(load_categories_from_json(CATEGORY_JSON_PATH) if spooky else None, self.random)
+        if page is None:
+            print("Compact corpus has no matching page, falling back to the live API.")
+        return page
+
+
+BACKENDS = {backend.name: backend for backend in
+            (ContentBackend, ReplayBackend, RecordBackend, LocalCorpusBackend, CompactCorpusBackend)}
+
+
+def create_backend(name=None, seed=None):
+    """
+    Creates a content backend by name.
+
+    Args:
+        name (str, optional): One of BACKENDS, CONTENT_BACKEND by default.
+        seed (int | str, optional): Seed of the game-level random generator, GAME_SEED by default.
+
+    Returns:
+        ContentBackend: New backend.
+
+    Raises:
+        ValueError: If the name is not a known backend.
+    """
+    name = name or CONTENT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown content backend '{name}', expected one of {', '.join(BACKENDS)}.")
+    return BACKENDS[name](GAME_SEED if seed is None else seed)
+
+
+def get_backend():
+    """
+    Returns the content backend of the process, choosing it on first use.
+
+    Returns:
+        ContentBackend: Shared backend.
+    """
+    global _backend
+    if _backend is None:
+        with _client_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
+
+
+def set_backend(backend):
+    """
+    Replaces the content backend, e.g. to replay a run with another seed.
+
+    The shared client is dropped, so the next request uses the new backend's client.
+
+    Args:
+        backend (ContentBackend): New backend.
+    """
+    global _backend
+    with _client_lock:
+        _backend = backend
+    set_client(None)
+
+
+def create_client(backend=None):
+    """
+    Creates the API client of a content backend.
+
+    Args:
+        backend (str, optional): Backend name; the shared backend by default.
+
+    Returns:
+        WikiClient | ReplayClient | RecordingClient: Client with a WikiClient-compatible get().
+    """
+    return (create_backend(backend) if backend else get_backend()).create_client()
+
+
+def get_client():
+    """
+    Returns the shared API client of the configured backend, creating it on first use.
+
+    Returns:
+        WikiClient: Shared client.
+    """
+    global _client
+    if _client is None:
+        backend = get_backend()  # outside the lock, which get_backend takes itself
+        with _client_lock:
+            if _client is None:
+                _client = backend.create_client()
+    return _client
+
+
+def set_client(client):
+    """
+    Replaces the shared WikiClient, e.g. to point it at another endpoint.
+
+    Args:
+        client (WikiClient): New shared client.
+    """
+    global _client
+    with _client_lock:
+        old_client, _client = _client, client
+    if old_client is not None and old_client is not client:
+        old_client.close()
+
+
 def fetch_random_wikipedia_title():
     """
     Fetches a random Wikipedia article title.
@@ -49,61 +425,115 @@ def fetch_random_wikipedia_title():
             "rnnamespace": 0,
             "format": "json"
         }
-        response = requests.get(WIKIPEDIA_API_URL, params=params)
-        return response.json()["query"]["random"][0]["title"]
+        return get_client().get(params)["query"]["random"][0]["title"]
     except Exception as e:
         print(f"Error fetching random title: {e}")
         return None
 
 
-def fetch_random_page_from_category(category, limit=10, retries=3, backoff_factor=1):
+def fetch_random_wikipedia_titles(count):
+    """
+    Fetches several random Wikipedia article titles in one request.
+
+    Args:
+        count (int): Number of titles to fetch.
+
+    Returns:
+        list: Title strings (empty on failure).
+    """
+    params = {
+        "action": "query",
+        "list": "random",
+        "rnlimit": count,
+        "rnnamespace": 0,
+        "format": "json"
+    }
+    try:
+        return [page["title"] for page in get_client().get(params)["query"]["random"]]
+    except Exception as e:
+        print(f"Error fetching random titles: {e}")
+        return []
+
+
+def fetch_category_members(category, limit=MAX_CATEGORY_MEMBERS):
     """
-    Fetches a random page title from a specific Wikipedia category.
+    Fetches the page titles of a Wikipedia category, following cmcontinue paging.
 
     Args:
         category (str): Category name.
-        limit (int): Number of pages to fetch.
-        retries (int): Number of retry attempts on failure.
-        backoff_factor (float): Time multiplier for exponential backoff.
+        limit (int): Maximum number of titles to collect.
 
     Returns:
-        str | None: Random page title or None if failed.
+        list | None: Page titles (empty if none were found), or None if a request failed.
     """
     params = {
         "action": "query",
         "list": "categorymembers",
         "cmtitle": f"Category:{category}",
-        "cmlimit": limit,
+        "cmlimit": min(limit, CATEGORY_PAGE_SIZE),
         "cmtype": "page",
         "format": "json"
     }
 
-    for attempt in range(retries):
+    titles = []
+    while len(titles) < limit:
         try:
-            response = requests.get(WIKIPEDIA_API_URL, params=params, timeout=10)
-            response.raise_for_status()
-            members = response.json().get("query", {}).get("categorymembers", [])
-            if not members:
-                print(f"No pages found in category: {category}")
-                return None
-            return random.choice(members)["title"]
-        except requests.RequestException as e:
-            wait_time = backoff_factor * (2 ** attempt)
-            print(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait_time:.1f}s...")
-            time.sleep(wait_time)
-
-    print(f"Failed to fetch from category '{category}' after {retries} attempts.")
-    return None
+            data = get_client().get(params)
+        except REQUEST_ERRORS as e:
+            print(f"Failed to fetch from category '{category}': {e}")
+            return None
+
+        titles.extend(member["title"] for member in data.get("query", {}).get("categorymembers", []))
+        if "continue" not in data:
+            break
+        params.update(data["continue"])
+
+    if not titles:
+        print(f"No pages found in category: {category}")
+    return titles[:limit]
+
+
+def get_category_index():
+    """
+    Returns the shared category index, loading it on first use.
+
+    The record and replay backends keep it in memory only, so every category
+    is requested from (and therefore recorded in or replayed from) the API.
+
+    Returns:
+        CategoryIndex: Shared index backed by fetch_category_members.
+    """
+    global _category_index
+    if _category_index is None:
+        with _client_lock:
+            if _category_index is None:
+                path = category_index.CATEGORY_CACHE_PATH if get_backend().persistent_caches else None
+                _category_index = category_index.CategoryIndex(fetch_category_members, path=path)
+    return _category_index
+
+
+def fetch_random_page_from_category(category):
+    """
+    Picks a random page title from a specific Wikipedia category.
+
+    Category members are served from the local category index and only
+    downloaded when missing or expired.
+
+    Args:
+        category (str): Category name.
+
+    Returns:
+        str | None: Random page title or None if failed.
+    """
+    return get_category_index().random_member(category)
 
 
-def fetch_wikipedia_page_content(title, retries=3, backoff_factor=1):
+def fetch_wikipedia_page_content(title):
     """
     Fetches plaintext content of a Wikipedia page.
 
     Args:
         title (str): Wikipedia article title.
-        retries (int): Retry attempts on failure.
-        backoff_factor (float): Backoff multiplier for delay.
 
     Returns:
         str | None: Plaintext content or None if failed.
@@ -116,35 +546,188 @@ def fetch_wikipedia_page_content(title, retries=3, backoff_factor=1):
         "format": "json"
     }
 
-    for attempt in range(retries):
+    try:
+        pages = get_client().get(params).get("query", {}).get("pages", {})
+        return next(iter(pages.values())).get("extract", "")
+    except REQUEST_ERRORS as e:
+        print(f"Failed to fetch content for page '{title}': {e}")
+    except Exception as e:
+        print(f"Unexpected error fetching '{title}': {e}")
+    return None
+
+
+def fetch_wikipedia_pages_content(titles):
+    """
+    Fetches plaintext extracts for many Wikipedia pages with as few requests as possible.
+
+    MediaWiki only returns several extracts per request for the lead section
+    (exintro), so this fetches article intros, up to EXTRACT_BATCH_SIZE
+    titles per request.
+
+    Args:
+        titles (list): Wikipedia article titles.
+
+    Returns:
+        dict: Mapping of page title to plaintext intro. Missing pages and failed
+            batches are left out.
+    """
+    contents = {}
+    for start in range(0, len(titles), EXTRACT_BATCH_SIZE):
+        batch = titles[start:start + EXTRACT_BATCH_SIZE]
+        params = {
+            "action": "query",
+            "prop": "extracts",
+            "explaintext": True,
+            "exintro": True,
+            "exlimit": len(batch),
+            "titles": "|".join(batch),
+            "format": "json"
+        }
         try:
-            response = requests.get(WIKIPEDIA_API_URL, params=params, timeout=10)
-            response.raise_for_status()
-            pages = response.json().get("query", {}).get("pages", {})
-            return next(iter(pages.values())).get("extract", "")
-        except requests.RequestException as e:
-            wait_time = backoff_factor * (2 ** attempt)
-            print(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait_time:.1f}s...")
-            time.sleep(wait_time)
-        except Exception as e:
-            print(f"Unexpected error fetching '{title}': {e}")
-            return None
+            pages = get_client().get(params).get("query", {}).get("pages", {})
+        except REQUEST_ERRORS as e:
+            print(f"Failed to fetch content for {len(batch)} pages: {e}")
+            continue
 
-    print(f"Failed to fetch content for page '{title}' after {retries} attempts.")
-    return None
+        for page in pages.values():
+            if page.get("extract"):
+                contents[page["title"]] = page["extract"]
+    return contents
+
+
+def get_page_cache():
+    """
+    Returns the shared page cache, creating it on first use.
+
+    The record and replay backends skip the SQLite tier, so pages cached by
+    earlier runs neither go missing from a recording nor leak into a replay.
+
+    Returns:
+        PageCache: Shared cache of filtered page sentences.
+    """
+    global _page_cache
+    if _page_cache is None:
+        with _client_lock:
+            if _page_cache is None:
+                path = page_cache.PAGE_CACHE_PATH if get_backend().persistent_caches else None
+                _page_cache = page_cache.PageCache(path=path)
+    return _page_cache
+
+
+def use_memory_caches():
+    """
+    Starts over with empty in-memory category and page caches and no spare pages.
+
+    Used when recording, so that every request needed for a round reaches the
+    API regardless of what earlier runs left in data/.
+    """
+    global _category_index, _page_cache
+    with _client_lock:
+        _category_index = category_index.CategoryIndex(fetch_category_members, path=None)
+        _page_cache = page_cache.PageCache(path=None)
+    for spare_pages in _spare_pages.values():
+        spare_pages.clear()
+
+
+def set_page_cache(cache):
+    """
+    Replaces the shared page cache, e.g. with an in-memory one for benchmarks.
+
+    Args:
+        cache (PageCache): New shared cache.
+    """
+    global _page_cache
+    with _client_lock:
+        _page_cache = cache
+
+
+def fetch_valid_pages(titles):
+    """
+    Fetches many pages in bulk and keeps those that can be played.
+
+    Cached pages are served locally and titles known to be unusable are
+    skipped; only the remaining titles are requested. Pages without enough
+    sentences or without a lie-eligible sentence are rejected here, before
+    any lie is generated for them.
 
+    Args:
+        titles (list): Candidate article titles.
 
-def load_tokenizer():
+    Returns:
+        list: (title, sentences, lie_candidates) tuples for every playable page.
+    """
+    cache = get_page_cache()
+    valid_pages = []
+    to_fetch = []
+    for title in titles:
+        if cache.is_rejected(title):
+            continue
+        sentences = cache.get(title)
+        if sentences is None:
+            to_fetch.append(title)
+            continue
+        lie_candidates = lie_candidate_indices(sentences)
+        if is_page_playable(sentences, lie_candidates):
+            valid_pages.append((title, sentences, lie_candidates))
+        else:
+            cache.reject(title)
+
+    if to_fetch:
+        for title, content in fetch_wikipedia_pages_content(to_fetch).items():
+            sentences = extract_sentences(content)
+            lie_candidates = lie_candidate_indices(sentences)
+            if is_page_playable(sentences, lie_candidates):
+                cache.put(title, sentences)
+                valid_pages.append((title, sentences, lie_candidates))
+            else:
+                cache.reject(title)
+    return valid_pages
+
+
+def load_tokenizer(path=PUNKT_MODEL_PATH):
     """
     Loads the NLTK Punkt tokenizer from local storage.
 
+    NLTK is imported here rather than at module level: it takes longer to
+    import than the rest of the game, and rounds served from a local corpus
+    or the round pool never split text.
+
+    Args:
+        path (str): Path to the pickled Punkt model.
+
     Returns:
         PunktSentenceTokenizer: Loaded tokenizer object.
     """
-    with open(PUNKT_MODEL_PATH, 'rb') as f:
+    import nltk
+
+    if NLTK_DATA_PATH not in nltk.data.path:
+        nltk.data.path.append(NLTK_DATA_PATH)  # Ensure NLTK uses the local data path
+    with open(path, 'rb') as f:
         return pickle.load(f)
 
 
+def get_tokenizer(path=PUNKT_MODEL_PATH):
+    """
+    Returns the shared Punkt tokenizer, loading it on first use.
+
+    The model is unpickled once per process; concurrent callers wait for
+    the first load instead of loading their own copy.
+
+    Args:
+        path (str): Path to the pickled Punkt model.
+
+    Returns:
+        PunktSentenceTokenizer: Shared tokenizer object.
+    """
+    tokenizer = _tokenizers.get(path)
+    if tokenizer is None:
+        with _tokenizer_lock:
+            tokenizer = _tokenizers.get(path)
+            if tokenizer is None:
+                tokenizer = _tokenizers[path] = load_tokenizer(path)
+    return tokenizer
+
+
 def divide_sentences(text):
     """
     Splits text into sentences using the Punkt tokenizer.
@@ -155,8 +738,26 @@ def divide_sentences(text):
     Returns:
         list: List of sentence strings.
     """
-    tokenizer = load_tokenizer()
-    return tokenizer.tokenize(text)
+    return get_tokenizer().tokenize(text)
+
+
+def clean_sentence(sentence):
+    """
+    Removes Wikipedia-specific markup and artifacts from a single sentence.
+
+    Sentences without any markup marker skip the regex passes entirely; the
+    passes only run, in their original order, when one is present.
+
+    Args:
+        sentence (str): Raw sentence.
+
+    Returns:
+        str: Cleaned sentence.
+    """
+    if _MARKUP_MARKER_RE.search(sentence):
+        for pattern in _MARKUP_PATTERNS:
+            sentence = pattern.sub('', sentence)
+    return sentence.replace('\n', ' ').strip()
 
 
 def clean_sentences(sentences):
@@ -169,15 +770,28 @@ def clean_sentences(sentences):
     Returns:
         list: Cleaned sentence list.
     """
-    cleaned = []
-    for s in sentences:
-        s = re.sub(r'\=\=.*?\=\=', '', s)
-        s = re.sub(r'\[\[|\]\]', '', s)
-        s = re.sub(r'\{\{.*?\}\}', '', s)
-        s = re.sub(r'<ref.*?>.*?</ref>', '', s)
-        s = s.replace('\n', ' ')
-        cleaned.append(s.strip())
-    return cleaned
+    return [clean_sentence(s) for s in sentences]
+
+
+def is_linguistically_normal(sentence):
+    """
+    Checks that a cleaned sentence is long, word-like and free of markup characters.
+
+    Cheap length and character checks run before the word split.
+
+    Args:
+        sentence (str): Cleaned sentence.
+
+    Returns:
+        bool: True if the sentence is usable.
+    """
+    return (
+        len(sentence) > MIN_SENTENCE_LENGTH
+        and sentence.count('.') <= 3
+        and not any(char in sentence for char in FORBIDDEN_CHARACTERS)
+        and _ASCII_LETTER_RE.search(sentence) is not None
+        and len(sentence.split()) >= 4
+    )
 
 
 def filter_linguistically_normal_nltk(sentences):
@@ -190,14 +804,105 @@ def filter_linguistically_normal_nltk(sentences):
     Returns:
         list: Filtered sentence list.
     """
-    return [
-        s.strip() for s in sentences
-        if len(s) > MIN_SENTENCE_LENGTH
-           and len(s.split()) >= 4
-           and not re.match(r'^[^a-zA-Z]+$', s)
-           and not any(char in s for char in "{}[]|=*<>")
-           and s.count('.') <= 3
-    ]
+    return [s.strip() for s in sentences if is_linguistically_normal(s)]
+
+
+def clean_and_filter_sentences(sentences):
+    """
+    Cleans and filters raw sentences in a single pass.
+
+    Equivalent to filter_linguistically_normal_nltk(clean_sentences(sentences))
+    without building the intermediate list.
+
+    Args:
+        sentences (list): Raw sentence list.
+
+    Returns:
+        list: Usable sentences.
+    """
+    usable = []
+    for s in sentences:
+        s = clean_sentence(s)
+        if is_linguistically_normal(s):
+            usable.append(s)
+    return usable
+
+
+def extract_sentences(text):
+    """
+    Runs plaintext through the full sentence pipeline: split, clean, filter.
+
+    Args:
+        text (str): Plaintext article content.
+
+    Returns:
+        list: Usable sentences.
+    """
+    return clean_and_filter_sentences(divide_sentences(text))
+
+
+def extract_sentences_batch(texts):
+    """
+    Runs many articles through the sentence pipeline.
+
+    Args:
+        texts (iterable): Plaintext article contents.
+
+    Returns:
+        list: One list of usable sentences per article.
+    """
+    tokenize = get_tokenizer().tokenize
+    return [clean_and_filter_sentences(tokenize(text)) for text in texts]
+
+
+def is_lie_eligible(sentence):
+    """
+    Checks whether a sentence may be replaced by a lie.
+
+    Sentences with digits or "=" are avoided, and overly long ones make
+    the lie easy to spot.
+
+    Args:
+        sentence (str): Filtered sentence.
+
+    Returns:
+        bool: True if a lie can be generated from the sentence.
+    """
+    return (
+        len(sentence) <= MAX_LIE_SENTENCE_LENGTH
+        and '=' not in sentence
+        and _DIGIT_RE.search(sentence) is None
+    )
+
+
+def lie_candidate_indices(sentences):
+    """
+    Indexes the sentences of a page that can be turned into the lie of a round.
+
+    Only the first ROUND_WINDOW sentences are considered, as rounds are
+    built from the opening of the article.
+
+    Args:
+        sentences (list): Filtered sentences.
+
+    Returns:
+        list: Indices of lie-eligible sentences.
+    """
+    return [i for i, sentence in enumerate(sentences[:ROUND_WINDOW]) if is_lie_eligible(sentence)]
+
+
+def is_page_playable(sentences, lie_candidates):
+    """
+    Checks that a page has enough sentences and at least one lie-eligible one.
+
+    Args:
+        sentences (list): Filtered sentences.
+        lie_candidates (list): Result of lie_candidate_indices.
+
+    Returns:
+        bool: True if a round can be built from the page.
+    """
+    return is_sentence_appropriate(sentences) and bool(lie_candidates)
 
 
 def is_sentence_appropriate(sentences):
@@ -213,39 +918,301 @@ def is_sentence_appropriate(sentences):
     return len(sentences) >= MINIMUM_SENTENCE_COUNT
 
 
-def get_valid_wikipedia_page_info(spooky=False):
+def fetch_candidate_titles(spooky, categories, count=CANDIDATE_BATCH_SIZE):
     """
-    Fetches a valid Wikipedia page and its content, optionally from a spooky category.
+    Picks a batch of candidate article titles.
+
+    Args:
+        spooky (bool): If True, samples pages from one random spooky category.
+        categories (list): Spooky category names.
+        count (int): Number of candidates.
+
+    Returns:
+        list: Candidate titles (may be empty on failure).
+    """
+    if not spooky:
+        return fetch_random_wikipedia_titles(count)
+    rng = get_backend().random
+    return get_category_index().sample(rng.choice(categories), count, rng)
+
+
+def fetch_candidate_pages(spooky, categories, cancelled=None):
+    """
+    Fetches one batch of candidate titles and returns its playable pages.
+
+    Args:
+        spooky (bool): If True, samples pages from a random spooky category.
+        categories (list): Spooky category names.
+        cancelled (threading.Event, optional): Once set, the page contents are no longer fetched.
+
+    Returns:
+        list: (title, sentences, lie_candidates) tuples, possibly empty.
+    """
+    titles = fetch_candidate_titles(spooky, categories)
+    if not titles or (cancelled is not None and cancelled.is_set()):
+        return []
+    return fetch_valid_pages(titles)
+
+
+def _get_race_executor():
+    """Returns the shared thread pool used for racing candidate batches."""
+    global _race_executor
+    if _race_executor is None:
+        with _client_lock:
+            if _race_executor is None:
+                _race_executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="wiki-race")
+    return _race_executor
+
+
+def race_candidate_pages(spooky, categories, width=RACE_WIDTH):
+    """
+    Fetches several candidate batches concurrently and returns the first playable result.
+
+    Batches that have not started yet are cancelled once a winner is found.
+    Batches already in flight finish the request they are waiting for but
+    send no further ones; wait_for_race_batches joins them.
+
+    Args:
+        spooky (bool): If True, samples pages from random spooky categories.
+        categories (list): Spooky category names.
+        width (int): Number of concurrent batches.
+
+    Returns:
+        list: (title, sentences, lie_candidates) tuples from the winning batch, or
+            an empty list if no batch produced a playable page.
+    """
+    executor = _get_race_executor()
+    cancelled = threading.Event()
+    futures = [executor.submit(fetch_candidate_pages, spooky, categories, cancelled) for _ in range(width)]
+    with _race_batches_lock:
+        _race_batches.update(futures)
+    for future in futures:
+        future.add_done_callback(_forget_race_batch)
+    try:
+        for future in as_completed(futures):
+            try:
+                pages = future.result()
+            except Exception as e:
+                print(f"Candidate batch failed: {e}")
+                continue
+            if pages:
+                return pages
+        return []
+    finally:
+        cancelled.set()
+        for future in futures:
+            future.cancel()
+
+
+def _forget_race_batch(future):
+    """Drops a finished candidate batch from the running set."""
+    with _race_batches_lock:
+        _race_batches.discard(future)
+
+
+def wait_for_race_batches(timeout=None):
+    """
+    Waits for candidate batches that lost a race and are still finishing.
+
+    Call this before shutting down the API endpoint or client, so no batch
+    sends a request to it afterwards.
+
+    Args:
+        timeout (float, optional): Seconds to wait at most; None waits until all are done.
+
+    Returns:
+        bool: True if no batch is running any more.
+    """
+    with _race_batches_lock:
+        running = list(_race_batches)
+    return not wait(running, timeout).not_done
+
+
+def _percentile(sorted_values, fraction):
+    """Returns the nearest-rank percentile of an already sorted list."""
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def get_page_latency_stats():
+    """
+    Reports how long get_valid_wikipedia_page took to find a playable page.
+
+    Only calls that had to go to the network are timed; pages served from
+    the spare buffer are counted separately.
+
+    Returns:
+        dict: count, p50 and p95 in seconds, and spare_hits.
+    """
+    with _latency_lock:
+        latencies = sorted(_page_latencies)
+        spare_hits = _latency_counters["spare_hits"]
+    if not latencies:
+        return {"count": 0, "p50": None, "p95": None, "spare_hits": spare_hits}
+    return {
+        "count": len(latencies),
+        "p50": _percentile(latencies, 0.50),
+        "p95": _percentile(latencies, 0.95),
+        "spare_hits": spare_hits,
+    }
+
+
+def reset_page_latency_stats():
+    """Forgets all time-to-valid-page measurements, e.g. between benchmark runs."""
+    with _latency_lock:
+        _page_latencies.clear()
+        _latency_counters["spare_hits"] = 0
+
+
+def get_local_corpus():
+    """
+    Returns the shared local article corpus, opening it on first use.
+
+    Returns:
+        LocalCorpus: Corpus built by wiki_dump.py.
+    """
+    global _local_corpus
+    if _local_corpus is None:
+        with _client_lock:
+            if _local_corpus is None:
+                _local_corpus = local_corpus.LocalCorpus()
+    return _local_corpus
+
+
+def get_sentence_corpus():
+    """
+    Returns the shared memory-mapped sentence corpus, mapping it on first use.
+
+    A missing or unreadable corpus file is reported once; later calls return
+    None without trying again.
+
+    Returns:
+        SentenceCorpus | None: Corpus written by sentence_corpus.py, or None if it cannot be opened.
+    """
+    global _sentence_corpus, _sentence_corpus_unavailable
+    if _sentence_corpus is None and not _sentence_corpus_unavailable:
+        with _client_lock:
+            if _sentence_corpus is None and not _sentence_corpus_unavailable:
+                try:
+                    _sentence_corpus = sentence_corpus.SentenceCorpus()
+                except (OSError, ValueError) as e:
+                    _sentence_corpus_unavailable = True
+                    print(f"Compact sentence corpus unavailable ({e}), using the live API instead.")
+    return _sentence_corpus
+
+
+def get_valid_wikipedia_page(spooky=False, race=None, spare=True):
+    """
+    Fetches a playable Wikipedia page, its sentences and its lie-eligible sentence indices.
+
+    Candidates are fetched and filtered in batches; with race > 1, that many
+    batches are raced against each other and the first playable one wins.
+    Playable pages that are not returned are kept for later calls, so
+    rejected and surplus candidates add no extra round trips.
+
+    Backends with a local corpus (WIKI_BACKEND=local or compact) serve their
+    own pages instead, and the live API is only used if the corpus has no match.
+
+    If no playable page turns up within MAX_PAGE_ATTEMPTS batches, or the
+    request scheduler's circuit breaker is open, a cached or local page is
+    served instead (see get_fallback_page).
 
     Args:
         spooky (bool): If True, uses spooky categories.
+        race (int, optional): Number of candidate batches fetched concurrently; the backend's race_width by default.
+        spare (bool): Use and refill the buffer of spare pages. Disabled to time the network path alone.
 
     Returns:
-        tuple: (title, list of sentences)
+        tuple: (title, list of sentences, list of lie-eligible indices)
+
+    Raises:
+        PageUnavailableError: If Wikipedia is unavailable and no fallback page exists.
     """
+    backend = get_backend()
+    page = backend.random_page(spooky)
+    if page is not None:
+        return page
+    race = backend.race_width if race is None else race
+
+    spare_pages = _spare_pages[spooky]
+    if spare and spare_pages:
+        try:
+            page = spare_pages.popleft()
+            with _latency_lock:
+                _latency_counters["spare_hits"] += 1
+            return page
+        except IndexError:  # taken by another thread meanwhile
+            pass
+
     categories = load_categories_from_json(CATEGORY_JSON_PATH) if spooky else []
+    started = time.perf_counter()
+    scheduler = get_scheduler()
+    for _ in range(MAX_PAGE_ATTEMPTS):
+        if scheduler.is_open():
+            break
+        if race > 1:
+            valid_pages = race_candidate_pages(spooky, categories, race)
+        else:
+            valid_pages = fetch_candidate_pages(spooky, categories)
+        if valid_pages:
+            with _latency_lock:
+                _page_latencies.append(time.perf_counter() - started)
+            backend.random.shuffle(valid_pages)
+            if spare:
+                spare_pages.extend(valid_pages[1:])
+            return valid_pages[0]
+        time.sleep(0.5)
 
-    while True:
-        title = (
-            fetch_random_page_from_category(random.choice(categories))
-            if spooky else fetch_random_wikipedia_title()
-        )
+    print("Wikipedia is unavailable, serving a cached page.")
+    page = get_fallback_page(spooky)
+    if page is None:
+        raise PageUnavailableError("Wikipedia is unavailable and there is no cached or local page to play.")
+    return page
 
-        if not title:
-            continue
 
-        content = fetch_wikipedia_page_content(title)
-        if not content:
-            continue
+def get_fallback_page(spooky=False, attempts=20):
+    """
+    Serves a playable page without the live API, for when Wikipedia is throttling or down.
+
+    The backend's fallback page is used if it has one (see ContentBackend.fallback_page),
+    otherwise a random page from the page cache. Cached pages are not tagged with categories, so they may
+    not be spooky.
 
-        sentences = divide_sentences(content)
-        sentences = clean_sentences(sentences)
-        sentences = filter_linguistically_normal_nltk(sentences)
+    Args:
+        spooky (bool): Prefer pages from spooky categories (local and compact corpus only).
+        attempts (int): Cached pages tried before giving up.
 
-        if is_sentence_appropriate(sentences):
-            return title, sentences
+    Returns:
+        tuple | None: (title, sentences, lie-eligible indices) or None if nothing can be served.
+    """
+    page = get_backend().fallback_page(spooky)
+    if page is not None:
+        return page
 
-        time.sleep(0.5)
+    cache = get_page_cache()
+    for _ in range(attempts):
+        cached = cache.random_page()
+        if cached is None:
+            return None
+        title, sentences = cached
+        lie_candidates = lie_candidate_indices(sentences)
+        if is_page_playable(sentences, lie_candidates):
+            return title, sentences, lie_candidates
+    return None
+
+
+def get_valid_wikipedia_page_info(spooky=False):
+    """
+    Fetches a valid Wikipedia page and its content, optionally from a spooky category.
+
+    Args:
+        spooky (bool): If True, uses spooky categories.
+
+    Returns:
+        tuple: (title, list of sentences)
+    """
+    title, sentences, _ = get_valid_wikipedia_page(spooky)
+    return title, sentences
 
 
 if __name__ == "__main__":
@@ -254,3 +1221,6 @@ if __name__ == "__main__":
     print(f"Sentences ({len(sentences)}):")
     for sentence in sentences:
         print(sentence)
+    print(f"Page cache: {get_page_cache().stats()}")
+    print(f"Time to valid page: {get_page_latency_stats()}")
+    print(f"Request scheduling: {request_scheduler.get_metrics()}")
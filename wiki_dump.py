@@ -0,0 +1,246 @@
+import argparse
+import bz2
+import gzip
+import json
+import os
+import re
+import xml.etree.ElementTree as ElementTree
+
+import local_corpus
+import wiki_api
+
+INSERT_BATCH_SIZE = 500  # pages written per transaction
+
+# Wikitext markup, removed or unwrapped in this order by wikitext_to_text
+_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+_REF_RE = re.compile(r'<ref[^>/]*/>|<ref[^>]*>.*?</ref>', re.DOTALL | re.IGNORECASE)
+_INNER_TEMPLATE_RE = re.compile(r'\{\{[^{}]*\}\}')
+_TABLE_RE = re.compile(r'\{\|.*?\|\}', re.DOTALL)
+_FILE_LINK_RE = re.compile(r'\[\[(?:File|Image):[^\[\]]*(?:\[\[[^\[\]]*\]\][^\[\]]*)*\]\]', re.IGNORECASE)
+_CATEGORY_RE = re.compile(r'\[\[Category:([^\]|]+)(?:\|[^\]]*)?\]\]', re.IGNORECASE)
+_PIPED_LINK_RE = re.compile(r'\[\[[^\]|]*\|([^\]]*)\]\]')
+_LINK_RE = re.compile(r'\[\[([^\]]*)\]\]')
+_EXTERNAL_LINK_RE = re.compile(r'\[https?://[^\s\]]+\s*([^\]]*)\]')
+_EMPHASIS_RE = re.compile(r"'{2,}")
+_TAG_RE = re.compile(r'<[^>]+>')
+_LIST_MARKER_RE = re.compile(r'^[*#:;]+\s*', re.MULTILINE)
+# Sections after which an article only holds references and links
+_TRAILING_SECTIONS_RE = re.compile(
+    r'^==\s*(?:See also|References|Notes|Further reading|External links|Bibliography)\s*==.*',
+    re.DOTALL | re.MULTILINE | re.IGNORECASE,
+)
+
+
+def wikitext_to_text(wikitext):
+    """
+    Converts wikitext into plaintext close to what the MediaWiki extracts API returns.
+
+    Section headings are kept as "== Heading ==" lines, which clean_sentences
+    removes later, like in live extracts.
+
+    Args:
+        wikitext (str): Raw article wikitext.
+
+    Returns:
+        tuple: (plaintext, list of category names)
+    """
+    categories = _CATEGORY_RE.findall(wikitext)
+    text = _COMMENT_RE.sub('', wikitext)
+    text = _REF_RE.sub('', text)
+    previous = None
+    while previous != text:  # templates nest, so strip innermost ones until none remain
+        previous = text
+        text = _INNER_TEMPLATE_RE.sub('', text)
+    text = _TABLE_RE.sub('', text)
+    text = _TRAILING_SECTIONS_RE.sub('', text)
+    text = _FILE_LINK_RE.sub('', text)
+    text = _CATEGORY_RE.sub('', text)
+    text = _PIPED_LINK_RE.sub(r'\1', text)
+    text = _LINK_RE.sub(r'\1', text)
+    text = _EXTERNAL_LINK_RE.sub(r'\1', text)
+    text = _EMPHASIS_RE.sub('', text)
+    text = _TAG_RE.sub('', text)
+    text = _LIST_MARKER_RE.sub('', text)
+    return text, [category.strip() for category in categories]
+
+
+def open_maybe_compressed(path, mode="rb"):
+    """
+    Opens a file, transparently decompressing .bz2 and .gz files.
+
+    Args:
+        path (str): File path.
+        mode (str): "rb" or "rt".
+
+    Returns:
+        file object: Readable stream.
+    """
+    if path.endswith(".bz2"):
+        return bz2.open(path, mode)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def iter_xml_dump(path):
+    """
+    Streams main-namespace articles from a MediaWiki XML dump.
+
+    Parsed pages are dropped from the tree as soon as they are read, so
+    memory stays bounded regardless of dump size. Redirects are skipped.
+
+    Args:
+        path (str): Dump file, optionally .bz2 or .gz compressed.
+
+    Yields:
+        tuple: (title, plaintext, categories)
+    """
+    with open_maybe_compressed(path) as file:
+        root = None
+        title = namespace = text = None
+        redirect = False
+        for event, element in ElementTree.iterparse(file, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = element
+                continue
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag == "title":
+                title = element.text
+            elif tag == "ns":
+                namespace = element.text
+            elif tag == "redirect":
+                redirect = True
+            elif tag == "text":
+                text = element.text or ""
+            elif tag == "page":
+                if namespace == "0" and not redirect and title and text:
+                    plaintext, categories = wikitext_to_text(text)
+                    yield title, plaintext, categories
+                title = namespace = text = None
+                redirect = False
+                root.clear()  # also drops the emptied page element from the root
+
+
+def iter_jsonl_extracts(path):
+    """
+    Streams articles from a JSON-lines extract file.
+
+    Each line is an object with "title", the plaintext in "extract" or
+    "text", and an optional "categories" list.
+
+    Args:
+        path (str): File path, optionally .bz2 or .gz compressed.
+
+    Yields:
+        tuple: (title, plaintext, categories)
+    """
+    with open_maybe_compressed(path, "rt") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            yield item["title"], item.get("extract") or item.get("text", ""), item.get("categories", [])
+
+
+def iter_text_directory(path):
+    """
+    Streams plaintext articles from a directory of .txt files.
+
+    The file name (without extension, underscores as spaces) is the title;
+    the name of the sub-directory a file sits in is used as its category.
+
+    Args:
+        path (str): Root directory.
+
+    Yields:
+        tuple: (title, plaintext, categories)
+    """
+    for directory, _, files in os.walk(path):
+        category = os.path.relpath(directory, path)
+        categories = [] if category == "." else [os.path.basename(directory)]
+        for name in sorted(files):
+            if not name.endswith(".txt"):
+                continue
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as file:
+                yield os.path.splitext(name)[0].replace("_", " "), file.read(), categories
+
+
+def iter_articles(source):
+    """
+    Picks the right reader for a dump file or directory.
+
+    Args:
+        source (str): XML dump, JSON-lines file or directory of .txt files.
+
+    Returns:
+        iterator: (title, plaintext, categories) tuples.
+    """
+    if os.path.isdir(source):
+        return iter_text_directory(source)
+    base = re.sub(r'\.(bz2|gz)$', '', source)
+    if base.endswith((".jsonl", ".json")):
+        return iter_jsonl_extracts(source)
+    return iter_xml_dump(source)
+
+
+def ingest(source, corpus, spooky_only=False, limit=None):
+    """
+    Runs articles through the sentence pipeline and stores the playable ones.
+
+    Args:
+        source (str): XML dump, JSON-lines file or directory of .txt files.
+        corpus (LocalCorpus): Destination corpus.
+        spooky_only (bool): Only keep pages in one of the spooky categories.
+        limit (int, optional): Stop after storing this many pages.
+
+    Returns:
+        tuple: (articles read, pages stored)
+    """
+    spooky = {local_corpus.normalize_category(c)
+              for c in wiki_api.load_categories_from_json(wiki_api.CATEGORY_JSON_PATH)}
+    read = stored = 0
+    batch = []
+
+    for title, text, categories in iter_articles(source):
+        read += 1
+        tags = [c for c in categories if local_corpus.normalize_category(c) in spooky]
+        if spooky_only and not tags:
+            continue
+
+        sentences = wiki_api.extract_sentences(text)
+        lie_candidates = wiki_api.lie_candidate_indices(sentences)
+        if not wiki_api.is_page_playable(sentences, lie_candidates):
+            continue
+
+        batch.append((title, sentences, lie_candidates, tags))
+        stored += 1
+        if len(batch) >= INSERT_BATCH_SIZE:
+            corpus.add_pages(batch)
+            batch = []
+            print(f"{read:,} articles read, {stored:,} pages stored")
+        if limit and stored >= limit:
+            break
+
+    if batch:
+        corpus.add_pages(batch)
+    return read, stored
+
+
+def main():
+    """Command-line entry point for building the local corpus."""
+    parser = argparse.ArgumentParser(description="Build the local Beyond Belief corpus from a Wikipedia dump.")
+    parser.add_argument("source", help="XML dump (.xml[.bz2|.gz]), JSON-lines extracts (.jsonl[.bz2|.gz]) "
+                                       "or a directory of .txt articles")
+    parser.add_argument("--db", default=local_corpus.LOCAL_CORPUS_PATH, help="path of the corpus database")
+    parser.add_argument("--spooky-only", action="store_true", help="only keep pages in spooky categories")
+    parser.add_argument("--limit", type=int, help="stop after storing this many pages")
+    args = parser.parse_args()
+
+    corpus = local_corpus.LocalCorpus(args.db)
+    read, stored = ingest(args.source, corpus, args.spooky_only, args.limit)
+    print(f"Done: {read:,} articles read, {stored:,} pages stored, {corpus.page_count():,} pages in corpus.")
+
+
+if __name__ == "__main__":
+    main()
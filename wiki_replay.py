@@ -0,0 +1,325 @@
+import argparse
+import atexit
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+RECORDING_PATH = "data/wiki_recording.json"
+DEFAULT_SEED = 1234
+STUB_PORT = 8765
+
+
+def _is_set(params, name):
+    """MediaWiki boolean parameters are true whenever they are present."""
+    return name in params and params[name] is not False
+
+
+class Recording:
+    """
+    Recorded MediaWiki content: page extracts and category members.
+
+    A recording answers the three queries the game makes (list=random,
+    list=categorymembers and prop=extracts) with responses shaped like the
+    live API. Random titles come from a seeded generator, so a replayed run
+    sees the same pages in the same order every time.
+
+    Args:
+        pages (dict, optional): Mapping of title to plaintext extract.
+        categories (dict, optional): Mapping of category name to member titles.
+        seed (int): Seed of the list=random generator.
+    """
+
+    def __init__(self, pages=None, categories=None, seed=DEFAULT_SEED):
+        self.pages = dict(pages or {})
+        self.categories = {name: list(titles) for name, titles in (categories or {}).items()}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=RECORDING_PATH, seed=DEFAULT_SEED):
+        """
+        Loads a recording saved with save() or a benchmark extracts fixture.
+
+        Args:
+            path (str): JSON file.
+            seed (int): Seed of the list=random generator.
+
+        Returns:
+            Recording: Loaded recording.
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if "extracts" in data:  # data/benchmark_extracts.json
+            return cls({item["title"]: item["extract"] for item in data["extracts"]}, seed=seed)
+        return cls(data.get("pages"), data.get("categories"), seed)
+
+    def save(self, path=RECORDING_PATH):
+        """Writes the recording to disk atomically."""
+        with self._lock:
+            data = {"pages": self.pages, "categories": self.categories}
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def record(self, params, response):
+        """
+        Harvests the pages and category members of a live response.
+
+        Args:
+            params (dict): Query parameters of the request.
+            response (dict): Decoded JSON response.
+        """
+        query = response.get("query", {})
+        with self._lock:
+            for page in query.get("pages", {}).values():
+                extract = page.get("extract")
+                # Keep full articles over intros when both were fetched
+                if extract and len(extract) > len(self.pages.get(page["title"], "")):
+                    self.pages[page["title"]] = extract
+            if "categorymembers" in query:
+                category = params["cmtitle"].split(":", 1)[-1]
+                members = self.categories.setdefault(category, [])
+                known = set(members)
+                members.extend(member["title"] for member in query["categorymembers"]
+                               if member["title"] not in known)
+
+    def answer(self, params):
+        """
+        Builds the response the live API would give for a query.
+
+        Args:
+            params (dict): Query parameters; values may be strings (HTTP) or Python values.
+
+        Returns:
+            dict: MediaWiki-shaped JSON response.
+        """
+        if params.get("action") != "query":
+            return {"error": {"code": "badvalue", "info": "Only action=query is recorded."}}
+        if params.get("list") == "random":
+            return self._random_titles(int(params.get("rnlimit", 1)))
+        if params.get("list") == "categorymembers":
+            return self._category_members(params)
+        if params.get("prop") == "extracts":
+            return self._extracts(params)
+        return {"error": {"code": "badvalue", "info": "Query is not supported by the recording."}}
+
+    def _random_titles(self, count):
+        titles = list(self.pages)
+        with self._lock:
+            picks = [titles[self._random.randrange(len(titles))] for _ in range(count)] if titles else []
+        return {"batchcomplete": "", "query": {"random": [
+            {"id": index + 1, "ns": 0, "title": title} for index, title in enumerate(picks)
+        ]}}
+
+    def _category_members(self, params):
+        category = params.get("cmtitle", "").split(":", 1)[-1]
+        members = self.categories.get(category, [])
+        offset = int(params.get("cmcontinue") or 0)
+        limit = int(params.get("cmlimit", 10))
+        response = {"query": {"categorymembers": [
+            {"ns": 0, "title": title} for title in members[offset:offset + limit]
+        ]}}
+        if offset + limit < len(members):
+            response["continue"] = {"cmcontinue": str(offset + limit), "continue": "-||"}
+        else:
+            response["batchcomplete"] = ""
+        return response
+
+    def _extracts(self, params):
+        intro_only = _is_set(params, "exintro")
+        pages = {}
+        for missing_id, title in enumerate(str(params.get("titles", "")).split("|"), start=1):
+            extract = self.pages.get(title)
+            if extract is None:
+                pages[str(-missing_id)] = {"ns": 0, "title": title, "missing": ""}
+                continue
+            if intro_only:
+                extract = extract.split("\n==", 1)[0].rstrip()
+            page_id = str(zlib.crc32(title.encode("utf-8")))
+            pages[page_id] = {"pageid": int(page_id), "ns": 0, "title": title, "extract": extract}
+        return {"batchcomplete": "", "query": {"pages": pages}}
+
+
+class ReplayClient:
+    """
+    Drop-in replacement for WikiClient that answers from a recording, without any network access.
+
+    Args:
+        recording (Recording): Recorded content.
+        latency (float): Seconds to wait per request, to simulate the network.
+    """
+
+    def __init__(self, recording, latency=0.0):
+        self.recording = recording
+        self.latency = latency
+
+    def get(self, params, timeout=None):
+        """
+        Answers a query from the recording.
+
+        Args:
+            params (dict): Query parameters.
+            timeout (float, optional): Ignored; kept for WikiClient compatibility.
+
+        Returns:
+            dict: MediaWiki-shaped JSON response.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        return self.recording.answer(params)
+
+    def close(self):
+        """Nothing to release."""
+
+
+class RecordingClient:
+    """
+    Wraps a live client and records every response it returns.
+
+    The recording is saved when the client is closed and at interpreter exit.
+
+    Args:
+        client (WikiClient): Client doing the real requests.
+        recording (Recording): Recording to extend.
+        path (str): File the recording is saved to.
+    """
+
+    def __init__(self, client, recording, path=RECORDING_PATH):
+        self.client = client
+        self.recording = recording
+        self.path = path
+        atexit.register(self.recording.save, path)
+
+    def get(self, params, timeout=None):
+        """
+        Performs the request with the wrapped client and records the response.
+
+        Args:
+            params (dict): Query parameters.
+            timeout (float, optional): Overrides the client timeout.
+
+        Returns:
+            dict: Decoded JSON response.
+        """
+        response = self.client.get(params, timeout)
+        self.recording.record(params, response)
+        return response
+
+    def close(self):
+        """Saves the recording and closes the wrapped client."""
+        self.recording.save(self.path)
+        self.client.close()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """MediaWiki-compatible api.php stand-in answering from a recording."""
+
+    protocol_version = "HTTP/1.1"
+    recording = None
+    latency = 0.0
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if not url.path.endswith("api.php"):
+            self.send_error(404)
+            return
+        if self.latency:
+            time.sleep(self.latency)
+        body = json.dumps(self.recording.answer(dict(parse_qsl(url.query)))).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(recording, host="127.0.0.1", port=0, latency=0.0):
+    """
+    Starts a MediaWiki stub server in a background thread.
+
+    Args:
+        recording (Recording): Content to serve.
+        host (str): Interface to bind.
+        port (int): Port to bind; 0 picks a free one.
+        latency (float): Seconds added to every response.
+
+    Returns:
+        tuple: (server, API URL). Stop it with server.shutdown() and server.server_close().
+    """
+    handler = type("BoundStubHandler", (StubHandler,), {"recording": recording, "latency": latency})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/w/api.php"
+
+
+def record(path, rounds, spooky):
+    """
+    Records the live responses needed to find a number of playable pages.
+
+    Args:
+        path (str): Recording file, extended if it exists.
+        rounds (int): Number of playable pages to look up.
+        spooky (bool): Use the spooky categories.
+    """
+    import wiki_api
+
+    recording = Recording.load(path) if os.path.exists(path) else Recording()
+    client = RecordingClient(wiki_api.WikiClient(), recording, path)
+    wiki_api.set_backend(wiki_api.RecordBackend())  # no local corpus pages, which would never be recorded
+    wiki_api.set_client(client)
+    wiki_api.use_memory_caches()  # cached categories and pages would otherwise never be requested
+    try:
+        for round_number in range(1, rounds + 1):
+            title, _, _ = wiki_api.get_valid_wikipedia_page(spooky=spooky, race=1)
+            print(f"{round_number}/{rounds}: {title}")
+    finally:
+        wiki_api.set_client(None)
+    print(f"Recorded {len(recording.pages)} pages and {len(recording.categories)} categories to {path}.")
+
+
+def main():
+    """Command-line entry point: record live responses or serve a recording."""
+    parser = argparse.ArgumentParser(description="Record Wikipedia responses or serve them from a local stub.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="record live responses for a number of rounds")
+    record_parser.add_argument("--rounds", type=int, default=20, help="playable pages to look up")
+    record_parser.add_argument("--spooky", action="store_true", help="use the spooky categories")
+    record_parser.add_argument("--recording", default=RECORDING_PATH, help="recording file")
+
+    serve_parser = commands.add_parser("serve", help="serve a recording as a MediaWiki API stub")
+    serve_parser.add_argument("--recording", default=RECORDING_PATH,
+                              help="recording file or a benchmark extracts fixture")
+    serve_parser.add_argument("--port", type=int, default=STUB_PORT, help="port to listen on")
+    serve_parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    serve_parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="seed of list=random")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.recording, args.rounds, args.spooky)
+        return
+
+    server, url = start_stub_server(Recording.load(args.recording, args.seed), port=args.port,
+                                    latency=args.latency)
+    print(f"Serving {args.recording} at {url} (run the game with WIKI_API_URL={url}). Ctrl+C to stop.")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()